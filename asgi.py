@@ -3,6 +3,11 @@ ASGI config for job_portal project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run it with ASYNC_VIEWS=True so the read-heavy pages use the async views in
+jobapp/async_views.py, e.g.:
+
+    ASYNC_VIEWS=True uvicorn asgi:application --host 0.0.0.0 --port $PORT --workers 4
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -15,3 +20,12 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings')
 
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.ASYNC_VIEWS:
+    # WhiteNoise middleware is disabled in async mode (see settings.py); it
+    # serves static files in front of the app instead.
+    from jobapp.static_files import WhiteNoiseASGIHandler
+
+    application = WhiteNoiseASGIHandler(application)
@@ -1,7 +1,181 @@
-from django.contrib import admin
-from .models import Job, Application, Profile
+"""
+Admin for jobs, applications and profiles, usable on large tables.
 
-admin.site.register(Job)
-admin.site.register(Application)
-admin.site.register(Profile)
+The stock ModelAdmin costs a COUNT(*) of the whole table on every changelist
+page (two when searching), one query per row when a row's __str__ follows a
+foreign key, and a <select> of every user on the change form. Here:
 
+- rows are fetched with their foreign keys (list_select_related);
+- foreign keys are autocomplete widgets, searched through the related admin;
+- an unfiltered changelist shows an estimated row count once the table has
+  more than EXACT_COUNT_LIMIT rows (EstimatedCountPaginator), and searches
+  don't count the whole table again (show_full_result_count);
+- search only uses indexes: the full-text index for jobs, exact email or
+  username for applications and profiles;
+- the date hierarchy reads the first and last date instead of every row
+  (templatetags/admin_dates.py);
+- the bulk actions work through the selection ADMIN_BATCH_SIZE rows at a
+  time, one transaction per batch, instead of loading it all at once. They
+  replace the stock "delete selected", which lists every related object
+  before deleting anything.
+"""
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
+
+from .models import Application, Job, Profile
+from .search import search_jobs
+
+ADMIN_BATCH_SIZE = 1000
+# Below this many rows an exact count is cheap enough
+EXACT_COUNT_LIMIT = 10000
+
+
+def estimated_rows(model, using):
+    """A cheap estimate of the rows in ``model``'s table, or None if there is none."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Kept up to date by autovacuum/ANALYZE; -1 if never analyzed
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+        elif connection.vendor == 'sqlite':
+            # AUTOINCREMENT ids are never reused, so the highest one is an
+            # upper bound, read from the end of the primary key.
+            cursor.execute(f'SELECT MAX(_rowid_) FROM {connection.ops.quote_name(model._meta.db_table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that estimates the length of an unfiltered, large queryset instead of counting it."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+def batches(queryset, size=ADMIN_BATCH_SIZE):
+    """The primary keys of ``queryset`` in lists of ``size``, walking the primary key.
+
+    Each batch is read after the previous one was handled, so deleting or
+    changing rows along the way is fine.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        batch = list((pks if last is None else pks.filter(pk__gt=last))[:size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1]
+
+
+@admin.action(description="Delete selected %(verbose_name_plural)s in batches", permissions=['delete'])
+def delete_in_batches(modeladmin, request, queryset):
+    opts = modeladmin.model._meta
+    select_across = request.POST.get('select_across') == '1'
+    if request.POST.get('post') != 'yes':
+        return TemplateResponse(request, 'admin/jobapp/delete_in_batches.html', {
+            **modeladmin.admin_site.each_context(request),
+            'title': "Are you sure?",
+            'opts': opts,
+            'count': queryset.count(),
+            # With "select all" the confirmation re-submits the filters, not every id
+            'selected': queryset.values_list('pk', flat=True)[:1] if select_across else queryset.values_list('pk', flat=True),
+            'select_across': select_across,
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        })
+
+    deleted = 0
+    for batch in batches(queryset):
+        with transaction.atomic():
+            rows = modeladmin.model.objects.filter(pk__in=batch)
+            modeladmin.log_deletions(request, rows)
+            deleted += rows.delete()[1].get(opts.label, 0)
+    modeladmin.message_user(request, f"Deleted {deleted} {opts.verbose_name_plural}.", messages.SUCCESS)
+
+
+class ScalableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [delete_in_batches]
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        actions.pop('delete_selected', None)
+        return actions
+
+
+@admin.register(Job)
+class JobAdmin(ScalableAdmin):
+    list_display = ('title', 'company', 'location', 'category', 'salary', 'posted_by', 'posted_on')
+    list_select_related = ('posted_by',)
+    list_filter = ('category',)
+    # Answered by the full-text index, see search.py
+    search_fields = ('title', 'company', 'description', 'location')
+    search_help_text = "Words in the title, company, description or location, as on the home page."
+    date_hierarchy = 'posted_on'
+    # Walks job_posted_on_id_idx
+    ordering = ('-posted_on', '-id')
+    autocomplete_fields = ('posted_by',)
+
+    def get_search_results(self, request, queryset, search_term):
+        return search_jobs(queryset, search_term), False
+
+
+@admin.register(Application)
+class ApplicationAdmin(ScalableAdmin):
+    list_display = ('name', 'email', 'job', 'applicant', 'applied_at')
+    # __str__ and the job/applicant columns follow both foreign keys
+    list_select_related = ('job', 'applicant')
+    search_fields = ('email', 'applicant__username')
+    search_help_text = "An applicant's exact email address or username."
+    date_hierarchy = 'applied_at'
+    autocomplete_fields = ('job', 'applicant')
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        # Two indexed lookups instead of an OR across the join
+        applicants = User.objects.filter(username=term).values('pk')
+        return queryset.filter(email=term) | queryset.filter(applicant__in=applicants), False
+
+
+def set_role(modeladmin, request, queryset, role):
+    changed = 0
+    for batch in batches(queryset):
+        changed += Profile.objects.filter(pk__in=batch).update(role=role)
+    modeladmin.message_user(request, f"Updated {changed} profiles.", messages.SUCCESS)
+
+
+@admin.action(description="Make selected profiles employers", permissions=['change'])
+def make_employer(modeladmin, request, queryset):
+    set_role(modeladmin, request, queryset, 'employer')
+
+
+@admin.action(description="Make selected profiles job seekers", permissions=['change'])
+def make_jobseeker(modeladmin, request, queryset):
+    set_role(modeladmin, request, queryset, 'jobseeker')
+
+
+@admin.register(Profile)
+class ProfileAdmin(ScalableAdmin):
+    list_display = ('user', 'role')
+    list_select_related = ('user',)
+    list_filter = ('role',)
+    search_fields = ('user__username__exact',)
+    search_help_text = "An exact username."
+    autocomplete_fields = ('user',)
+    actions = [delete_in_batches, make_employer, make_jobseeker]
@@ -0,0 +1,182 @@
+"""
+Saved searches and job alerts.
+
+A job seeker can save the search they ran on the home page. New jobs are
+matched against all saved searches and every match becomes a JobAlert,
+which goes out in the user's next digest email (send_digests(), run daily
+by the send_job_alerts command).
+
+Matching does not loop over saved searches. Each search is indexed under
+one of its terms (SavedSearch.anchor, a plain database index): the one
+matching the fewest jobs when it was saved, as the one that will also
+match the fewest new jobs. A search term matches a job word it is a prefix
+of, like on the search page, so a new job looks up the searches anchored at
+any prefix of any of its words, and only those candidates are checked term
+by term. The work grows with the number and length of the new jobs and the
+number of searches they nearly match, not with the number of saved
+searches.
+
+Jobs are matched by a background task (see tasks.py) queued when a job is
+posted (signals.py) or imported (import_jobs). Words are compared as typed,
+without the stemming of the full-text index, so a saved "developers" does
+not alert on a "Developer" job the search page would list.
+"""
+from collections import defaultdict
+
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Job, JobAlert, SavedSearch
+from .search import search_jobs, tokenize, words
+from .tasks import enqueue, task
+
+MATCH_JOBS = 'match_saved_searches'
+
+MAX_SAVED_SEARCHES = 20
+# Jobs listed per digest email; the rest are summed up as "and N more"
+MAX_DIGEST_JOBS = 20
+
+# Values per IN (...) query, well below SQLite's limit on query parameters
+LOOKUP_CHUNK = 500
+
+
+def job_frequency(term, in_location=False):
+    """How many jobs ``term`` matches, as a guess at how often new jobs will."""
+    return search_jobs(Job.objects.all(), '' if in_location else term, term if in_location else '').count()
+
+
+def fits(saved):
+    """Whether every text column of ``saved`` holds its value; PostgreSQL refuses longer ones."""
+    return all(
+        len(getattr(saved, name)) <= SavedSearch._meta.get_field(name).max_length
+        for name in ('search', 'location', 'terms', 'location_terms', 'anchor')
+    )
+
+
+def new_saved_search(user, search, location, frequency=job_frequency):
+    """An unsaved SavedSearch with its terms filled in, or None if it has no terms or is too long.
+
+    It is anchored at the term matching the fewest jobs so far, the longest
+    one on a tie.
+    """
+    search, location = search.strip(), location.strip()
+    if not fits(SavedSearch(search=search, location=location)):
+        return None
+    terms, location_terms = tokenize(search), tokenize(location)
+    if not terms and not location_terms:
+        return None
+    candidates = [(term, False) for term in terms] + [(term, True) for term in location_terms]
+    anchor, _ = min(candidates, key=lambda candidate: (frequency(*candidate), -len(candidate[0])))
+    saved = SavedSearch(
+        user=user, search=search, location=location,
+        terms=' '.join(terms), location_terms=' '.join(location_terms), anchor=anchor,
+    )
+    # A single word can still be longer than the anchor column
+    return saved if fits(saved) else None
+
+
+def save_search(user, search, location):
+    """Save ``user``'s search; returns it, or None if it has no terms, is too long or the user has too many."""
+    saved = new_saved_search(user, search, location)
+    if saved is None:
+        return None
+    search, location = saved.search, saved.location
+    existing = SavedSearch.objects.filter(user=user, search=search, location=location).first()
+    if existing:
+        return existing
+    if SavedSearch.objects.filter(user=user).count() >= MAX_SAVED_SEARCHES:
+        return None
+    try:
+        with transaction.atomic():
+            saved.save()
+            return saved
+    except IntegrityError:
+        # Saved twice at once
+        return SavedSearch.objects.get(user=user, search=search, location=location)
+
+
+def jobs_posted(job_ids):
+    """Queue matching of new jobs against the saved searches."""
+    enqueue(MATCH_JOBS, {'job_ids': list(job_ids)}, group='jobs')
+
+
+@task(MATCH_JOBS, batch=True)
+def match_posted_jobs(payloads):
+    job_ids = [job_id for payload in payloads for job_id in payload['job_ids']]
+    match_jobs(Job.objects.filter(pk__in=job_ids).only('id', 'title', 'company', 'description', 'location'))
+
+
+def prefixes(tokens):
+    return {token[:end] for token in tokens for end in range(1, len(token) + 1)}
+
+
+def match_jobs(jobs):
+    """Create a JobAlert for every saved search that one of ``jobs`` matches; returns how many."""
+    alerts = [JobAlert(saved_search_id=saved_id, job_id=job_id) for saved_id, job_id in find_matches(jobs)]
+    # A job edited and matched again keeps its first alert.
+    JobAlert.objects.bulk_create(alerts, batch_size=1000, ignore_conflicts=True)
+    return len(alerts)
+
+
+def find_matches(jobs):
+    """``(saved search id, job id)`` for every saved search that one of ``jobs`` matches."""
+    documents = []
+    for job in jobs:
+        text = prefixes(words(f'{job.title} {job.company} {job.description} {job.location}'))
+        documents.append((job.pk, text, prefixes(words(job.location))))
+    keys = sorted(set().union(*(text for _, text, _ in documents)))
+
+    by_anchor = defaultdict(list)
+    for start in range(0, len(keys), LOOKUP_CHUNK):
+        candidates = SavedSearch.objects.filter(anchor__in=keys[start:start + LOOKUP_CHUNK])
+        for saved_id, anchor, terms, location_terms in candidates.values_list(
+            'id', 'anchor', 'terms', 'location_terms',
+        ):
+            by_anchor[anchor].append((saved_id, terms.split(), location_terms.split()))
+
+    matches = []
+    for job_id, text, place in documents:
+        for key in text & by_anchor.keys():
+            for saved_id, terms, location_terms in by_anchor[key]:
+                if all(term in text for term in terms) and all(term in place for term in location_terms):
+                    matches.append((saved_id, job_id))
+    return matches
+
+
+def send_digests(batch_size=500):
+    """Email every user with unsent alerts one digest of them; returns the number of emails."""
+    pending = JobAlert.objects.filter(sent_at__isnull=True)
+    user_ids = sorted(set(pending.values_list('saved_search__user_id', flat=True)))
+    sent = 0
+    for start in range(0, len(user_ids), batch_size):
+        alerts = (
+            pending.filter(saved_search__user_id__in=user_ids[start:start + batch_size])
+            .select_related('saved_search__user', 'job')
+            .defer('job__description')
+            .order_by('saved_search__user_id', '-job__posted_on', 'id')
+        )
+        by_user = defaultdict(list)
+        for alert in alerts:
+            by_user[alert.saved_search.user].append(alert)
+
+        messages = []
+        for user, user_alerts in by_user.items():
+            if not user.email:
+                continue
+            jobs = list({alert.job_id: alert.job for alert in user_alerts}.values())
+            context = {'user': user, 'jobs': jobs[:MAX_DIGEST_JOBS], 'more': len(jobs) - MAX_DIGEST_JOBS}
+            messages.append(EmailMessage(
+                f"{len(jobs)} new job{'s' if len(jobs) > 1 else ''} matching your saved searches",
+                render_to_string('jobapp/emails/job_alerts.txt', context),
+                to=[user.email],
+            ))
+        if messages:
+            get_connection().send_messages(messages)
+        # Users without an email address get theirs marked too, or they would pile up.
+        done = [alert.pk for user_alerts in by_user.values() for alert in user_alerts]
+        for offset in range(0, len(done), LOOKUP_CHUNK):
+            JobAlert.objects.filter(pk__in=done[offset:offset + LOOKUP_CHUNK]).update(sent_at=timezone.now())
+        sent += len(messages)
+    return sent
@@ -0,0 +1,184 @@
+"""
+Read-only JSON API, versioned in the URL (``/api/v1/...``).
+
+Rows are read with ``values()`` and handed to the renderer as plain dicts:
+no model instances and no per-field serializer objects, which is several
+times cheaper per item than a ModelSerializer (see the bench_serializers
+command). ``?fields=title,company`` limits the columns fetched as well as
+the ones returned. Unknown fields and bad cursors are a 400.
+
+Every response carries an ETag derived from the ids and ``updated_at`` of
+the jobs it contains (plus anything else that shapes the payload), so a
+client that sends it back in If-None-Match gets a 304 without anything
+being serialized. The page is still queried, but only once.
+"""
+import hashlib
+
+from django.http import Http404
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .middleware import get_role
+from .models import Application, Job
+from .pagination import CURSOR_PARAM, paginate_request
+from .queries import listing_jobs
+
+# Public name -> column. id and updated_at are always fetched: the first
+# identifies the row, the second is its version for the ETag.
+JOB_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'company': 'company',
+    'location': 'location',
+    'category': 'category',
+    'salary': 'salary',
+    'posted_on': 'posted_on',
+    'updated_at': 'updated_at',
+    'description': 'description',
+}
+# Listings leave the description out unless asked for it.
+JOB_LIST_FIELDS = [name for name in JOB_FIELDS if name != 'description']
+
+APPLICATION_FIELDS = {
+    'id': 'id',
+    'applied_at': 'applied_at',
+    'job_id': 'job_id',
+    'job_title': 'job__title',
+    'job_company': 'job__company',
+    'job_updated_at': 'job__updated_at',
+}
+
+# Responses depend on who is logged in.
+VARY = 'Cookie, Authorization'
+
+
+def requested_fields(request, available, default):
+    """The ``?fields=`` the client asked for (id is always included), in the API's order, or ``default``."""
+    raw = request.query_params.get('fields')
+    if not raw:
+        return list(default)
+    wanted = {name.strip() for name in raw.split(',') if name.strip()}
+    unknown = wanted - available.keys()
+    if unknown:
+        raise ValidationError({'fields': f"Unknown field(s): {', '.join(sorted(unknown))}."})
+    return [name for name in available if name in wanted or name == 'id']
+
+
+def fetch(queryset, fields, columns, always=()):
+    """``queryset.values()`` of the columns behind ``fields`` and ``always``, plus its ordering columns."""
+    ordering = [name.lstrip('-') for name in queryset.query.order_by]
+    names = dict.fromkeys([*(columns[name] for name in (*fields, *always)), *ordering])
+    return queryset.values(*names)
+
+
+def present(rows, fields, columns):
+    """Rows keyed by public field name, without the columns only fetched for ordering and ETags."""
+    return [{name: row[columns[name]] for name in fields} for row in rows]
+
+
+def make_etag(*parts):
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(f'{part}\0'.encode())
+    return quote_etag(digest.hexdigest())
+
+
+def row_versions(rows, *columns):
+    return (':'.join(str(row[column]) for column in columns) for row in rows)
+
+
+class ConditionalAPIView(APIView):
+    """Adds ETag/If-None-Match handling and Vary to a read-only view."""
+
+    def conditional(self, request, etag, payload):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # Proxies and GZip middleware may have weakened the tag.
+            candidates = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+            if etag in candidates or '*' in candidates:
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+                response['ETag'] = etag
+                response['Vary'] = VARY
+                return response
+        response = Response(payload())
+        response['ETag'] = etag
+        response['Vary'] = VARY
+        # Revalidate every time: the ETag makes that cheap.
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def check_cursor(self, page):
+        # Pages fall back to the first one on a bad cursor; an API client
+        # following a broken link would rather know.
+        if page.ignored_cursor:
+            raise ValidationError({CURSOR_PARAM: "Invalid cursor."})
+
+    def page_links(self, request, page):
+        def link(cursor):
+            if cursor is None:
+                return None
+            query = request._request.GET.copy()
+            query[CURSOR_PARAM] = cursor
+            return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+        return link(page.next_cursor), link(page.previous_cursor)
+
+
+# -----------------------------
+# Jobs
+# -----------------------------
+
+class JobListView(ConditionalAPIView):
+    """Job listings, newest first or ranked by ?search= / ?location=, cursor-paginated."""
+
+    def get(self, request, version):
+        fields = requested_fields(request, JOB_FIELDS, JOB_LIST_FIELDS)
+        queryset = listing_jobs(request.query_params.get('search', ''), request.query_params.get('location', ''))
+        page = paginate_request(request._request, fetch(queryset, fields, JOB_FIELDS, always=('id', 'updated_at')))
+        self.check_cursor(page)
+        etag = make_etag(version, fields, request.query_params.urlencode(), *row_versions(page, 'id', 'updated_at'))
+
+        def payload():
+            next_url, previous_url = self.page_links(request, page)
+            return {'results': present(page, fields, JOB_FIELDS), 'next': next_url, 'previous': previous_url}
+        return self.conditional(request, etag, payload)
+
+
+class JobDetailView(ConditionalAPIView):
+
+    def get(self, request, version, job_id):
+        fields = requested_fields(request, JOB_FIELDS, JOB_FIELDS)
+        row = fetch(Job.objects.filter(pk=job_id), fields, JOB_FIELDS, always=('id', 'updated_at')).first()
+        if row is None:
+            raise Http404("No Job matches the given query.")
+        etag = make_etag(version, fields, *row_versions([row], 'id', 'updated_at'))
+        return self.conditional(request, etag, lambda: present([row], fields, JOB_FIELDS)[0])
+
+
+# -----------------------------
+# The seeker's applications
+# -----------------------------
+
+class MyApplicationsView(ConditionalAPIView):
+    """The current job seeker's applications, newest first, cursor-paginated."""
+
+    def get(self, request, version):
+        if get_role(request._request) != 'Job Seeker':
+            raise PermissionDenied("Only job seekers have applications.")
+        fields = requested_fields(request, APPLICATION_FIELDS, APPLICATION_FIELDS)
+        queryset = Application.objects.filter(applicant=request.user).order_by('-applied_at', '-id')
+        page = paginate_request(
+            request._request, fetch(queryset, fields, APPLICATION_FIELDS, always=('id', 'job_updated_at')),
+        )
+        self.check_cursor(page)
+        etag = make_etag(
+            version, fields, request.query_params.urlencode(),
+            *row_versions(page, 'id', 'applied_at', 'job__updated_at'),
+        )
+
+        def payload():
+            next_url, previous_url = self.page_links(request, page)
+            return {'results': present(page, fields, APPLICATION_FIELDS), 'next': next_url, 'previous': previous_url}
+        return self.conditional(request, etag, payload)
@@ -0,0 +1,62 @@
+"""
+Creating applications.
+
+A job seeker can apply to a job once (unique_together on job, applicant).
+Checking for an existing application and then inserting takes two queries
+and still lets a double click or a retried request through between the two,
+which then fails with an IntegrityError. submit_application() instead sends
+a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING id``: the database
+decides atomically, and the returned id (or its absence) says whether the
+application is new.
+"""
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models.constants import OnConflict
+from django.db.models.signals import post_save
+from django.db.models.sql import InsertQuery
+
+from .models import Application
+
+
+def submit_application(application):
+    """Save a new, unsaved ``application`` unless its applicant already applied to the job.
+
+    Returns True if it was inserted, False if there already was one. A
+    resume stored for a duplicate is deleted again. post_save is sent for
+    new applications, as save() would.
+    """
+    using = router.db_for_write(Application, instance=application)
+    if not connections[using].features.can_return_columns_from_insert:
+        return _save_or_ignore(application, using)
+
+    opts = Application._meta
+    fields = [field for field in opts.local_concrete_fields if field is not opts.pk]
+    query = InsertQuery(Application, on_conflict=OnConflict.IGNORE)
+    query.insert_values(fields, [application])
+    # Storing the resume file happens here too, in FileField.pre_save().
+    rows = query.get_compiler(using=using).execute_sql(returning_fields=[opts.pk])
+    if not rows or rows[0] is None:
+        _discard_resume(application)
+        return False
+
+    application.pk = rows[0][0]
+    application._state.adding = False
+    application._state.db = using
+    post_save.send(sender=Application, instance=application, created=True, update_fields=None, raw=False,
+                   using=using)
+    return True
+
+
+def _save_or_ignore(application, using):
+    """For backends without INSERT ... RETURNING: let the unique constraint reject duplicates."""
+    try:
+        with transaction.atomic(using=using):
+            application.save(using=using)
+    except IntegrityError:
+        _discard_resume(application)
+        return False
+    return True
+
+
+def _discard_resume(application):
+    if application.resume and application.resume._committed:
+        application.resume.storage.delete(application.resume.name)
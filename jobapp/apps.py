@@ -5,5 +5,5 @@ class JobappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobapp'
 
-def ready(self):
-    import jobapp.signals
+    def ready(self):
+        import jobapp.signals
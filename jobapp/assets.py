@@ -0,0 +1,181 @@
+"""
+Built static assets.
+
+Pages load one stylesheet, jobapp/site.min.css: the vendored Bootstrap
+(jobapp/vendor/bootstrap, served from here instead of a CDN) followed by
+jobapp/style.css, minified. The home page does not wait for it. It inlines
+jobapp/critical/home.css instead, the part of the bundle its own markup can
+use, and loads the full bundle without blocking the first render (see
+home.html). So do the pages that extend home.html (job detail, the seeker's
+dashboard and applications), which is why their templates are cut into
+home.css as well.
+
+Both files are generated from their sources by the build_assets
+management command and committed, so collectstatic needs no build step.
+Rebuild them after changing style.css, a vendored file or the classes the
+templates in CRITICAL use; a test fails while they are out of date.
+collectstatic then gives every file a content-hashed name and gzip and
+Brotli copies, which WhiteNoise serves with a far-future immutable
+Cache-Control (STATIC_MANIFEST, see settings.py).
+
+The critical CSS is picked by name, not by rendering the page: rules
+whose selectors only use classes and data-* attributes that appear in the
+templates, minus states that can't apply before the first interaction
+(:hover, :focus, ...) and animations.
+"""
+import re
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).resolve().parent / 'static'
+TEMPLATE_DIR = Path(__file__).resolve().parent / 'templates'
+
+# Output -> sources, relative to STATIC_DIR
+BUNDLES = {
+    'jobapp/site.min.css': ['jobapp/vendor/bootstrap/bootstrap.min.css', 'jobapp/style.css'],
+}
+
+# Output -> (bundle it is cut from, templates whose classes it keeps)
+CRITICAL = {
+    'jobapp/critical/home.css': ('jobapp/site.min.css', [
+        'jobapp/base.html', 'jobapp/home.html', 'jobapp/facets.html',
+        'jobapp/pagination.html', 'jobapp/cards/home_job.html',
+        # They extend home.html, so they inline this file too
+        'jobapp/job_detail.html', 'jobapp/jobseeker_dashboard.html', 'jobapp/my_applications.html',
+    ]),
+}
+
+STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+# Strings are matched first so a "/*" inside one is not taken for a comment.
+# /*! comments are licence banners and stay.
+COMMENT = re.compile(rf'({STRING})|/\*(?!!).*?\*/', re.S)
+ANY_COMMENT = re.compile(rf'({STRING})|/\*.*?\*/', re.S)
+STRINGS = re.compile(rf'({STRING})')
+CLASS = re.compile(r'\.(-?[_a-zA-Z][\w-]*)')
+CLASS_ATTRIBUTE = re.compile(r'class="([^"]*)"')
+DATA_ATTRIBUTE = re.compile(r'\b(data-[\w-]+)=')
+DATA_SELECTOR = re.compile(r'\[(data-[\w-]+)')
+TEMPLATE_CODE = re.compile(r'{%.*?%}|{{.*?}}')
+INTERACTIVE = re.compile(r':(?:hover|focus|focus-visible|focus-within|active)\b')
+
+
+def minify_css(css):
+    """Drop comments and the whitespace CSS doesn't need, leaving strings alone."""
+    css = COMMENT.sub(lambda match: match.group(1) or '', css)
+    parts = STRINGS.split(css)
+    for i in range(0, len(parts), 2):
+        part = re.sub(r'\s+', ' ', parts[i])
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        parts[i] = re.sub(r':\s+', ':', part).replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+def blocks(css):
+    """Top-level ``(prelude, body)`` pairs of a stylesheet; ``body`` is None for statements like @charset."""
+    found, depth, start, prelude, i = [], 0, 0, '', 0
+    while i < len(css):
+        char = css[i]
+        if char in '"\'':
+            match = re.compile(STRING).match(css, i)
+            i = match.end() if match else len(css)
+            continue
+        if css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = len(css) if end == -1 else end + 2
+            continue
+        if char == '{':
+            if depth == 0:
+                prelude, start = css[start:i].strip(), i + 1
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                found.append((prelude, css[start:i]))
+                start = i + 1
+        elif char == ';' and depth == 0:
+            found.append((css[start:i].strip(), None))
+            start = i + 1
+        i += 1
+    return found
+
+
+def selectors(prelude):
+    """Split a selector list on the commas that are not inside :is(...), [...] etc."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(prelude[start:i])
+            start = i + 1
+    parts.append(prelude[start:])
+    return [part.strip() for part in parts]
+
+
+def critical_css(css, classes, attributes=frozenset()):
+    """The rules of ``css`` that can style a page using only ``classes`` and data-* ``attributes``."""
+    kept = []
+    # Banners too: the one before Bootstrap's :root would read as part of its selector
+    css = ANY_COMMENT.sub(lambda match: match.group(1) or '', css)
+    for prelude, body in blocks(css):
+        if body is None:
+            # @charset means nothing once the rules are inlined in a page
+            continue
+        if prelude.startswith(('@media', '@supports', '@layer')):
+            inner = critical_css(body, classes, attributes)
+            if inner:
+                kept.append(f'{prelude}{{{inner}}}')
+        elif prelude.startswith('@'):
+            # @keyframes, @font-face, ...
+            continue
+        else:
+            needed = [
+                selector for selector in selectors(prelude)
+                if not INTERACTIVE.search(selector)
+                and set(CLASS.findall(selector)) <= classes
+                and set(DATA_SELECTOR.findall(selector)) <= attributes
+            ]
+            if needed:
+                kept.append(f"{','.join(needed)}{{{body}}}")
+    return ''.join(kept)
+
+
+def template_names(templates):
+    """The class names and data-* attributes used in the templates, ignoring template code."""
+    classes, attributes = set(), set()
+    for name in templates:
+        source = (TEMPLATE_DIR / name).read_text(encoding='utf-8')
+        for value in CLASS_ATTRIBUTE.findall(source):
+            classes.update(TEMPLATE_CODE.sub(' ', value).split())
+        attributes.update(DATA_ATTRIBUTE.findall(source))
+    return classes, attributes
+
+
+def build():
+    """Generated file name -> contents, for every bundle and critical stylesheet."""
+    built = {}
+    for output, sources in BUNDLES.items():
+        parts = [minify_css((STATIC_DIR / source).read_text(encoding='utf-8')) for source in sources]
+        built[output] = '\n'.join(parts) + '\n'
+    for output, (bundle, templates) in CRITICAL.items():
+        built[output] = critical_css(built[bundle], *template_names(templates)) + '\n'
+    return built
+
+
+def stale():
+    """Names of the generated files that are missing or differ from a fresh build."""
+    return [
+        name for name, contents in build().items()
+        if not (STATIC_DIR / name).exists() or (STATIC_DIR / name).read_text(encoding='utf-8') != contents
+    ]
+
+
+def write():
+    """Build every generated file into STATIC_DIR; returns their names."""
+    built = build()
+    for name, contents in built.items():
+        path = STATIC_DIR / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(contents, encoding='utf-8')
+    return list(built)
@@ -0,0 +1,102 @@
+# jobapp/async_views.py
+#
+# Async versions of the read-heavy views, used instead of the ones in
+# views.py when ASYNC_VIEWS is on (see urls.py). They only pay off when the
+# app is served over ASGI; under WSGI every async view runs in its own
+# event loop. Each view resolves the user and role with aget_role() first,
+# so that request.user and request.role are cached before the template
+# (which is rendered synchronously) reads them.
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponseForbidden
+from django.shortcuts import aget_object_or_404, redirect, render
+
+from . import conditional
+from .applications import submit_application
+from .facets import facet_counts, facet_rows, selected_facets
+from .middleware import aget_role
+from .models import Application, Job
+from .pagination import apaginate_request
+from .queries import employer_jobs, latest_applications, listing_jobs
+from .stats import dashboard_chart
+
+# -----------------------------
+# Home and Job Listings
+# -----------------------------
+
+@login_required
+async def home_view(request):
+    role = await aget_role(request)
+    if role is None:
+        raise Http404("No UserProfile matches the given query.")
+
+    if role.strip().lower() != "job seeker":
+        return HttpResponseForbidden("You are not authorized to view this page.")
+
+    search = request.GET.get('search', '')
+    location = request.GET.get('location', '')
+    selected = selected_facets(request.GET)
+    page = await apaginate_request(request, listing_jobs(search, location, selected))
+    facets = facet_counts(await sync_to_async(facet_rows)(search, location), selected)
+
+    etag = conditional.page_etag(request, request.GET.urlencode(), facets, *conditional.job_versions(page.items))
+    # No Last-Modified: the page's rows can't tell when a job left the
+    # listing or a facet count changed, only the ETag covers those.
+    not_modified = conditional.not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    response = render(request, 'jobapp/home.html', {'jobs': page.items, 'page': page, 'facets': facets})
+    return conditional.add_headers(response, etag)
+
+# -----------------------------
+# Shows jobs posted by the employer
+# -----------------------------
+
+@login_required
+async def employer_dashboard(request):
+    if await aget_role(request) != "Employer":
+        return HttpResponseForbidden("You are not authorized to view this page.")
+
+    page = await apaginate_request(request, employer_jobs(request.user))
+    return render(request, 'jobapp/employer_dashboard.html', {
+        'jobs': page.items,
+        'page': page,
+        'chart': await sync_to_async(dashboard_chart)(request.user),
+    })
+
+# -----------------------------
+# Lists unique job applications (one per job) by the current job seeker
+# -----------------------------
+
+@login_required
+async def my_applications(request):
+    await aget_role(request)
+    page = await apaginate_request(request, latest_applications(request.user))
+
+    return render(request, 'jobapp/my_applications.html', {
+        'applications': page.items,
+        'page': page,
+    })
+
+# -----------------------------
+# Shows job details
+# -----------------------------
+
+@login_required
+async def job_detail(request, job_id):
+    job = await aget_object_or_404(Job, pk=job_id)
+
+    # Apply logic only for Job Seekers
+    if await aget_role(request) == "Job Seeker":
+        if request.method == "POST":
+            # Applying twice is a no-op
+            await sync_to_async(submit_application)(Application(job=job, applicant=request.user))
+            return redirect('my_applications')
+
+    etag = conditional.page_etag(request, *conditional.job_versions([job]))
+    not_modified = conditional.not_modified(request, etag, conditional.last_modified([job]))
+    if not_modified:
+        return not_modified
+    response = render(request, 'jobapp/job_detail.html', {'job': job})
+    return conditional.add_headers(response, etag, conditional.last_modified([job]))
@@ -0,0 +1,55 @@
+"""
+Authentication backend.
+
+ProfileBackend loads the logged-in user together with their UserProfile.
+With USER_CACHE_TIMEOUT set, it also keeps that user in the 'users' cache
+(in memory, per process) for that many seconds, so an authenticated request
+whose session comes from a cache too (SESSION_STORE, see settings.py) reads
+nothing from the database before the view runs.
+
+The cached user is dropped when the user or their profile is saved or
+deleted (a password change, a role change in the admin, the last_login
+update at login) and when they log out, see signals.py. Those signals only
+reach the process that handled the change, so other workers can serve the
+old user for up to USER_CACHE_TIMEOUT seconds: keep it short. Logging out
+still takes effect everywhere at once, since the session itself is gone.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+
+UserModel = get_user_model()
+
+USER_CACHE = 'users'
+
+
+def _cache_key(user_id):
+    return f'user:{user_id}'
+
+
+def forget_user(user_id):
+    """Drop the cached copy of a user, if USER_CACHE_TIMEOUT is on."""
+    if getattr(settings, 'USER_CACHE_TIMEOUT', 0):
+        caches[USER_CACHE].delete(_cache_key(user_id))
+
+
+class ProfileBackend(ModelBackend):
+    """ModelBackend that loads the user's UserProfile in the same query.
+
+    Every page needs the role (decorators, views and the navbar in
+    base.html), so joining it onto the per-request auth_user lookup saves a
+    query on every authenticated request.
+    """
+
+    def get_user(self, user_id):
+        timeout = getattr(settings, 'USER_CACHE_TIMEOUT', 0)
+        user = caches[USER_CACHE].get(_cache_key(user_id)) if timeout else None
+        if user is None:
+            try:
+                user = UserModel._default_manager.select_related('userprofile').get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            if timeout:
+                caches[USER_CACHE].set(_cache_key(user_id), user, timeout)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,403 @@
+"""
+Helpers shared by the bench_* management commands.
+
+Benchmarks always run against a throwaway test database created the same way
+``manage.py test`` creates one, so they never touch real data.
+"""
+import asyncio
+import functools
+import itertools
+import os
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from . import urls
+from .facets import invalidate_facets
+from .models import JOB_CATEGORIES, Application, Job, UserProfile
+from .stats import rebuild_stats
+
+TITLE_WORDS = [
+    'Python', 'Django', 'Java', 'Frontend', 'Backend', 'Full Stack', 'Data',
+    'Cloud', 'DevOps', 'Mobile', 'QA', 'Security', 'Machine Learning', 'Sales',
+    'Marketing', 'Product', 'UX', 'HR', 'Finance', 'Support',
+]
+TITLE_ROLES = ['Developer', 'Engineer', 'Analyst', 'Manager', 'Designer', 'Intern', 'Lead', 'Consultant']
+COMPANIES = [
+    'Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries', 'Wayne Enterprises',
+    'Soylent', 'Tyrell', 'Cyberdyne', 'Wonka', 'Vandelay', 'Pied Piper', 'Aperture',
+]
+LOCATIONS = [
+    'Bangalore', 'Pune', 'Mumbai', 'Delhi', 'Hyderabad', 'Chennai', 'Kolkata',
+    'Remote', 'Ahmedabad', 'Noida', 'Gurgaon', 'Jaipur',
+]
+DESCRIPTION_WORDS = (
+    'we are looking for a motivated engineer to join our growing team and build '
+    'scalable services using modern tools you will design implement test and deploy '
+    'features collaborate with product and design mentor juniors and improve our '
+    'infrastructure experience with databases cloud platforms apis and agile teams '
+    'is a plus competitive salary flexible hours health insurance'
+).split()
+
+
+@contextmanager
+def benchmark_database(keepdb=False, name=None):
+    """Create a test database, point the default connection at it, and clean up afterwards.
+
+    Pass ``name`` to get a database file at that path (e.g. one a server
+    started with start_server() is pointed at) instead of the test database
+    configured in settings.py (TEST NAME).
+    """
+    old_name = connection.settings_dict['NAME']
+    old_test_name = connection.settings_dict['TEST'].get('NAME')
+    if name:
+        connection.settings_dict['TEST']['NAME'] = name
+    try:
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+        try:
+            yield connection
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+    finally:
+        connection.settings_dict['TEST']['NAME'] = old_test_name
+
+
+def seed_users(count, role, prefix=None, batch_size=1000):
+    """Bulk create users with a profile of the given role.
+
+    bulk_create skips the post_save signal, so profiles are created here too.
+    Passwords are unusable; tests that need to log in use force_login.
+    """
+    prefix = prefix or role.lower().replace(' ', '')
+    start = User.objects.count()
+    users = User.objects.bulk_create(
+        [User(username=f'{prefix}{start + i}', password='!') for i in range(count)],
+        batch_size=batch_size,
+    )
+    UserProfile.objects.bulk_create(
+        [UserProfile(user=user, role=role) for user in users],
+        batch_size=batch_size,
+    )
+    return users
+
+
+def random_job(rng, employer, now=None):
+    now = now or timezone.now()
+    return Job(
+        title=f'{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_ROLES)}',
+        description=' '.join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(30, 80))),
+        category=rng.choice(JOB_CATEGORIES)[0],
+        company=rng.choice(COMPANIES),
+        location=rng.choice(LOCATIONS),
+        salary=rng.randrange(200000, 4000000, 10000),
+        posted_by=employer,
+        posted_on=now - timezone.timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+    )
+
+
+def seed_jobs(count, employers, batch_size=5000, seed=0):
+    rng = random.Random(seed)
+    now = timezone.now()
+    for offset in range(0, count, batch_size):
+        size = min(batch_size, count - offset)
+        Job.objects.bulk_create([random_job(rng, rng.choice(employers), now) for _ in range(size)])
+    invalidate_facets()
+
+
+def seed_applications(seekers, per_seeker, batch_size=5000, seed=0):
+    """Give every seeker ``per_seeker`` applications to distinct random jobs."""
+    rng = random.Random(seed)
+    job_ids = list(Job.objects.values_list('id', flat=True))
+    batch = []
+    for seeker in seekers:
+        for job_id in rng.sample(job_ids, min(per_seeker, len(job_ids))):
+            batch.append(Application(
+                job_id=job_id, applicant=seeker,
+                name=seeker.username, email=f'{seeker.username}@example.com',
+            ))
+            if len(batch) >= batch_size:
+                Application.objects.bulk_create(batch)
+                batch = []
+    Application.objects.bulk_create(batch)
+    # bulk_create skips the signals that maintain the counters
+    rebuild_stats()
+
+
+def seed_scenario(jobs=300, employers=5, seekers=5, applications=10):
+    """Seed a small but realistic dataset and pick the objects the views need.
+
+    Returns a namespace with ``employer`` and ``seeker`` users, ``own_job``
+    (posted by employer) and ``open_job`` (not yet applied to by seeker).
+    """
+    employer_users = seed_users(employers, 'Employer')
+    seeker_users = seed_users(seekers, 'Job Seeker')
+    seed_jobs(jobs, employer_users)
+    seeker = seeker_users[0]
+    Application.objects.bulk_create([
+        Application(job=job, applicant=seeker, name=seeker.username, email=f'{seeker.username}@example.com')
+        for job in Job.objects.order_by('id')[:applications]
+    ])
+    rebuild_stats()
+    return SimpleNamespace(
+        employer=employer_users[0],
+        seeker=seeker,
+        own_job=Job.objects.filter(posted_by=employer_users[0]).first(),
+        open_job=Job.objects.exclude(application__applicant=seeker).first(),
+    )
+
+
+SEEKER_VIEWS = {
+    'home', 'jobseeker_dashboard', 'my_applications', 'recommendations', 'saved_searches', 'job_detail',
+    'apply_job', 'logout',
+    'api_jobs', 'api_job_detail', 'api_my_applications',
+}
+ANONYMOUS_VIEWS = {'register', 'login', 'signup'}
+
+
+def view_requests(scenario):
+    """Yield ``(url name, user, path)`` for a GET exercising each view in jobapp/urls.py.
+
+    ``user`` is None for views meant for anonymous visitors.
+    """
+    for pattern in urls.urlpatterns:
+        name = pattern.name
+        if name in ANONYMOUS_VIEWS:
+            user = None
+        elif name in SEEKER_VIEWS:
+            user = scenario.seeker
+        else:
+            user = scenario.employer
+        kwargs = {}
+        if name == 'apply_job':
+            kwargs = {'job_id': scenario.open_job.id}
+        elif name in ('job_detail', 'edit_job', 'delete_job'):
+            kwargs = {'job_id': scenario.own_job.id}
+        elif name == 'api_job_detail':
+            kwargs = {'job_id': scenario.own_job.id}
+        if name.startswith('api_'):
+            kwargs['version'] = 'v1'
+        yield name, user, reverse(name, kwargs=kwargs)
+
+
+def measure(func, repeat=5, warmup=1):
+    """Call ``func`` repeatedly and return the wall time of each call in seconds."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def ms(seconds):
+    return f'{seconds * 1000:.2f} ms'
+
+
+def describe(timings):
+    return f'median {ms(statistics.median(timings))}, min {ms(min(timings))}'
+
+
+# -----------------------------
+# HTTP load generation
+# -----------------------------
+
+def session_cookie(user):
+    """Create a logged-in session for ``user`` and return its cookie value."""
+    store = SessionStore()
+    store[SESSION_KEY] = str(user.pk)
+    store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+    store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    store.create()
+    return store.session_key
+
+
+SERVERS = {
+    'wsgi': ['gunicorn', 'wsgi:application', '--workers', '{workers}', '--bind', '127.0.0.1:{port}'],
+    'asgi': [sys.executable, '-m', 'uvicorn', 'asgi:application', '--workers', '{workers}',
+             '--port', '{port}', '--log-level', 'warning'],
+}
+
+
+@contextmanager
+def start_server(kind, port, workers=4, env=None):
+    """Run the app under gunicorn ('wsgi') or uvicorn ('asgi') until the block exits.
+
+    The server uses ASYNC_VIEWS=True for 'asgi'. Extra settings for the
+    server process (e.g. SQLITE_PATH) are passed through ``env``.
+    """
+    command = [part.format(port=port, workers=workers) for part in SERVERS[kind]]
+    server_env = {**os.environ, 'DEBUG': 'False', 'ALLOWED_HOSTS': '127.0.0.1,localhost',
+                  'ASYNC_VIEWS': str(kind == 'asgi'), 'LOG_LEVEL': 'ERROR', **(env or {})}
+    process = subprocess.Popen(command, cwd=settings.BASE_DIR, env=server_env)
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/login/', timeout=1)
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f'{kind} server did not start: {" ".join(command)}')
+                time.sleep(0.2)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+async def _client(http, base_url, pick, deadline, results):
+    import aiohttp
+
+    while time.perf_counter() < deadline:
+        request = pick()
+        if request is None:
+            return
+        start = time.perf_counter()
+        try:
+            async with http.request(
+                request.get('method', 'GET'), base_url + request['path'],
+                data=request.get('data'), headers=request.get('headers'),
+                cookies=request.get('cookies'), allow_redirects=False,
+            ) as response:
+                await response.read()
+                status = response.status
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            status = 0
+        results.append((request['name'], status, time.perf_counter() - start))
+
+
+def _pickers(requests, concurrency, seed, sequential, passes=None):
+    """One ``pick()`` per client: a random request each, or the log in order shared by all.
+
+    With ``passes`` the log is gone through that many times, in order, and
+    ``pick()`` then returns None.
+    """
+    if sequential or passes:
+        log = itertools.chain.from_iterable(itertools.repeat(requests, passes)) if passes else itertools.cycle(requests)
+        lock = threading.Lock()
+
+        def pick():
+            with lock:
+                return next(log, None)
+        return [pick] * concurrency
+    rng = random.Random(seed)
+    return [functools.partial(random.Random(rng.random()).choice, requests) for _ in range(concurrency)]
+
+
+async def run_load(base_url, requests, concurrency, duration, seed=0, sequential=False, passes=None):
+    """Keep ``concurrency`` clients busy for ``duration`` seconds.
+
+    ``requests`` is a list of dicts with ``name``, ``path`` and optionally
+    ``method``, ``data``, ``headers`` and ``cookies``. Each client picks one
+    at random per request, or with ``sequential`` the clients work through
+    the list in order, starting over at the end. With ``passes`` they stop
+    after going through the list that many times, or at ``duration``.
+    Returns ``(results, elapsed)``: a list of ``(name, status, seconds)``
+    (status 0 is a client error) and the wall time until the last request
+    finished, which is what throughput should be computed from.
+    """
+    import aiohttp
+
+    results = []
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=0), timeout=timeout, cookie_jar=aiohttp.DummyCookieJar(),
+    ) as http:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*[
+            _client(http, base_url, pick, deadline, results)
+            for pick in _pickers(requests, concurrency, seed, sequential, passes)
+        ])
+        elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def run_in_process(requests, concurrency, duration, seed=0, sequential=False, passes=None):
+    """Like run_load(), but through django.test.Client on ``concurrency`` threads of this process.
+
+    Requests carry a ``user`` (or None) instead of cookies. No network or
+    server overhead, but the threads share one GIL, so throughput does not
+    scale with concurrency the way separate server workers do.
+    """
+    results = []
+    deadline = time.perf_counter() + duration
+
+    def worker(pick):
+        clients = {}
+        try:
+            while time.perf_counter() < deadline:
+                request = pick()
+                if request is None:
+                    return
+                user = request.get('user')
+                key = user.pk if user else None
+                if key not in clients:
+                    clients[key] = Client(raise_request_exception=False)
+                    if user:
+                        clients[key].force_login(user)
+                start = time.perf_counter()
+                response = clients[key].generic(
+                    request.get('method', 'GET'), request['path'],
+                    urlencode(request.get('data') or {}), 'application/x-www-form-urlencoded',
+                )
+                results.append((request['name'], response.status_code, time.perf_counter() - start))
+        finally:
+            connections.close_all()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, _pickers(requests, concurrency, seed, sequential, passes)))
+    return results, time.perf_counter() - start
+
+
+def summarize(results, elapsed):
+    """Return ``{name: {requests, rps, errors, rejected, p50, p95, p99}}`` plus an overall ``'*'`` entry.
+
+    ``errors`` counts failed connections and 5xx responses, ``rejected``
+    4xx responses (e.g. a replayed request the app refuses).
+    """
+    by_name = {'*': []}
+    for name, status, seconds in results:
+        by_name.setdefault(name, []).append((status, seconds))
+        by_name['*'].append((status, seconds))
+    summary = {}
+    for name, rows in by_name.items():
+        latencies = [seconds for status, seconds in rows]
+        summary[name] = {
+            'requests': len(rows),
+            'rps': len(rows) / elapsed,
+            'errors': sum(1 for status, _ in rows if status == 0 or status >= 500),
+            'rejected': sum(1 for status, _ in rows if 400 <= status < 500),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+        }
+    return summary
@@ -0,0 +1,60 @@
+"""
+Conditional GET for the HTML pages.
+
+A page's ETag is built from the jobs it shows (id, ``posted_on`` and
+``updated_at``, which every save bumps, edit_job's included) and from
+everything else the HTML depends on: the user, their role and the CSRF
+secret its forms embed. When the browser, or a cache in front of the app,
+sends the ETag back in If-None-Match, the view answers 304 right after its
+query, before rendering anything. Responses vary on Cookie, since the
+session cookie decides the user and role, and are ``private, no-cache``:
+shared caches pass every request through and clients always revalidate.
+
+Job detail also sends Last-Modified, the job's last save. The listing does
+not: the newest row on the page says nothing about a job deleted from it or
+a changed facet count, so If-Modified-Since alone would get a stale 304.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .middleware import get_role
+
+
+def page_etag(request, *parts):
+    digest = hashlib.blake2b(digest_size=12)
+    user = getattr(request, 'user', None)
+    viewer = (user.pk if user and user.is_authenticated else None, get_role(request), request.META.get('CSRF_COOKIE'))
+    for part in (*viewer, *parts):
+        digest.update(f'{part}\0'.encode())
+    return quote_etag(digest.hexdigest())
+
+
+def job_versions(jobs):
+    """ETag parts for a list of jobs: their ids and row versions, in order."""
+    return [f'{job.id}:{job.posted_on.isoformat()}:{job.updated_at.isoformat()}' for job in jobs]
+
+
+def last_modified(jobs):
+    return max((max(job.posted_on, job.updated_at) for job in jobs), default=None)
+
+
+def not_modified(request, etag, modified=None):
+    """The 304 response to send instead of the page, or None if it has to be rendered."""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    timestamp = int(modified.timestamp()) if modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None:
+        add_headers(response, etag, modified)
+    return response
+
+
+def add_headers(response, etag, modified=None):
+    response['ETag'] = etag
+    if modified:
+        response['Last-Modified'] = http_date(modified.timestamp())
+    patch_vary_headers(response, ['Cookie'])
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
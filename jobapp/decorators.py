@@ -1,10 +1,9 @@
 from django.shortcuts import redirect
-from .models import UserProfile
+from .middleware import get_role
 
 def employer_required(view_func):
     def wrapper_func(request, *args, **kwargs):
-        profile = UserProfile.objects.get(user=request.user)
-        if profile.role == 'Employer':
+        if get_role(request) == 'Employer':
             return view_func(request, *args, **kwargs)
         else:
             return redirect('home')  # or show a "Permission denied" message
@@ -12,8 +11,7 @@ def employer_required(view_func):
 
 def jobseeker_required(view_func):
     def wrapper_func(request, *args, **kwargs):
-        profile = UserProfile.objects.get(user=request.user)
-        if profile.role == 'Job Seeker':
+        if get_role(request) == 'Job Seeker':
             return view_func(request, *args, **kwargs)
         else:
             return redirect('home')
@@ -0,0 +1,120 @@
+"""
+Plain-text extraction from resume files.
+
+This module is imported by worker processes (see workers.run_in_process),
+so it only depends on the standard library and never imports Django.
+
+PDF text is read with pypdf when it is installed. Without it, a small
+built-in reader pulls the literal strings out of the page content streams,
+which is enough for the text-based PDFs that word processors export but not
+for scanned documents or unusual font encodings.
+"""
+import re
+import zipfile
+import zlib
+from xml.etree import ElementTree
+
+# Resumes longer than this are cut off; nothing useful for search is lost.
+MAX_TEXT_LENGTH = 100_000
+
+PDF = 'application/pdf'
+DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+TEXT = 'text/plain'
+
+# What a corrupt or truncated file makes extract_text() raise
+EXTRACTION_ERRORS = (OSError, ValueError, zipfile.BadZipFile, ElementTree.ParseError, zlib.error)
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PDF_STREAM_RE = re.compile(rb'stream\r?\n(.*?)\r?\nendstream', re.DOTALL)
+_PDF_TEXT_BLOCK_RE = re.compile(rb'BT(.*?)ET', re.DOTALL)
+_PDF_STRING_RE = re.compile(rb'\(((?:\\.|[^\\)])*)\)', re.DOTALL)
+_PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+_WHITESPACE_RE = re.compile(r'[ \t\r\f\v]+')
+
+
+def extract_text(path, content_type):
+    """Text of the file at ``path``, or '' for formats that are not supported (e.g. .doc)."""
+    if content_type == PDF:
+        text = _pdf_text(path)
+    elif content_type == DOCX:
+        text = _docx_text(path)
+    elif content_type == TEXT:
+        with open(path, 'rb') as f:
+            text = f.read(MAX_TEXT_LENGTH * 4).decode('utf-8', errors='replace')
+    else:
+        text = ''
+    return normalize(text)[:MAX_TEXT_LENGTH]
+
+
+def extract_many(items):
+    """``[(key, path, content_type)]`` -> ``[(key, text)]``; unreadable files give ''.
+
+    Used for batches so each task sent to a worker process carries many files.
+    """
+    results = []
+    for key, path, content_type in items:
+        try:
+            text = extract_text(path, content_type)
+        except EXTRACTION_ERRORS:
+            text = ''
+        results.append((key, text))
+    return results
+
+
+def normalize(text):
+    lines = (_WHITESPACE_RE.sub(' ', line).strip() for line in text.replace('\x00', '').splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def _docx_text(path):
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        paragraphs = []
+        for event, element in ElementTree.iterparse(document):
+            if element.tag == _WORD_NS + 'p':
+                paragraphs.append(''.join(node.text or '' for node in element.iter(_WORD_NS + 't')))
+                element.clear()
+        return '\n'.join(paragraphs)
+
+
+def _pdf_text(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        with open(path, 'rb') as f:
+            return _pdf_text_fallback(f.read())
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _pdf_text_fallback(data):
+    lines = []
+    for stream in _PDF_STREAM_RE.findall(data):
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        for block in _PDF_TEXT_BLOCK_RE.findall(stream):
+            strings = [_pdf_unescape(s) for s in _PDF_STRING_RE.findall(block)]
+            if strings:
+                lines.append(b' '.join(strings).decode('latin-1'))
+    return '\n'.join(lines)
+
+
+def _pdf_unescape(value):
+    out = bytearray()
+    i = 0
+    while i < len(value):
+        char = value[i:i + 1]
+        if char != b'\\':
+            out += char
+            i += 1
+            continue
+        following = value[i + 1:i + 2]
+        octal = re.match(rb'[0-7]{1,3}', value[i + 1:i + 4])
+        if octal:
+            out.append(int(octal.group(), 8) & 0xFF)
+            i += 1 + len(octal.group())
+        else:
+            out += _PDF_ESCAPES.get(following, following)
+            i += 2
+    return bytes(out)
@@ -0,0 +1,148 @@
+"""
+Facet counts for the job listings: category, city and salary band.
+
+All three are counted in one aggregate query per search. It groups the
+matching jobs by (category, city, salary band), which gives a few hundred
+rows at most, and the per-facet counts are summed from those rows in
+Python. Because the rows are not narrowed by the selected facets, each
+facet can be counted with the other facets' selections applied but not its
+own, so every option shows how many jobs choosing it would list.
+
+Without search text the grouped rows do not depend on the request, so they
+are cached (the "facet index") and the listing page pays no query for its
+facets at all. Job post_save/post_delete drop the cached rows (see
+signals.py); writes that bypass signals (bulk_create, queryset.update) call
+invalidate_facets() themselves or are picked up after
+FACET_CACHE_TIMEOUT.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, Value, When
+from django.db.models.functions import Lower, Trim
+
+from .models import JOB_CATEGORIES, Job
+from .search import search_jobs
+
+CACHE_KEY = 'job_facets'
+DEFAULT_CACHE_TIMEOUT = 300
+
+# Only the most common cities are listed, plus the selected one.
+MAX_CITIES = 12
+
+# (value, label, lower bound, upper bound) in ₹ per year
+SALARY_BANDS = [
+    ('0-5', "Under ₹5 LPA", None, 500000),
+    ('5-10', "₹5–10 LPA", 500000, 1000000),
+    ('10-20', "₹10–20 LPA", 1000000, 2000000),
+    ('20-30', "₹20–30 LPA", 2000000, 3000000),
+    ('30+', "₹30 LPA and above", 3000000, None),
+]
+
+CATEGORY_LABELS = dict(JOB_CATEGORIES)
+BAND_LABELS = {value: label for value, label, low, high in SALARY_BANDS}
+
+# "Pune", " pune " and "PUNE" are one city.
+CITY = Lower(Trim('location'))
+SALARY_BAND = Case(
+    *[When(salary__lt=high, then=Value(value)) for value, label, low, high in SALARY_BANDS if high],
+    default=Value(SALARY_BANDS[-1][0]),
+    output_field=CharField(),
+)
+
+# Query parameters, in the order of the grouped row columns
+FACETS = ['category', 'city', 'salary']
+
+
+def selected_facets(params):
+    """The facet values chosen in ``params`` (request.GET); unknown values are ignored."""
+    category = params.get('category')
+    city = params.get('city', '').strip().lower()
+    salary = params.get('salary')
+    return {
+        'category': category if category in CATEGORY_LABELS else None,
+        'city': city or None,
+        'salary': salary if salary in BAND_LABELS else None,
+    }
+
+
+def filter_jobs(queryset, selected):
+    """Narrow a Job queryset to the selected facet values."""
+    if selected.get('category'):
+        queryset = queryset.filter(category=selected['category'])
+    if selected.get('city'):
+        queryset = queryset.alias(city=CITY).filter(city=selected['city'])
+    if selected.get('salary'):
+        # Plain range filters, so the salary index can be used.
+        for value, label, low, high in SALARY_BANDS:
+            if value == selected['salary']:
+                if low is not None:
+                    queryset = queryset.filter(salary__gte=low)
+                if high is not None:
+                    queryset = queryset.filter(salary__lt=high)
+    return queryset
+
+
+def facet_rows(search='', location=''):
+    """Job counts grouped by (category, city, salary_band) for the jobs matching the search."""
+    if search.strip() or location.strip():
+        return _grouped(search, location)
+    rows = cache.get(CACHE_KEY)
+    if rows is None:
+        rows = _grouped()
+        cache.set(CACHE_KEY, rows, getattr(settings, 'FACET_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT))
+    return rows
+
+
+def _grouped(search='', location=''):
+    queryset = search_jobs(Job.objects.all(), search, location).order_by()
+    return list(
+        queryset.annotate(city=CITY, salary_band=SALARY_BAND)
+        .values_list('category', 'city', 'salary_band')
+        .annotate(jobs=Count('id'))
+    )
+
+
+def invalidate_facets():
+    cache.delete(CACHE_KEY)
+
+
+def facet_counts(rows, selected):
+    """Options per facet as ``{'category': [{'value', 'label', 'count', 'selected'}, ...], ...}``.
+
+    Each facet is counted with the other facets' selections applied but not
+    its own. ``total`` is the number of jobs matching every selection.
+    """
+    names = FACETS
+    counts = {name: {} for name in names}
+    total = 0
+    for row in rows:
+        values, jobs = row[:-1], row[-1]
+        misses = [name for name, value in zip(names, values) if selected[name] not in (None, value)]
+        if not misses:
+            total += jobs
+        for name, value in zip(names, values):
+            # Counted for this facet if no *other* facet excludes the row.
+            if not misses or misses == [name]:
+                counts[name][value] = counts[name].get(value, 0) + jobs
+
+    facets = {
+        'category': [
+            option('category', value, label, counts['category'].get(value, 0), selected)
+            for value, label in JOB_CATEGORIES
+        ],
+        'salary': [
+            option('salary', value, label, counts['salary'].get(value, 0), selected)
+            for value, label, low, high in SALARY_BANDS
+        ],
+    }
+    cities = [(city, count) for city, count in counts['city'].items() if city]
+    cities = sorted(cities, key=lambda item: (-item[1], item[0]))[:MAX_CITIES]
+    if selected['city'] and selected['city'] not in dict(cities):
+        cities.append((selected['city'], counts['city'].get(selected['city'], 0)))
+    facets['city'] = [option('city', value, value.title(), count, selected) for value, count in cities]
+    facets['total'] = total
+    return facets
+
+
+def option(name, value, label, count, selected):
+    return {'value': value, 'label': label, 'count': count, 'selected': selected[name] == value}
@@ -12,6 +12,11 @@ class JobForm(forms.ModelForm):
         for field in self.fields.values():
             field.widget.attrs['class'] = 'form-control'
 
+class JobImportForm(JobForm):
+    """JobForm plus the fields a bulk import may set (see the import_jobs command)."""
+    class Meta(JobForm.Meta):
+        fields = JobForm.Meta.fields + ['category', 'posted_on']
+
 class ApplicationForm(forms.ModelForm):
     class Meta:
         model = Application
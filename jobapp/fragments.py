@@ -0,0 +1,70 @@
+"""
+Cache of rendered job cards.
+
+Each card template renders one job. Entries are stored per (template, job
+id) together with a stamp of the job fields the card shows, and a cached
+card is only used when the stamp still matches the row being rendered. That
+keeps the cache correct even when an entry is written by a render that
+started before an edit. post_save/post_delete on Job (see signals.py) drop
+a job's entries straight away, so edits from any view or the admin do not
+leave dead cards behind.
+"""
+import hashlib
+
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+CACHE_ALIAS = 'fragments'
+
+# Every template rendered through render_job_cards, so invalidation knows
+# which keys a job can have.
+CARD_TEMPLATES = [
+    'jobapp/cards/home_job.html',
+    'jobapp/cards/dashboard_job.html',
+    'jobapp/cards/my_job.html',
+]
+
+
+def card_key(template_name, job_id):
+    return f'job_card:{template_name}:{job_id}'
+
+
+def card_stamp(job):
+    # applicant_count is only annotated for the employer's own cards.
+    content = '\0'.join([
+        job.title, job.company, job.location, job.posted_on.isoformat(), job.description,
+        str(getattr(job, 'applicant_count', '')),
+    ])
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def render_job_cards(jobs, template_name):
+    """Render one card per job, reusing cached cards and caching the rest."""
+    cache = caches[CACHE_ALIAS]
+    jobs = list(jobs)
+    keys = {job.id: card_key(template_name, job.id) for job in jobs}
+    cached = cache.get_many(keys.values())
+
+    template = None
+    parts = []
+    missed = {}
+    for job in jobs:
+        stamp = card_stamp(job)
+        entry = cached.get(keys[job.id])
+        if entry and entry[0] == stamp:
+            parts.append(entry[1])
+            continue
+        if template is None:
+            template = get_template(template_name)
+        html = template.render({'job': job})
+        missed[keys[job.id]] = (stamp, html)
+        parts.append(html)
+
+    if missed:
+        cache.set_many(missed)
+    return mark_safe(''.join(parts))
+
+
+def invalidate_job(job_id):
+    caches[CACHE_ALIAS].delete_many([card_key(name, job_id) for name in CARD_TEMPLATES])
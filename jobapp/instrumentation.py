@@ -0,0 +1,204 @@
+"""
+Per-view cost instrumentation.
+
+InstrumentationMiddleware records, for every request, the number of SQL
+queries, time spent in SQL, time spent rendering templates and total wall
+time, keyed by the resolved view name. With ``REQUEST_METRICS`` enabled the
+numbers are sent back in a ``Server-Timing`` header (shown by browser dev
+tools) and logged to the ``jobapp.metrics`` logger, and GETs that go over
+the view's entry in VIEW_BUDGETS are logged as warnings. With it off the
+numbers are only kept on ``request.metrics`` (jobapp.tests.ViewBudgetTests
+checks the budgets from there).
+
+Django has no hook around template rendering outside the test runner (the
+template_rendered signal is only sent there), so the template time comes
+from wrapping the Django backend's Template.render. The wrapper is only
+installed while REQUEST_METRICS is on, the one time the number is reported;
+otherwise the framework class is left as it is.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.core.signals import setting_changed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.template.backends import django as django_backend
+
+logger = logging.getLogger('jobapp.metrics')
+
+# Maximum (queries, milliseconds) per URL name for a GET with realistic data;
+# other methods are not checked.
+# jobapp.tests.ViewBudgetTests fails when a view goes over its budget, and
+# every URL in jobapp/urls.py must have an entry.
+VIEW_BUDGETS = {
+    'home': (4, 250),
+    'register': (0, 250),
+    'login': (0, 250),
+    'logout': (4, 250),
+    'signup': (0, 250),
+    # A session left over from a changed password is flushed: a third query
+    'post_job': (3, 250),
+    'apply_job': (4, 250),
+    'employer_dashboard': (4, 250),
+    'jobseeker_dashboard': (3, 250),
+    'my_applications': (3, 250),
+    'recommendations': (3, 250),
+    'saved_searches': (3, 250),
+    'my_jobs': (3, 250),
+    'candidate_search': (3, 250),
+    'job_detail': (3, 250),
+    'edit_job': (3, 250),
+    'delete_job': (3, 250),
+    'api_jobs': (3, 250),
+    'api_job_detail': (3, 250),
+    'api_my_applications': (3, 250),
+}
+
+_current = ContextVar('jobapp_request_metrics', default=None)
+
+
+@dataclass
+class RequestMetrics:
+    view_name: str = ''
+    queries: int = 0
+    sql_time: float = 0.0
+    template_time: float = 0.0
+    total_time: float = 0.0
+    rendering: bool = False
+    started: float = 0.0
+
+    def server_timing(self):
+        # SQL run lazily from a template counts towards both sql and tpl.
+        return (
+            f'sql;desc="{self.queries} queries";dur={self.sql_time * 1000:.1f}, '
+            f'tpl;dur={self.template_time * 1000:.1f}, '
+            f'total;dur={self.total_time * 1000:.1f}'
+        )
+
+    def over_budget(self):
+        budget = VIEW_BUDGETS.get(self.view_name)
+        if budget is None:
+            return False
+        max_queries, max_ms = budget
+        return self.queries > max_queries or self.total_time * 1000 > max_ms
+
+    def __str__(self):
+        return (
+            f'view={self.view_name or "-"} queries={self.queries} '
+            f'sql={self.sql_time * 1000:.1f}ms tpl={self.template_time * 1000:.1f}ms '
+            f'total={self.total_time * 1000:.1f}ms'
+        )
+
+
+def _count_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.sql_time += time.perf_counter() - start
+
+
+_original_render = django_backend.Template.render
+
+
+def _timed_render(self, context=None, request=None):
+    # Form widgets are rendered through templates of their own while the page
+    # is rendering; only the outermost render is timed.
+    metrics = _current.get()
+    if metrics is None or metrics.rendering:
+        return _original_render(self, context, request)
+    metrics.rendering = True
+    start = time.perf_counter()
+    try:
+        return _original_render(self, context, request)
+    finally:
+        metrics.template_time += time.perf_counter() - start
+        metrics.rendering = False
+
+
+def install_template_timer(enabled=True):
+    django_backend.Template.render = _timed_render if enabled else _original_render
+
+
+@receiver(setting_changed)
+def _setting_changed(sender, setting, value, **kwargs):
+    if setting == 'REQUEST_METRICS':
+        install_template_timer(bool(value))
+
+
+def install_query_counter(conn):
+    # The wrapper stays on the connection and only counts while a request is
+    # being measured. Connections are per thread, and async views run their
+    # queries on other threads than the middleware, so new connections get
+    # it through connection_created.
+    if _count_query not in conn.execute_wrappers:
+        conn.execute_wrappers.append(_count_query)
+
+
+@receiver(connection_created)
+def _connection_created(sender, connection, **kwargs):
+    install_query_counter(connection)
+
+
+class InstrumentationMiddleware:
+    """Should be the first middleware so the total covers the whole stack."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_template_timer(getattr(settings, 'REQUEST_METRICS', False))
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self.stop(metrics, token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self.stop(metrics, token)
+        return self.finish(request, response, metrics)
+
+    def start(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        token = _current.set(metrics)
+        for conn in connections.all(initialized_only=True):
+            install_query_counter(conn)
+        metrics.started = time.perf_counter()
+        return metrics, token
+
+    def stop(self, metrics, token):
+        metrics.total_time = time.perf_counter() - metrics.started
+        _current.reset(token)
+
+    def finish(self, request, response, metrics):
+        match = getattr(request, 'resolver_match', None)
+        metrics.view_name = match.view_name if match else ''
+
+        if not getattr(settings, 'REQUEST_METRICS', False):
+            return response
+        response['Server-Timing'] = metrics.server_timing()
+        logger.info('%s %s %s', request.method, request.path, metrics)
+        if request.method in ('GET', 'HEAD') and metrics.over_budget():
+            logger.warning('Over budget %s: %s %s %s', VIEW_BUDGETS[metrics.view_name], request.method, request.path, metrics)
+        return response
@@ -0,0 +1,118 @@
+import functools
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from jobapp.alerts import find_matches, job_frequency, match_jobs, new_saved_search, prefixes, send_digests
+from jobapp.bench import (
+    LOCATIONS, TITLE_ROLES, TITLE_WORDS, benchmark_database, ms, random_job, seed_jobs, seed_users,
+)
+from jobapp.models import Job, JobAlert, SavedSearch
+from jobapp.search import words
+
+
+class Command(BaseCommand):
+    help = (
+        "Time matching newly posted jobs against saved searches through the anchor-term index, "
+        "compared with checking every saved search, and sending the digests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--searches', type=int, default=100000)
+        parser.add_argument('--users', type=int, default=20000)
+        parser.add_argument('--new-jobs', type=int, nargs='+', default=[1, 10, 100])
+        parser.add_argument('--naive-jobs', type=int, default=10,
+                            help="New jobs checked against every search the slow way (it takes a while).")
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        with benchmark_database():
+            self.stdout.write(f"Seeding {options['searches']} saved searches for {options['users']} users...")
+            employers = seed_users(20, 'Employer')
+            seed_jobs(1000, employers)
+            seekers = seed_users(options['users'], 'Job Seeker')
+            for user in seekers:
+                user.email = f'{user.username}@example.test'
+            type(seekers[0]).objects.bulk_update(seekers, ['email'], batch_size=1000)
+            # Real saved searches are mostly for skills, tools and places the
+            # generated jobs never mention: made-up words stand in for those.
+            niche = [
+                ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+                for _ in range(20000)
+            ]
+            frequency = functools.lru_cache(maxsize=None)(job_frequency)
+            searches = []
+            while len(searches) < options['searches']:
+                searches.append(new_saved_search(rng.choice(seekers), *random_search(rng, niche), frequency))
+            SavedSearch.objects.bulk_create(searches, batch_size=5000, ignore_conflicts=True)
+            self.stdout.write(f"  {SavedSearch.objects.count()} distinct searches")
+
+            for count in options['new_jobs']:
+                jobs = Job.objects.bulk_create([random_job(rng, rng.choice(employers)) for _ in range(count)])
+                JobAlert.objects.all().delete()
+                # Seeding overflowed the query log, which would count as no queries
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    alerts = match_jobs(jobs)
+                    elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{count:>5} new jobs: match and save alerts {ms(elapsed)} ({ms(elapsed / count)} per job), "
+                    f"{len(queries)} queries, {alerts} alerts"
+                )
+
+            # Finding the matches only, without saving them, both ways
+            jobs = jobs[:options['naive_jobs']]
+            started = time.perf_counter()
+            indexed = find_matches(jobs)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{len(jobs):>5} new jobs: find, indexed      {ms(elapsed)} ({ms(elapsed / len(jobs))} per job)")
+            started = time.perf_counter()
+            expected = every_search(jobs)
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{len(jobs):>5} new jobs: find, every search {ms(elapsed)} ({ms(elapsed / len(jobs))} per job)")
+            if sorted(indexed) != sorted(expected):
+                self.stderr.write("  the two methods found different matches")
+
+            started = time.perf_counter()
+            with override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+                sent = send_digests()
+            self.stdout.write(f"Digests: {sent} emails in {ms(time.perf_counter() - started)}")
+
+
+def random_search(rng, niche):
+    kind = rng.random()
+    if kind < 0.7:
+        search = f'{rng.choice(niche)} {rng.choice(TITLE_ROLES + [""])}'
+    elif kind < 0.85:
+        search = f'{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_ROLES)}'
+    elif kind < 0.95:
+        search = rng.choice(TITLE_WORDS)
+    else:
+        search = rng.choice(TITLE_ROLES)
+    # Some searches are typed partly, which still matches as a prefix
+    if rng.random() < 0.2:
+        search = search[:max(3, len(search) - 3)]
+    location = rng.choice(LOCATIONS) if rng.random() < 0.8 else ''
+    return search, location
+
+
+def every_search(jobs):
+    """find_matches() without the index: every saved search checked against every job."""
+    searches = [
+        (saved_id, terms.split(), location_terms.split())
+        for saved_id, terms, location_terms in SavedSearch.objects.values_list('id', 'terms', 'location_terms')
+    ]
+    matches = []
+    for job in jobs:
+        text = prefixes(words(f'{job.title} {job.company} {job.description} {job.location}'))
+        place = prefixes(words(job.location))
+        for saved_id, terms, location_terms in searches:
+            if all(term in text for term in terms) and all(term in place for term in location_terms):
+                matches.append((saved_id, job.pk))
+    return matches
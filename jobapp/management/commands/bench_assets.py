@@ -0,0 +1,100 @@
+import gzip
+import os
+import re
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+from jobapp.bench import benchmark_database, seed_jobs, seed_users
+
+MANIFEST = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+
+# What the home page <head> loaded before: Bootstrap from jsdelivr and the
+# unbundled, uncompressed style.css.
+CDN = 'https://cdn.jsdelivr.net/npm/bootstrap@5.3.2/dist'
+OLD_STYLESHEETS = (
+    f'<link href="{CDN}/css/bootstrap.min.css" rel="stylesheet">\n'
+    '<link rel="stylesheet" href="/static/jobapp/style.css">'
+)
+STYLESHEETS = re.compile(r'<style>.*?</noscript>', re.S)
+STATIC_URLS = re.compile(r'(?:href|src)="(/static/[^"]+)"')
+
+
+class Command(BaseCommand):
+    help = (
+        "Bytes transferred for the home page's CSS and JS with Bootstrap from the CDN (before) and with "
+        "the self-hosted, hashed, precompressed bundle plus inlined critical CSS (after), and an estimate "
+        "of the time to first render on a slow connection."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rtt', type=float, default=150, help="Round trip time in ms.")
+        parser.add_argument('--bandwidth', type=float, default=1.6, help="Download speed in Mbit/s.")
+
+    def handle(self, *args, **options):
+        self.rtt = options['rtt'] / 1000
+        self.bytes_per_second = options['bandwidth'] * 1e6 / 8
+        with benchmark_database(), tempfile.TemporaryDirectory() as static_root:
+            self.static_root = static_root
+            seed_jobs(60, seed_users(5, 'Employer'))
+            with override_settings(DEBUG=False, STATIC_ROOT=static_root, STORAGES=MANIFEST):
+                call_command('collectstatic', interactive=False, verbosity=0)
+                client = Client()
+                client.force_login(seed_users(1, 'Job Seeker')[0])
+                self.report(client)
+
+    def report(self, client):
+        response = client.get('/')
+        if response.status_code != 200:
+            raise RuntimeError(f"home returned {response.status_code}")
+        html = response.content.decode()
+        files = {url: self.fetch(client, url) for url in STATIC_URLS.findall(html)}
+        for url, (size, response) in files.items():
+            self.stdout.write(
+                f"  {url}: {size} bytes ({response.get('Content-Encoding', 'identity')}), "
+                f"Cache-Control: {response['Cache-Control']}"
+            )
+        css = next(size for url, (size, _) in files.items() if url.endswith('.css'))
+        js = next(size for url, (size, _) in files.items() if url.endswith('.js'))
+
+        # Before: the same Bootstrap version from jsdelivr, which serves it
+        # Brotli compressed; stand-ins are our Brotli copies of the vendored files.
+        old_html = STYLESHEETS.sub(OLD_STYLESHEETS, html)
+        cdn_css = self.fetch(client, '/static/jobapp/vendor/bootstrap/bootstrap.min.css')[0]
+        cdn_js = self.fetch(client, '/static/jobapp/vendor/bootstrap/bootstrap.bundle.min.js')[0]
+        style = os.path.getsize(os.path.join(self.static_root, 'jobapp', 'style.css'))
+        old_page = len(gzip.compress(old_html.encode()))
+        page = len(gzip.compress(html.encode()))
+
+        self.stdout.write("\nTransfer (HTML gzipped):")
+        self.stdout.write(f"  before: HTML {old_page} + CSS {cdn_css} + {style} + JS {cdn_js} = "
+                          f"{old_page + cdn_css + style + cdn_js} bytes, {old_page + cdn_css + style} before first render")
+        self.stdout.write(f"  after:  HTML {page} + CSS {css} + JS {js} = "
+                          f"{page + css + js} bytes, {page} before first render")
+
+        self.stdout.write(f"\nFirst render, estimated at {self.rtt * 1000:.0f} ms RTT, "
+                          f"{self.bytes_per_second * 8 / 1e6:g} Mbit/s:")
+        # A new HTTPS connection costs 2 round trips (TCP, TLS 1.3), a new
+        # host one more for DNS, and each request one plus its transfer time.
+        html_done = 3 * self.rtt + self.transfer(old_page)
+        cdn_done = html_done + 4 * self.rtt + self.transfer(cdn_css)
+        style_done = html_done + self.rtt + self.transfer(style)
+        self.stdout.write(f"  before, first visit: {max(cdn_done, style_done) * 1000:.0f} ms "
+                          "(waits for both stylesheets, one on a second host)")
+        # style.css was served with a 60 s max-age, so a later visit
+        # revalidates it before rendering.
+        self.stdout.write(f"  before, repeat visit: {(3 * self.rtt + self.transfer(old_page) + self.rtt) * 1000:.0f} ms")
+        after = 3 * self.rtt + self.transfer(page)
+        self.stdout.write(f"  after, any visit:    {after * 1000:.0f} ms (critical CSS arrives with the HTML)")
+
+    def transfer(self, size):
+        return size / self.bytes_per_second
+
+    def fetch(self, client, url):
+        response = client.get(url, HTTP_ACCEPT_ENCODING='br, gzip')
+        return len(b''.join(response.streaming_content)), response
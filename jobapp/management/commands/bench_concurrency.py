@@ -0,0 +1,71 @@
+import asyncio
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from jobapp.bench import (
+    benchmark_database, ms, run_load, seed_applications, seed_jobs, seed_users,
+    session_cookie, start_server, summarize,
+)
+from jobapp.models import Job
+
+
+class Command(BaseCommand):
+    help = (
+        "Throughput and latency of the read-heavy pages under gunicorn (WSGI, sync views) "
+        "and uvicorn (ASGI, async views) at increasing numbers of concurrent clients."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, nargs='+', default=[50, 200, 1000])
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per run.")
+        parser.add_argument('--workers', type=int, default=4, help="Server worker processes.")
+        parser.add_argument('--jobs', type=int, default=20000)
+        parser.add_argument('--modes', nargs='+', choices=['wsgi', 'asgi'], default=['wsgi', 'asgi'])
+        parser.add_argument('--port', type=int, default=8765)
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.sqlite3')
+            with benchmark_database(name=db_path):
+                self.stdout.write(f"Seeding {options['jobs']} jobs into {db_path}...")
+                employers = seed_users(50, 'Employer')
+                seekers = seed_users(100, 'Job Seeker')
+                seed_jobs(options['jobs'], employers)
+                seed_applications(seekers, 30)
+                job_ids = list(Job.objects.order_by('?').values_list('id', flat=True)[:200])
+
+                requests = []
+                for seeker in seekers:
+                    cookies = {'sessionid': session_cookie(seeker)}
+                    requests += [
+                        {'name': 'home', 'path': '/', 'cookies': cookies},
+                        {'name': 'home', 'path': '/?search=python', 'cookies': cookies},
+                        {'name': 'my_applications', 'path': '/my-applications/', 'cookies': cookies},
+                    ]
+                    requests += [
+                        {'name': 'job_detail', 'path': f'/job/{job_id}/', 'cookies': cookies}
+                        for job_id in job_ids[:3]
+                    ]
+                for employer in employers:
+                    cookies = {'sessionid': session_cookie(employer)}
+                    requests.append({'name': 'employer_dashboard', 'path': '/employer/dashboard/', 'cookies': cookies})
+
+                for mode in options['modes']:
+                    with start_server(mode, options['port'], options['workers'], env={'SQLITE_PATH': db_path}) as url:
+                        for clients in options['clients']:
+                            results, elapsed = asyncio.run(run_load(url, requests, clients, options['duration']))
+                            self.report(mode, clients, summarize(results, elapsed))
+
+    def report(self, mode, clients, summary):
+        total = summary['*']
+        self.stdout.write(
+            f"{mode} {clients:>5} clients: {total['rps']:8.1f} req/s  "
+            f"p50 {ms(total['p50'])}  p95 {ms(total['p95'])}  p99 {ms(total['p99'])}  errors {total['errors']}"
+        )
+        for name, row in sorted(summary.items()):
+            if name != '*':
+                self.stdout.write(
+                    f"    {name:<20} {row['rps']:8.1f} req/s  p50 {ms(row['p50'])}  p99 {ms(row['p99'])}"
+                )
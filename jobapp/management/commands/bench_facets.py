@@ -0,0 +1,94 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobapp.bench import benchmark_database, describe, measure, ms, seed_jobs, seed_users
+from jobapp.facets import (
+    CITY, SALARY_BANDS, _grouped, facet_counts, facet_rows, filter_jobs, invalidate_facets, selected_facets,
+)
+from jobapp.models import JOB_CATEGORIES, Job
+from jobapp.search import search_jobs
+
+# (search, location, selected facets)
+QUERIES = [
+    ('', '', {}),
+    ('', '', {'category': 'Data', 'salary': '10-20'}),
+    ('engineer', '', {}),
+    ('python developer', '', {'city': 'pune'}),
+    ('', 'remote', {}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the home page facet counts on a seeded test database: one COUNT per facet option, "
+        "the single grouped query, and the cached facet index."
+    )
+
+    def add_arguments(self, parser):
+        # The per-option COUNTs combined with full-text search get slow
+        # quickly on SQLite (see per_option_counts), hence the smaller default.
+        parser.add_argument('--jobs', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with benchmark_database():
+            self.stdout.write(f"Seeding {options['jobs']} jobs...")
+            seed_jobs(options['jobs'], seed_users(50, 'Employer'))
+            cities = list(Job.objects.annotate(city=CITY).values_list('city', flat=True).distinct())
+            options_count = len(JOB_CATEGORIES) + len(cities) + len(SALARY_BANDS)
+
+            for search, location, chosen in QUERIES:
+                selected = selected_facets(chosen)
+
+                def naive():
+                    return per_option_counts(search, location, selected, cities)
+
+                def grouped():
+                    return facet_counts(_grouped(search, location), selected)
+
+                def cached():
+                    return facet_counts(facet_rows(search, location), selected)
+
+                self.stdout.write(f"search={search!r} location={location!r} facets={chosen}")
+                # Timed once: it is by far the slowest and its result is
+                # needed to check the grouped counts.
+                started = time.perf_counter()
+                expected = naive()
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"  COUNT per option ({options_count} queries): {ms(elapsed)}")
+                if as_counts(grouped()) != expected:
+                    self.stderr.write("  facet counts differ between the two methods")
+                self.stdout.write(f"  grouped query:              {describe(measure(grouped, repeat))}")
+                if not search and not location:
+                    invalidate_facets()
+                    self.stdout.write(f"  cached facet index:         {describe(measure(cached, repeat))}")
+
+
+def per_option_counts(search, location, selected, cities):
+    """The counts the obvious way: a COUNT(*) per option, with the other facets' selections applied.
+
+    Besides the number of queries, on SQLite a COUNT combining the full-text
+    match with a category filter is planned from the category index, with
+    one FTS lookup per job in the category, so it grows much faster than the
+    number of jobs.
+    """
+    def count(name, value):
+        queryset = filter_jobs(search_jobs(Job.objects.all(), search, location), {**selected, name: value})
+        return queryset.count()
+
+    counts = {
+        'category': {value: count('category', value) for value, label in JOB_CATEGORIES},
+        'city': {city: count('city', city) for city in cities},
+        'salary': {value: count('salary', value) for value, label, low, high in SALARY_BANDS},
+    }
+    return {name: {value: jobs for value, jobs in options.items() if jobs} for name, options in counts.items()}
+
+
+def as_counts(facets):
+    """facet_counts() output as ``{facet: {value: count}}``, leaving out empty options."""
+    return {
+        name: {option['value']: option['count'] for option in facets[name] if option['count']}
+        for name in ('category', 'city', 'salary')
+    }
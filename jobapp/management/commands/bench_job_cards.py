@@ -0,0 +1,46 @@
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.loader import get_template
+
+from jobapp.bench import benchmark_database, describe, measure, seed_jobs, seed_users
+from jobapp.fragments import CACHE_ALIAS, render_job_cards
+from jobapp.models import Job
+
+TEMPLATE = 'jobapp/cards/home_job.html'
+
+
+class Command(BaseCommand):
+    help = "Compare rendering job cards inline with the fragment cache, cold and warm."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[20, 100, 500])
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        cache = caches[CACHE_ALIAS]
+        # The old home.html loop, with the card markup inline.
+        card_source = get_template(TEMPLATE).template.source
+        inline = engines['django'].from_string('{% for job in jobs %}' + card_source + '{% endfor %}')
+
+        with benchmark_database():
+            employers = seed_users(10, 'Employer')
+            seed_jobs(max(options['sizes']), employers)
+
+            for size in options['sizes']:
+                jobs = list(Job.objects.order_by('-posted_on', '-id')[:size])
+
+                def cold():
+                    cache.clear()
+                    render_job_cards(jobs, TEMPLATE)
+
+                inline_timings = measure(lambda: inline.render({'jobs': jobs}), options['repeat'])
+                cold_timings = measure(cold, options['repeat'])
+                render_job_cards(jobs, TEMPLATE)
+                warm_timings = measure(lambda: render_job_cards(jobs, TEMPLATE), options['repeat'])
+
+                self.stdout.write(f"{size} cards")
+                self.stdout.write(f"  inline loop:  {describe(inline_timings)}")
+                self.stdout.write(f"  cache cold:   {describe(cold_timings)}")
+                self.stdout.write(f"  cache warm:   {describe(warm_timings)}")
+            cache.clear()
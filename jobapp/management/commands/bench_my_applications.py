@@ -0,0 +1,54 @@
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+
+from jobapp.bench import benchmark_database, describe, measure, seed_applications, seed_jobs, seed_users
+from jobapp.models import Application
+
+
+def legacy_my_applications(user):
+    """The previous implementation: every application, then a job query per row."""
+    applications = Application.objects.filter(applicant=user).order_by('-applied_at')
+    unique_apps = OrderedDict()
+    for app in applications:
+        if app.job.id not in unique_apps:
+            unique_apps[app.job.id] = app
+    return [app.job.title for app in unique_apps.values()]
+
+
+class Command(BaseCommand):
+    help = "Show that my_applications runs a constant number of queries however many applications a seeker has."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 5000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        with benchmark_database():
+            employers = seed_users(20, 'Employer')
+            seed_jobs(max(options['sizes']) * 2, employers)
+            client = Client()
+            url = reverse('my_applications')
+
+            for size in options['sizes']:
+                seeker = seed_users(1, 'Job Seeker', prefix=f'seeker{size}_')[0]
+                seed_applications([seeker], size)
+                client.force_login(seeker)
+                # The query log is capped; seeding can fill it up.
+                reset_queries()
+
+                with CaptureQueriesContext(connection) as view_queries:
+                    client.get(url)
+                with CaptureQueriesContext(connection) as legacy_queries:
+                    legacy_my_applications(seeker)
+                view_timings = measure(lambda: client.get(url), options['repeat'])
+                legacy_timings = measure(lambda: legacy_my_applications(seeker), options['repeat'])
+
+                self.stdout.write(f"{size} applications")
+                self.stdout.write(f"  view (page 1):  {len(view_queries)} queries, {describe(view_timings)}")
+                self.stdout.write(f"  legacy loop:    {len(legacy_queries)} queries, {describe(legacy_timings)}")
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_test_environment
+from django.urls import Resolver404, resolve
+from django.utils.crypto import get_random_string
+
+from jobapp.bench import (
+    benchmark_database, ms, run_in_process, run_load, seed_applications, seed_jobs, seed_scenario,
+    seed_users, session_cookie, start_server, summarize, view_requests,
+)
+from jobapp.models import Job
+
+ROLES = {'Job Seeker', 'Employer'}
+
+# Path placeholders filled in from the seeded database, since ids in a log
+# recorded elsewhere mean nothing here.
+#   {job}       a random job
+#   {own_job}   a job posted by the replaying employer
+#   {open_job}  a job the replaying seeker has not applied to
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a request log against the app, in-process or under gunicorn/uvicorn, and report "
+        "throughput and p50/p95/p99 latency per URL name. Each log line is a JSON object with "
+        "method, path, query, role ('Job Seeker', 'Employer' or null) and optionally data "
+        "(form fields for POST). Use --write-sample to create a log to start from."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('log', help="Request log (JSONL).")
+        parser.add_argument('--write-sample', type=int, metavar='N',
+                            help="Write N requests covering every GET view to LOG and exit.")
+        parser.add_argument('--targets', nargs='+', choices=['inprocess', 'wsgi', 'asgi'], default=['inprocess'])
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10])
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per run.")
+        parser.add_argument('--shuffle', action='store_true', help="Pick requests at random instead of in log order.")
+        parser.add_argument('--passes', type=int,
+                            help="Go through the log this many times, in order, then stop (--duration still caps the run).")
+        parser.add_argument('--jobs', type=int, default=20000)
+        parser.add_argument('--workers', type=int, default=4, help="Server worker processes.")
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--output', help="Write the results as JSON, e.g. to compare with a later release.")
+        parser.add_argument('--baseline', help="JSON written by --output earlier; show the p95 change per URL.")
+
+    def handle(self, *args, **options):
+        if options['write_sample']:
+            return self.write_sample(options['log'], options['write_sample'])
+
+        log = self.read_log(options['log'])
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        setup_test_environment()
+        report = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'bench.sqlite3')
+            with benchmark_database(name=db_path):
+                self.stdout.write(f"Seeding {options['jobs']} jobs into {db_path}...")
+                scenario = seed_scenario(jobs=0, employers=1, seekers=1)
+                employers = [scenario.employer] + seed_users(49, 'Employer')
+                seed_jobs(options['jobs'], employers)
+                seed_applications(seed_users(100, 'Job Seeker'), 30)
+                scenario.own_job = Job.objects.filter(posted_by=scenario.employer).first()
+                scenario.open_job = Job.objects.exclude(application__applicant=scenario.seeker).first()
+                requests = self.resolve_log(log, scenario)
+
+                for target in options['targets']:
+                    if target == 'inprocess':
+                        for clients in options['concurrency']:
+                            results, elapsed = run_in_process(
+                                requests, clients, options['duration'], sequential=not options['shuffle'],
+                                passes=options['passes'])
+                            report[f'{target}/{clients}'] = self.report(
+                                target, clients, summarize(results, elapsed), baseline)
+                        continue
+                    served = self.with_cookies(requests, scenario)
+                    with start_server(target, options['port'], options['workers'], env={'SQLITE_PATH': db_path}) as url:
+                        for clients in options['concurrency']:
+                            results, elapsed = asyncio.run(run_load(
+                                url, served, clients, options['duration'], sequential=not options['shuffle'],
+                                passes=options['passes']))
+                            report[f'{target}/{clients}'] = self.report(
+                                target, clients, summarize(results, elapsed), baseline)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+    # -----------------------------
+    # Log handling
+    # -----------------------------
+
+    def read_log(self, path):
+        log = []
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError as exc:
+                    raise CommandError(f"{path}:{number}: invalid JSON: {exc}")
+                if entry.get('role') not in ROLES | {None}:
+                    raise CommandError(f"{path}:{number}: unknown role {entry.get('role')!r}")
+                log.append(entry)
+        if not log:
+            raise CommandError(f"{path} has no requests.")
+        return log
+
+    def resolve_log(self, log, scenario):
+        """Turn log entries into run_in_process() requests, named by URL name."""
+        job_ids = list(Job.objects.values_list('id', flat=True)[:1000])
+        rng = random.Random(0)
+        users = {'Job Seeker': scenario.seeker, 'Employer': scenario.employer, None: None}
+        requests = []
+        for entry in log:
+            path = entry['path'].format(
+                job=rng.choice(job_ids), own_job=scenario.own_job.id, open_job=scenario.open_job.id,
+            )
+            try:
+                name = resolve(path).url_name
+            except Resolver404:
+                name = '(404)'
+            if entry.get('query'):
+                path += '?' + entry['query']
+            requests.append({
+                'name': name,
+                'method': entry.get('method', 'GET').upper(),
+                'path': path,
+                'data': entry.get('data'),
+                'user': users[entry.get('role')],
+            })
+        return requests
+
+    def with_cookies(self, requests, scenario):
+        """Add session and CSRF cookies so the requests can be sent to a real server."""
+        csrf = get_random_string(32)
+        cookies = {None: {'csrftoken': csrf}}
+        for user in (scenario.seeker, scenario.employer):
+            cookies[user.pk] = {'sessionid': session_cookie(user), 'csrftoken': csrf}
+        served = []
+        for request in requests:
+            user = request['user']
+            served.append({
+                **{key: value for key, value in request.items() if key != 'user'},
+                'cookies': cookies[user.pk if user else None],
+                'headers': {'X-CSRFToken': csrf},
+            })
+        return served
+
+    def write_sample(self, path, count):
+        """A log mixing the GET views the way a busy day might: mostly browsing and searching."""
+        placeholders = {'apply_job': '{open_job}', 'job_detail': '{job}', 'edit_job': '{own_job}',
+                        'delete_job': '{own_job}'}
+        roles = {'Job Seeker': 'Job Seeker', 'Employer': 'Employer'}
+        scenario = _PlaceholderScenario()
+        entries = []
+        for name, user, url in view_requests(scenario):
+            if name in placeholders:
+                url = url.replace('/0/', '/' + placeholders[name] + '/')
+            if name == 'logout':
+                continue
+            role = roles.get(user) if user else None
+            weight = {'home': 8, 'job_detail': 6, 'my_applications': 3, 'employer_dashboard': 3}.get(name, 1)
+            entries += [{'method': 'GET', 'path': url, 'query': '', 'role': role}] * weight
+        entries += [{'method': 'GET', 'path': '/', 'query': 'search=python', 'role': 'Job Seeker'}] * 4
+        entries += [{'method': 'GET', 'path': '/', 'query': 'search=data&location=pune', 'role': 'Job Seeker'}] * 2
+
+        rng = random.Random(0)
+        with open(path, 'w', encoding='utf-8') as f:
+            for _ in range(count):
+                f.write(json.dumps(rng.choice(entries)) + '\n')
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} requests to {path}."))
+
+    # -----------------------------
+    # Reporting
+    # -----------------------------
+
+    def report(self, target, clients, summary, baseline):
+        total = summary['*']
+        self.stdout.write(
+            f"{target} {clients:>5} clients: {total['rps']:8.1f} req/s  "
+            f"p50 {ms(total['p50'])}  p95 {ms(total['p95'])}  p99 {ms(total['p99'])}  errors {total['errors']}"
+        )
+        previous = (baseline or {}).get(f'{target}/{clients}', {})
+        for name, row in sorted(summary.items()):
+            if name == '*':
+                continue
+            line = (
+                f"    {name:<20} {row['requests']:>7}  {row['rps']:8.1f} req/s  "
+                f"p50 {ms(row['p50'])}  p95 {ms(row['p95'])}  p99 {ms(row['p99'])}  "
+                f"errors {row['errors']}  4xx {row['rejected']}"
+            )
+            if name in previous and previous[name]['p95']:
+                change = (row['p95'] - previous[name]['p95']) / previous[name]['p95'] * 100
+                line += f"  p95 {change:+.0f}% vs baseline"
+            self.stdout.write(line)
+        return summary
+
+
+class _PlaceholderScenario:
+    """Stands in for a seeded scenario so view_requests() can build paths for the sample log."""
+    seeker = 'Job Seeker'
+    employer = 'Employer'
+    own_job = open_job = type('Job', (), {'id': 0})()
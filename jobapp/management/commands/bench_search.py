@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from jobapp.bench import benchmark_database, describe, measure, seed_jobs, seed_users
+from jobapp.models import Job
+from jobapp.search import legacy_search, search_jobs
+
+QUERIES = [
+    ('python', ''),
+    ('data analyst', ''),
+    ('acme', ''),
+    ('dev', ''),
+    ('engineer', 'pune'),
+    ('', 'remote'),
+]
+
+
+class Command(BaseCommand):
+    help = "Compare the icontains search path with the full-text index on a seeded test database."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--limit', type=int, default=20, help="Rows fetched per query (one page).")
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        with benchmark_database():
+            self.stdout.write(f"Seeding {options['jobs']} jobs...")
+            employers = seed_users(50, 'Employer')
+            seed_jobs(options['jobs'], employers)
+
+            for search, location in QUERIES:
+                legacy = legacy_search(Job.objects.order_by('-posted_on'), search, location)
+                ranked = search_jobs(Job.objects.all(), search, location)
+
+                legacy_timings = measure(lambda: list(legacy.values_list('id', flat=True)[:limit]), options['repeat'])
+                ranked_timings = measure(lambda: list(ranked.values_list('id', flat=True)[:limit]), options['repeat'])
+
+                self.stdout.write(f"search={search!r} location={location!r}")
+                self.stdout.write(f"  icontains: {describe(legacy_timings)} ({legacy.count()} hits)")
+                self.stdout.write(f"  indexed:   {describe(ranked_timings)} ({ranked.count()} hits)")
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from jobapp.api import JOB_FIELDS, JOB_LIST_FIELDS, fetch, present
+from jobapp.bench import benchmark_database, measure, seed_jobs, seed_users
+from jobapp.models import Job
+
+SPARSE_FIELDS = ['id', 'title', 'company']
+
+
+class JobModelSerializer(serializers.ModelSerializer):
+    """What a textbook DRF endpoint would use, for comparison."""
+
+    class Meta:
+        model = Job
+        fields = list(JOB_FIELDS)
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class Command(BaseCommand):
+    help = "Per-item cost of serializing jobs with a DRF ModelSerializer vs. the compact values() path of jobapp/api.py."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=5000)
+        parser.add_argument('--items', type=int, nargs='+', default=[20, 100, 1000], help="Items per response.")
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        with benchmark_database():
+            self.stdout.write(f"Seeding {options['jobs']} jobs...")
+            seed_jobs(options['jobs'], seed_users(20, 'Employer'))
+            ordered = Job.objects.order_by('-posted_on', '-id')
+
+            for items in options['items']:
+                self.stdout.write(f"{items} items per response:")
+                for label, fields in (('list fields', JOB_LIST_FIELDS), ('sparse id,title,company', SPARSE_FIELDS)):
+                    def model_serializer():
+                        jobs = list(ordered[:items])
+                        return renderer.render(JobModelSerializer(jobs, many=True, fields=fields).data)
+
+                    def compact():
+                        rows = list(fetch(ordered, fields, JOB_FIELDS, always=('id', 'updated_at'))[:items])
+                        return renderer.render(present(rows, fields, JOB_FIELDS))
+
+                    for name, func in (('ModelSerializer', model_serializer), ('compact values()', compact)):
+                        timings = measure(func, options['repeat'])
+                        size = len(func())
+                        per_item = min(timings) / items * 1e6
+                        self.stdout.write(
+                            f"  {label:<24} {name:<17} {per_item:8.1f} µs/item  {size / items:6.0f} bytes/item"
+                        )
@@ -0,0 +1,85 @@
+import itertools
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+
+from jobapp.backends import USER_CACHE
+from jobapp.bench import benchmark_database, ms, percentile, seed_jobs, seed_users
+
+# SESSION_STORE and USER_CACHE_TIMEOUT combinations, as in settings.py
+MODES = {
+    'db': ('django.contrib.sessions.backends.db', 0),
+    'cached_db': ('django.contrib.sessions.backends.cached_db', 0),
+    'cached_db + user cache': ('django.contrib.sessions.backends.cached_db', 60),
+    'signed_cookies + user cache': ('django.contrib.sessions.backends.signed_cookies', 60),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests/sec of the home page for logged-in job seekers with sessions in the database, "
+        "in the cache, or in signed cookies, with and without the in-memory user cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per mode.")
+        parser.add_argument('--jobs', type=int, default=20000)
+        parser.add_argument('--seekers', type=int, default=20)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        with benchmark_database():
+            self.stdout.write(f"Seeding {options['jobs']} jobs...")
+            seed_jobs(options['jobs'], seed_users(50, 'Employer'))
+            seekers = seed_users(options['seekers'], 'Job Seeker')
+
+            for mode, (engine, user_cache_timeout) in MODES.items():
+                with override_settings(SESSION_ENGINE=engine, USER_CACHE_TIMEOUT=user_cache_timeout):
+                    caches['sessions'].clear()
+                    caches[USER_CACHE].clear()
+                    queries = self.auth_queries(seekers[0])
+                    timings, elapsed = self.run(seekers, options['duration'])
+                    self.stdout.write(
+                        f"{mode:<28} {len(timings) / elapsed:8.1f} req/s  p50 {ms(percentile(timings, 50))}  "
+                        f"p99 {ms(percentile(timings, 99))}  session/user queries per request: {queries}"
+                    )
+            caches['sessions'].clear()
+
+    def run(self, seekers, duration):
+        """Request the home page round robin as each seeker for ``duration`` seconds.
+
+        Everyone logs in and visits once first, so only repeat visits are timed.
+        """
+        clients = []
+        for seeker in seekers:
+            client = Client()
+            client.force_login(seeker)
+            client.get('/')
+            clients.append(client)
+        timings = []
+        started = time.perf_counter()
+        for client in itertools.cycle(clients):
+            clock = time.perf_counter()
+            response = client.get('/')
+            timings.append(time.perf_counter() - clock)
+            if response.status_code != 200:
+                raise RuntimeError(f"home returned {response.status_code}")
+            if clock - started > duration:
+                break
+        return timings, time.perf_counter() - started
+
+    def auth_queries(self, user):
+        """Queries on django_session and auth_user for a repeat visit to the home page."""
+        client = Client()
+        client.force_login(user)
+        client.get('/')
+        with CaptureQueriesContext(connection) as captured:
+            client.get('/')
+        return sum(
+            1 for query in captured.captured_queries
+            if 'django_session' in query['sql'] or '"auth_user"' in query['sql'].split('WHERE')[0]
+        )
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from jobapp.applications import submit_application
+from jobapp.bench import benchmark_database, ms, percentile, random_job, seed_applications, seed_jobs, seed_users
+from jobapp.models import Application, Job
+from jobapp.queries import listing_jobs
+
+# Seconds given to the worker processes to start before the clock starts
+STARTUP_DELAY = 5.0
+
+
+class Command(BaseCommand):
+    help = (
+        "Throughput of concurrent Job/Application writes and reads from several processes on one SQLite "
+        "file, once per SQLITE_PROFILE (SQLite defaults vs. the tuned WAL profile)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per profile.")
+        parser.add_argument('--write-ratio', type=float, default=0.2,
+                            help="Share of operations that write (post a job or apply to one).")
+        parser.add_argument('--jobs', type=int, default=20000)
+        parser.add_argument('--profiles', nargs='+', choices=['default', 'tuned'],
+                            default=['default', 'tuned'])
+        # Internal: run as one of the worker processes
+        parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+        parser.add_argument('--start-at', type=float, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if settings.DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError("bench_sqlite needs DB_ENGINE=sqlite.")
+        if options['worker'] is not None:
+            return self.work(options)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            seeded = os.path.join(tmp, 'seeded.sqlite3')
+            with benchmark_database(name=seeded):
+                self.stdout.write(f"Seeding {options['jobs']} jobs into {seeded}...")
+                seekers = seed_users(200, 'Job Seeker')
+                seed_jobs(options['jobs'], seed_users(50, 'Employer'))
+                seed_applications(seekers, 10)
+                connection.close()
+
+                for profile in options['profiles']:
+                    # A fresh copy per profile: the journal mode is stored in the file.
+                    path = os.path.join(tmp, f'{profile}.sqlite3')
+                    copy_database(seeded, path)
+                    self.report(profile, self.run_workers(path, profile, options))
+
+    def run_workers(self, path, profile, options):
+        start_at = time.time() + STARTUP_DELAY
+        env = {**os.environ, 'SQLITE_PATH': path, 'SQLITE_PROFILE': profile, 'LOG_LEVEL': 'ERROR'}
+        command = [sys.executable, 'manage.py', 'bench_sqlite', '--start-at', str(start_at),
+                   '--duration', str(options['duration']), '--write-ratio', str(options['write_ratio'])]
+        workers = [
+            subprocess.Popen(command + ['--worker', str(i)], cwd=settings.BASE_DIR, env=env,
+                             stdout=subprocess.PIPE, text=True)
+            for i in range(options['processes'])
+        ]
+        results = []
+        for worker in workers:
+            output, _ = worker.communicate()
+            if worker.returncode:
+                raise CommandError(f"A worker process failed with exit code {worker.returncode}.")
+            results.append(json.loads(output))
+        return results
+
+    def report(self, profile, results):
+        duration = max(result['elapsed'] for result in results)
+        self.stdout.write(f"{profile} ({len(results)} processes):")
+        for kind in ('read', 'write'):
+            timings = [t for result in results for t in result[kind]]
+            errors = sum(result[f'{kind}_errors'] for result in results)
+            self.stdout.write(
+                f"  {kind + 's':<7} {len(timings) / duration:9.1f} ops/s  p50 {ms(percentile(timings, 50))}  "
+                f"p99 {ms(percentile(timings, 99))}  max {ms(max(timings, default=0))}  "
+                f"'database is locked' {errors}"
+            )
+
+    # -----------------------------
+    # Worker process
+    # -----------------------------
+
+    def work(self, options):
+        rng = random.Random(options['worker'])
+        employers = list(User.objects.filter(userprofile__role='Employer'))
+        seekers = list(User.objects.filter(userprofile__role='Job Seeker').values_list('id', flat=True))
+        job_ids = list(Job.objects.values_list('id', flat=True))
+        operations = {
+            'read': [
+                lambda: list(listing_jobs()[:20]),
+                lambda: Job.objects.get(pk=rng.choice(job_ids)),
+                lambda: list(Application.objects.filter(applicant_id=rng.choice(seekers))
+                             .select_related('job').order_by('-applied_at')[:20]),
+            ],
+            'write': [
+                lambda: random_job(rng, rng.choice(employers)).save(),
+                lambda: submit_application(Application(
+                    job_id=rng.choice(job_ids), applicant_id=rng.choice(seekers), name='Bench', email='b@x.com',
+                )),
+            ],
+        }
+        result = {'read': [], 'write': [], 'read_errors': 0, 'write_errors': 0}
+
+        time.sleep(max(0.0, options['start_at'] - time.time()))
+        started = time.perf_counter()
+        deadline = started + options['duration']
+        while time.perf_counter() < deadline:
+            kind = 'write' if rng.random() < options['write_ratio'] else 'read'
+            clock = time.perf_counter()
+            try:
+                rng.choice(operations[kind])()
+            except OperationalError as exc:
+                if 'locked' not in str(exc):
+                    raise
+                result[f'{kind}_errors'] += 1
+            else:
+                result[kind].append(time.perf_counter() - clock)
+        result['elapsed'] = time.perf_counter() - started
+        self.stdout.write(json.dumps(result))
+
+
+def copy_database(source, target):
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+        # The tuned profile switches to WAL itself; start from SQLite's default.
+        dst.execute('PRAGMA journal_mode=DELETE')
+    src.close()
+    dst.close()
+
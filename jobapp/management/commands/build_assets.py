@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobapp.assets import stale, write
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the CSS bundle and the home page's critical CSS from their sources (see jobapp/assets.py). "
+        "With --check, only fail if they are out of date."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            outdated = stale()
+            if outdated:
+                raise CommandError(f"Out of date, run build_assets: {', '.join(outdated)}")
+            self.stdout.write(self.style.SUCCESS("Built assets are up to date."))
+            return
+        for name in write():
+            self.stdout.write(f"Wrote {name}")
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobapp.recommendations import DEFAULT_TOP_N, build_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every job seeker's \"recommended for you\" jobs (TF-IDF similarity to the jobs "
+        "they applied to) into the Recommendation table. Run it periodically, e.g. nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=DEFAULT_TOP_N, help="Jobs kept per user.")
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help="Users scored per matrix product; memory grows with batch size x jobs.")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        users = build_recommendations(options['top'], options['batch_size'], log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f"Recommendations for {users} user(s) rebuilt in {time.perf_counter() - started:.1f}s."
+        ))
@@ -0,0 +1,104 @@
+import re
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+
+from jobapp.bench import benchmark_database, seed_scenario, view_requests
+
+
+LIMIT = re.compile(r'\bLIMIT\b', re.I)
+
+
+def full_scans(vendor, sql, plan):
+    """The lines of a query plan that read a whole table, or sort every row it reads.
+
+    Walking an index without a range constraint reads the whole table too,
+    in index order; that is only cheap when a LIMIT stops it early.
+    """
+    limited = bool(LIMIT.search(sql))
+    if vendor == 'sqlite':
+        # "SEARCH" lines use an index range. "SCAN jobapp_job" is a table
+        # scan, "SCAN jobapp_job USING [COVERING] INDEX" a full index walk;
+        # FTS tables are virtual. "USE TEMP B-TREE" sorts or groups every row.
+        return [
+            line for line in plan
+            if (line.startswith('SCAN ') and 'VIRTUAL TABLE' not in line and ('USING' not in line or not limited))
+            or line.startswith('USE TEMP B-TREE')
+        ]
+    if vendor == 'postgresql':
+        found = []
+        for i, line in enumerate(plan):
+            node = line.strip().removeprefix('->').strip()
+            if node.startswith(('Seq Scan', 'Sort ')):
+                found.append(line)
+            elif node.startswith(('Index Scan', 'Index Only Scan')) and not limited:
+                # The node's details follow until the next node
+                details = []
+                for detail in plan[i + 1:]:
+                    if '->' in detail:
+                        break
+                    details.append(detail)
+                if not any('Index Cond' in detail for detail in details):
+                    found.append(line)
+        return found
+    return []
+
+
+def explain(sql, params):
+    if connection.vendor == 'sqlite':
+        prefix, column = 'EXPLAIN QUERY PLAN ', 3
+    else:
+        prefix, column = 'EXPLAIN ', 0
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        return [str(row[column]) for row in cursor.fetchall()]
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every view against a seeded test database, EXPLAIN its queries and report full table scans, "
+        "full index walks without a LIMIT and sorts of every row read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=5000)
+        parser.add_argument('--verbose-plans', action='store_true', help="Print the plan of every query.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        with benchmark_database():
+            scenario = seed_scenario(jobs=options['jobs'], employers=20, seekers=20)
+            client = Client()
+            total_scans = 0
+
+            for name, user, path in view_requests(scenario):
+                captured = []
+
+                def capture(execute, sql, params, many, context):
+                    if sql.lstrip().upper().startswith('SELECT'):
+                        captured.append((sql, params))
+                    return execute(sql, params, many, context)
+
+                client.logout()
+                if user:
+                    client.force_login(user)
+                with connection.execute_wrapper(capture):
+                    client.get(path)
+
+                scans = []
+                for sql, params in captured:
+                    plan = explain(sql, params)
+                    if options['verbose_plans']:
+                        self.stdout.write(f"  {sql}\n    " + "\n    ".join(plan))
+                    scans += [(sql, line) for line in full_scans(connection.vendor, sql, plan)]
+
+                total_scans += len(scans)
+                status = self.style.ERROR(f"{len(scans)} full scan(s)") if scans else self.style.SUCCESS("ok")
+                self.stdout.write(f"{name:<22} {len(captured):>2} queries  {status}")
+                for sql, line in scans:
+                    self.stdout.write(f"    {line}\n      {sql}")
+
+            if total_scans:
+                self.stdout.write(self.style.WARNING(f"{total_scans} full scan(s) or sort(s) found."))
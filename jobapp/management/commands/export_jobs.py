@@ -0,0 +1,57 @@
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobapp.models import Job
+
+# Same columns import_jobs reads, so an export can be imported again.
+FIELDS = ['title', 'description', 'category', 'company', 'location', 'salary', 'posted_by', 'posted_on']
+
+
+class Command(BaseCommand):
+    help = "Stream jobs to a CSV or JSONL file without loading the table into memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to write, or - for stdout.")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Default: from the file extension.")
+        parser.add_argument('--employer', help="Only jobs posted by this username.")
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Rows fetched from the database at a time.")
+
+    def handle(self, *args, **options):
+        fmt = options['format'] or ('jsonl' if options['path'].endswith(('.jsonl', '.ndjson')) else 'csv')
+        jobs = Job.objects.order_by('id')
+        if options['employer']:
+            jobs = jobs.filter(posted_by__username=options['employer'])
+        rows = jobs.values_list(
+            'title', 'description', 'category', 'company', 'location', 'salary',
+            'posted_by__username', 'posted_on',
+        ).iterator(chunk_size=options['chunk_size'])
+
+        stream = sys.stdout if options['path'] == '-' else open(options['path'], 'w', newline='', encoding='utf-8')
+        try:
+            count = self.write(stream, fmt, rows)
+        except BrokenPipeError:
+            raise CommandError("Output closed early.")
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        if stream is not sys.stdout:
+            self.stdout.write(self.style.SUCCESS(f"Exported {count} job(s) to {options['path']}."))
+
+    def write(self, stream, fmt, rows):
+        count = 0
+        if fmt == 'csv':
+            writer = csv.writer(stream)
+            writer.writerow(FIELDS)
+            for row in rows:
+                writer.writerow(row[:-1] + (row[-1].isoformat(),))
+                count += 1
+        else:
+            for row in rows:
+                record = dict(zip(FIELDS, row))
+                record['posted_on'] = record['posted_on'].isoformat()
+                stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+                count += 1
+        return count
@@ -0,0 +1,33 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from jobapp.models import Application
+from jobapp.resumes import process_resume
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Run resume post-processing for applications it has not run for yet (e.g. lost on a restart)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Reprocess every resume, not just pending ones.")
+
+    def handle(self, *args, **options):
+        applications = Application.objects.exclude(resume='').exclude(resume__isnull=True)
+        if not options['all']:
+            applications = applications.filter(resume_processed_at__isnull=True)
+        ids = list(applications.order_by('id').values_list('id', flat=True))
+        failed = 0
+        for application_id in ids:
+            # One bad file must not stop every later resume, on this run and
+            # the next (it stays pending, so each run would hit it first).
+            try:
+                process_resume(application_id)
+            except Exception:
+                logger.exception('Processing the resume of application %s failed', application_id)
+                failed += 1
+        self.stdout.write(self.style.SUCCESS(f"Processed {len(ids) - failed} resume(s)."))
+        if failed:
+            self.stderr.write(f"{failed} failed, see the log.")
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from jobapp.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the job search index and re-sync it with the jobapp_job table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        conn = connections[options['database']]
+        rebuild_index(conn)
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt on '{conn.alias}' ({conn.vendor})."))
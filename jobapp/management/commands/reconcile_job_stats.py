@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from jobapp.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-job applicant counters and daily rollups from the applications table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        drifted = rebuild_stats(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Job stats rebuilt; {drifted} job(s) had drifted."))
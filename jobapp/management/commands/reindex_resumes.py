@@ -0,0 +1,72 @@
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from jobapp.extraction import extract_many
+from jobapp.models import Application
+from jobapp.resumes import sniff_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract the text of every stored resume again, in parallel on all cores, "
+        "and update the candidate search index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--batch-size', type=int, default=50, help="Resumes per task sent to a worker.")
+        parser.add_argument('--pending', action='store_true', help="Only resumes without extracted text.")
+
+    def handle(self, *args, **options):
+        applications = Application.objects.exclude(resume='').exclude(resume__isnull=True)
+        if options['pending']:
+            applications = applications.filter(resume_text='')
+        rows = applications.order_by('id').values_list('id', 'resume', 'resume_content_type').iterator()
+
+        started = time.perf_counter()
+        done = 0
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=options['workers'], mp_context=context) as pool:
+            # Keep a bounded number of batches in flight so memory stays flat
+            # however many resumes there are.
+            pending = deque()
+            for batch in self.batches(rows, options['batch_size']):
+                pending.append(pool.submit(extract_many, batch))
+                if len(pending) >= options['workers'] * 2:
+                    done += self.save(pending.popleft().result())
+            while pending:
+                done += self.save(pending.popleft().result())
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-indexed {done} resume(s) in {elapsed:.1f}s with {options['workers']} worker(s)."
+        ))
+
+    def batches(self, rows, size):
+        storage = Application._meta.get_field('resume').storage
+        batch = []
+        for pk, name, content_type in rows:
+            if not storage.exists(name):
+                continue
+            if not content_type:
+                content_type = sniff_file(Application(resume=name).resume)
+                Application.objects.filter(pk=pk).update(resume_content_type=content_type or '')
+            batch.append((pk, storage.path(name), content_type))
+            if len(batch) == size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def save(self, results):
+        # The update triggers keep the full-text index in sync.
+        Application.objects.bulk_update(
+            [Application(pk=pk, resume_text=text) for pk, text in results],
+            ['resume_text'],
+        )
+        return len(results)
@@ -0,0 +1,50 @@
+import signal
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobapp.tasks import work
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background tasks (application emails, ...) until stopped. With --processes N, "
+        "start N worker processes and wait for them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1)
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Seconds to wait before looking again when no task is due.")
+        parser.add_argument('--once', action='store_true', help="Exit as soon as no task is due.")
+
+    def handle(self, *args, **options):
+        stopping = []
+
+        def stop(signum, frame):
+            stopping.append(signum)
+        # Finish the current round of tasks on SIGTERM/Ctrl-C instead of
+        # dying half way through one.
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        if options['processes'] > 1:
+            return self.supervise(options, stopping)
+        work(options['poll_interval'], stop=lambda: bool(stopping), exit_when_idle=options['once'])
+
+    def supervise(self, options, stopping):
+        command = [sys.executable, 'manage.py', 'run_tasks', '--poll-interval', str(options['poll_interval'])]
+        if options['once']:
+            command.append('--once')
+        workers = [subprocess.Popen(command, cwd=settings.BASE_DIR) for _ in range(options['processes'])]
+        self.stdout.write(f"Started {len(workers)} task workers: {' '.join(str(w.pid) for w in workers)}")
+        while any(worker.poll() is None for worker in workers):
+            if stopping:
+                for worker in workers:
+                    if worker.poll() is None:
+                        worker.terminate()
+                stopping.clear()
+            time.sleep(0.5)
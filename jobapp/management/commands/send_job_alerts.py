@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jobapp.alerts import send_digests
+
+
+class Command(BaseCommand):
+    help = "Email each job seeker a digest of the new jobs matching their saved searches (run daily)."
+
+    def handle(self, *args, **options):
+        sent = send_digests()
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} job alert digest(s)."))
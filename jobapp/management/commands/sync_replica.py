@@ -0,0 +1,33 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from jobapp.routers import REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary database to SQLITE_REPLICA_PATH, standing in for replication when "
+        "trying the primary/replica setup locally. Run it again to let the replica catch up."
+    )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES['default']
+        replica = settings.DATABASES.get(REPLICA_ALIAS)
+        if replica is None:
+            raise CommandError("No replica database is configured; set SQLITE_REPLICA_PATH.")
+        if 'sqlite3' not in primary['ENGINE'] or 'sqlite3' not in replica['ENGINE']:
+            raise CommandError("sync_replica only copies SQLite databases; use real replication otherwise.")
+
+        # The backup API copies a consistent snapshot even while the primary
+        # is being written to.
+        source = sqlite3.connect(primary['NAME'])
+        target = sqlite3.connect(replica['NAME'])
+        try:
+            with target:
+                source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.stdout.write(self.style.SUCCESS(f"Copied {primary['NAME']} to {replica['NAME']}."))
@@ -0,0 +1,78 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+from .models import UserProfile
+
+ROLE_SESSION_KEY = '_jobapp_role'
+
+
+def user_role(user):
+    """Return the role of ``user``, or None for anonymous users and users without a profile."""
+    if not user.is_authenticated:
+        return None
+    try:
+        return user.userprofile.role
+    except UserProfile.DoesNotExist:
+        return None
+
+
+def get_role(request):
+    """Resolve the current user's role once per request.
+
+    The role comes from the session when it was pinned at login, otherwise
+    from the profile that ProfileBackend loaded together with the user.
+    """
+    if not hasattr(request, '_cached_role'):
+        role = None
+        session = getattr(request, 'session', None)
+        if session is not None and request.user.is_authenticated:
+            role = session.get(ROLE_SESSION_KEY)
+        request._cached_role = role or user_role(request.user)
+    return request._cached_role
+
+
+async def aget_role(request):
+    """Async version of get_role() for async views.
+
+    Loads the user (and its profile) with request.auser(), after which
+    request.user and request.role can be used without touching the database.
+    """
+    if not hasattr(request, '_cached_role'):
+        user = await request.auser()
+        # request.user is a separate lazy object that would load the user
+        # again, synchronously; replace it with the one already loaded.
+        request.user = user
+        role = None
+        session = getattr(request, 'session', None)
+        if session is not None and user.is_authenticated:
+            role = await session.aget(ROLE_SESSION_KEY)
+        request._cached_role = role or user_role(user)
+    return request._cached_role
+
+
+def pin_role(request, user):
+    """Store the user's role in the session so later requests do not need the profile."""
+    if getattr(settings, 'PIN_ROLE_IN_SESSION', False):
+        role = user_role(user)
+        if role:
+            request.session[ROLE_SESSION_KEY] = role
+
+
+class RoleMiddleware:
+    """Expose the current user's role as ``request.role``, resolved lazily and at most once.
+
+    Must come after AuthenticationMiddleware. Async views should call
+    aget_role() before anything reads request.role.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.role = SimpleLazyObject(lambda: get_role(request))
+        return self.get_response(request)
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from jobapp.search import drop_index, rebuild_index
+
+
+def create_search_index(apps, schema_editor):
+    rebuild_index(schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    drop_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0011_alter_application_unique_together'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
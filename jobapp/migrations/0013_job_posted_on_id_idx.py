@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 06:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0012_job_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['posted_on', 'id'], name='job_posted_on_id_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+from jobapp.search import drop_candidate_index, rebuild_candidate_index
+
+
+def create_candidate_index(apps, schema_editor):
+    rebuild_candidate_index(schema_editor.connection)
+
+
+def drop_index(apps, schema_editor):
+    drop_candidate_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0015_application_resume_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='resume_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(create_candidate_index, drop_index),
+    ]
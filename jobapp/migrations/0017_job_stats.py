@@ -0,0 +1,57 @@
+# Generated by Django 5.1.4 on 2026-10-18 06:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def backfill_stats(apps, schema_editor):
+    Application = apps.get_model('jobapp', 'Application')
+    JobStats = apps.get_model('jobapp', 'JobStats')
+    JobDailyStats = apps.get_model('jobapp', 'JobDailyStats')
+    JobStats.objects.bulk_create(
+        [
+            JobStats(job_id=job_id, applications=n)
+            for job_id, n in Application.objects.values_list('job_id').annotate(n=Count('id')).order_by()
+        ],
+        batch_size=1000,
+    )
+    JobDailyStats.objects.bulk_create(
+        [
+            JobDailyStats(job_id=job_id, day=day, applications=n)
+            for job_id, day, n in Application.objects.annotate(day=TruncDate('applied_at'))
+            .values_list('job_id', 'day').annotate(n=Count('id')).order_by()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0016_application_resume_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobStats',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='jobapp.job')),
+                ('applications', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobapp.job')),
+            ],
+            options={
+                'unique_together': {('job', 'day')},
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
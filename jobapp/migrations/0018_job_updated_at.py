@@ -0,0 +1,34 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+from jobapp.search import install_index
+
+
+def backfill_updated_at(apps, schema_editor):
+    Job = apps.get_model('jobapp', 'Job')
+    Job.objects.update(updated_at=F('posted_on'))
+
+
+def reinstall_search_triggers(apps, schema_editor):
+    # Adding a column makes SQLite remake jobapp_job, which drops the
+    # full-text search triggers (see jobapp/search.py).
+    install_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobapp', '0017_job_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_search_triggers, migrations.RunPython.noop),
+    ]
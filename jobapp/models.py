@@ -26,6 +26,19 @@ class Job(models.Model):
     salary = models.IntegerField()
     posted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
     posted_on = models.DateTimeField(default=timezone.now)
+    # Row version for conditional requests: changes whenever the job is saved
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the job listings walks (posted_on, id)
+            models.Index(fields=['posted_on', 'id'], name='job_posted_on_id_idx'),
+            # Employer dashboard / my jobs: one employer's jobs, newest first
+            models.Index(fields=['posted_by', 'posted_on', 'id'], name='job_poster_posted_idx'),
+            # Listings filtered by category, newest first
+            models.Index(fields=['category', 'posted_on', 'id'], name='job_category_posted_idx'),
+            models.Index(fields=['salary'], name='job_salary_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -37,13 +50,128 @@ class Application(models.Model):
     resume = models.FileField(upload_to='resumes/', null=True, blank=True)
     applied_at = models.DateTimeField(auto_now_add=True)
     applicant = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
+    # Filled in from the upload as it streams in, see jobapp/resumes.py
+    resume_checksum = models.CharField(max_length=64, blank=True, db_index=True)
+    resume_content_type = models.CharField(max_length=100, blank=True)
+    resume_size = models.PositiveIntegerField(null=True, blank=True)
+    # Extracted in the background and indexed for candidate search, see
+    # jobapp/resumes.py and jobapp/search.py
+    resume_text = models.TextField(blank=True, editable=False)
+    # Set once the background post-processing has run
+    resume_processed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         unique_together = ('job', 'applicant')  # ✅ Prevents duplicates at DB level
+        indexes = [
+            # Seeker dashboard / my applications: one user's applications, newest first
+            models.Index(fields=['applicant', 'applied_at', 'id'], name='app_applicant_applied_idx'),
+            # Admin: the date hierarchy's first/last date, and search by exact email
+            models.Index(fields=['applied_at'], name='app_applied_idx'),
+            models.Index(fields=['email'], name='app_email_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} applied for {self.job.title}"
 
+class JobStats(models.Model):
+    """Running applicant count per job, kept up to date by jobapp/stats.py."""
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    applications = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.job_id}: {self.applications} applications"
+
+class JobDailyStats(models.Model):
+    """Applications per job per day (in TIME_ZONE), for the dashboard charts."""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    applications = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('job', 'day')
+
+    def __str__(self):
+        return f"{self.job_id} {self.day}: {self.applications} applications"
+
+class Recommendation(models.Model):
+    """A job suggested to a job seeker, precomputed by jobapp/recommendations.py."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='recommendations')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='recommendations')
+    # 1 is the best match
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    # Start of the run that wrote the row; rows from earlier runs are stale
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        # Serving reads one user's rows in rank order straight from this index
+        unique_together = ('user', 'rank')
+
+    def __str__(self):
+        return f"{self.user_id} #{self.rank}: {self.job_id}"
+
+class SavedSearch(models.Model):
+    """A job seeker's search, matched against newly posted jobs for alerts, see jobapp/alerts.py."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    search = models.CharField(max_length=200, blank=True)
+    location = models.CharField(max_length=100, blank=True)
+    # The query's terms as search.tokenize() splits them, space separated
+    terms = models.CharField(max_length=400, blank=True)
+    location_terms = models.CharField(max_length=200, blank=True)
+    # The longest term; new jobs find the searches they may match through it
+    anchor = models.CharField(max_length=100, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'search', 'location')
+
+    def __str__(self):
+        return f"{self.user_id}: {self.search} / {self.location}"
+
+
+class JobAlert(models.Model):
+    """A new job matching a saved search, until it goes out in the next digest."""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='alerts')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('saved_search', 'job')
+        indexes = [
+            # Alerts still to be sent
+            models.Index(fields=['saved_search'], name='alert_pending_idx', condition=models.Q(sent_at__isnull=True)),
+        ]
+
+    def __str__(self):
+        return f"{self.saved_search_id}: {self.job_id}"
+
+
+class Task(models.Model):
+    """A unit of background work, run by the run_tasks command, see jobapp/tasks.py."""
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    # Due tasks with the same name and group are handed to one call
+    group = models.CharField(max_length=100, blank=True)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Set while a worker runs the task; an expired lease is picked up again
+    locked_by = models.CharField(max_length=64, blank=True, db_index=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    # Set once the task has used up its attempts; it is then left alone
+    failed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Workers look for due tasks in run_at order
+            models.Index(fields=['run_at', 'id'], name='task_due_idx', condition=models.Q(failed_at__isnull=True)),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk}"
+
 class Profile(models.Model):
     ROLE_CHOICES = [
         ('jobseeker', 'Job Seeker'),
@@ -0,0 +1,61 @@
+"""
+Email notifications for new applications.
+
+Applying enqueues one task per application (see signals.py), grouped by
+employer and delayed by NOTIFICATION_BATCH_SECONDS, so an employer whose
+job gets several applicants in that window receives one email listing them
+all. Each applicant gets a confirmation. All messages of a batch go out
+over one connection to the mail server.
+
+Delivery is at least once: if sending fails part way, the whole batch is
+retried (see tasks.py).
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+
+from .models import Application
+from .tasks import enqueue, task
+
+APPLICATION_SUBMITTED = 'application_submitted'
+
+
+def application_submitted(application):
+    enqueue(
+        APPLICATION_SUBMITTED, {'application_id': application.pk},
+        group=f'employer:{application.job.posted_by_id}',
+        delay=getattr(settings, 'NOTIFICATION_BATCH_SECONDS', 0),
+    )
+
+
+@task(APPLICATION_SUBMITTED, batch=True)
+def send_application_emails(payloads):
+    applications = (
+        Application.objects.filter(pk__in=[payload['application_id'] for payload in payloads])
+        .select_related('job__posted_by', 'applicant')
+        .defer('resume_text', 'job__description')
+        .order_by('applied_at', 'id')
+    )
+    by_employer = defaultdict(list)
+    messages = []
+    for application in applications:
+        by_employer[application.job.posted_by].append(application)
+        email = application.email or (application.applicant.email if application.applicant else '')
+        if email:
+            messages.append(EmailMessage(
+                f"Your application for {application.job.title}",
+                render_to_string('jobapp/emails/application_received.txt', {'application': application}),
+                to=[email],
+            ))
+    for employer, received in by_employer.items():
+        if employer.email:
+            context = {'employer': employer, 'applications': received}
+            messages.append(EmailMessage(
+                f"{len(received)} new application{'s' if len(received) > 1 else ''}",
+                render_to_string('jobapp/emails/new_applications.txt', context),
+                to=[employer.email],
+            ))
+    if messages:
+        get_connection().send_messages(messages)
@@ -0,0 +1,182 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are selected with a WHERE clause on the ordering columns of the last
+row seen instead of OFFSET, and the total is never counted, so fetching any
+page costs the same as fetching the first one. The queryset has to be
+ordered by a unique key, i.e. its ordering must end with the primary key,
+e.g. ``order_by('-posted_on', '-id')``.
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+PAGE_SIZE = 20
+CURSOR_PARAM = 'cursor'
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+@dataclass
+class CursorPage:
+    items: list = field(default_factory=list)
+    next_cursor: str = None
+    previous_cursor: str = None
+    # A cursor was given but was malformed or doesn't fit the queryset, so
+    # this is the first page instead
+    ignored_cursor: bool = False
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def _json_default(value):
+    # Full isoformat: DjangoJSONEncoder truncates datetimes to milliseconds,
+    # which would make rows posted within the same millisecond unreachable.
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(direction, values):
+    raw = json.dumps([direction, values], default=_json_default, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(direction, values)``, or ``None`` for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        direction, values = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        return None
+    return direction, values
+
+
+def _ordering(queryset):
+    ordering = [str(name) for name in queryset.query.order_by]
+    if not ordering or ordering[-1].lstrip('-') not in ('id', 'pk'):
+        raise ValueError("Keyset pagination needs a queryset ordered by a unique key ending in 'id'.")
+    return ordering
+
+
+def _reverse(ordering):
+    return [name[1:] if name.startswith('-') else '-' + name for name in ordering]
+
+
+def _after(ordering, values):
+    """Q for rows strictly after ``values`` in ``ordering``.
+
+    For ordering (a, -b, id) this is
+    a > va OR (a = va AND b < vb) OR (a = va AND b = vb AND id > vid).
+    """
+    condition = Q()
+    equal = {}
+    for name, value in zip(ordering, values):
+        column = name.lstrip('-')
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{column}__{lookup}': value})
+        equal[column] = value
+    return condition
+
+
+def _key(item, ordering):
+    values = []
+    for name in ordering:
+        column = name.lstrip('-')
+        values.append(item[column] if isinstance(item, dict) else getattr(item, column))
+    return values
+
+
+def _prepare(queryset, cursor):
+    """Return ``(queryset, ordering, direction, decoded)`` with the cursor's WHERE and ordering applied."""
+    ordering = _ordering(queryset)
+    decoded = decode_cursor(cursor)
+    direction = NEXT
+
+    if decoded:
+        direction, values = decoded
+        if len(values) != len(ordering):
+            decoded = None
+        else:
+            walk = ordering if direction == NEXT else _reverse(ordering)
+            try:
+                queryset = queryset.filter(_after(walk, values)).order_by(*walk)
+            except (ValidationError, ValueError, TypeError):
+                decoded = None
+    if not decoded:
+        direction = NEXT
+    return queryset, ordering, direction, decoded
+
+
+def _build_page(rows, ordering, direction, decoded, page_size, cursor):
+    # One extra row tells us whether there is another page in the walking
+    # direction, without a COUNT(*).
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == PREVIOUS:
+        rows.reverse()
+
+    page = CursorPage(items=rows, ignored_cursor=bool(cursor) and not decoded)
+    if not rows:
+        return page
+
+    more_after = has_more if direction == NEXT else bool(decoded)
+    more_before = bool(decoded) if direction == NEXT else has_more
+    if more_after:
+        page.next_cursor = encode_cursor(NEXT, _key(rows[-1], ordering))
+    if more_before:
+        page.previous_cursor = encode_cursor(PREVIOUS, _key(rows[0], ordering))
+    return page
+
+
+def paginate(queryset, cursor=None, page_size=PAGE_SIZE):
+    """Return the CursorPage of ``queryset`` that ``cursor`` points at.
+
+    A missing or invalid cursor gives the first page.
+    """
+    queryset, ordering, direction, decoded = _prepare(queryset, cursor)
+    rows = list(queryset[:page_size + 1])
+    return _build_page(rows, ordering, direction, decoded, page_size, cursor)
+
+
+async def apaginate(queryset, cursor=None, page_size=PAGE_SIZE):
+    """Async version of paginate()."""
+    queryset, ordering, direction, decoded = _prepare(queryset, cursor)
+    rows = [row async for row in queryset[:page_size + 1]]
+    return _build_page(rows, ordering, direction, decoded, page_size, cursor)
+
+
+def paginate_request(request, queryset, page_size=PAGE_SIZE):
+    return paginate(queryset, request.GET.get(CURSOR_PARAM), page_size)
+
+
+async def apaginate_request(request, queryset, page_size=PAGE_SIZE):
+    return await apaginate(queryset, request.GET.get(CURSOR_PARAM), page_size)
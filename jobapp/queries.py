@@ -0,0 +1,59 @@
+"""
+Querysets behind the listing pages, shared by the sync views and their
+async versions in async_views.py. Building a queryset does not touch the
+database, so these are safe to call from either.
+"""
+from django.db.models import Exists, F, OuterRef, Q
+from django.db.models.functions import Coalesce, Substr
+
+from .facets import filter_jobs
+from .models import Application, Job
+from .search import search_candidates, search_jobs
+
+
+def listing_jobs(search='', location='', facets=None):
+    return search_jobs(filter_jobs(Job.objects.order_by('-posted_on', '-id'), facets or {}), search, location)
+
+
+def employer_jobs(user):
+    # The applicant count comes from the JobStats row (LEFT JOIN), not a COUNT.
+    return (
+        Job.objects.filter(posted_by=user)
+        .annotate(applicant_count=Coalesce(F('stats__applications'), 0))
+        .order_by('-posted_on', '-id')
+    )
+
+
+def employer_candidates(user, search=''):
+    """Applications to the employer's jobs matching ``search``, with a resume excerpt instead of the full text."""
+    applications = (
+        Application.objects.filter(job__posted_by=user)
+        .select_related('job')
+        .defer('resume_text', 'job__description')
+        .annotate(excerpt=Substr('resume_text', 1, 300))
+        .order_by('-applied_at', '-id')
+    )
+    return search_candidates(applications, search)
+
+
+def latest_applications(user):
+    """The user's latest application per job, newest first, with the job title joined in."""
+    # Skip any row that has a newer application by the same user for the same job.
+    newer = Application.objects.filter(
+        job=OuterRef('job'),
+        applicant=OuterRef('applicant'),
+    ).filter(
+        Q(applied_at__gt=OuterRef('applied_at')) | Q(applied_at=OuterRef('applied_at'), id__gt=OuterRef('id'))
+    )
+    return (
+        Application.objects.filter(applicant=user)
+        .filter(~Exists(newer))
+        .select_related('job')
+        .only('id', 'applied_at', 'job__id', 'job__title')
+        .order_by('-applied_at', '-id')
+    )
+
+
+def recommended_jobs(user):
+    """The user's precomputed recommendations (jobapp/recommendations.py), best first."""
+    return Job.objects.filter(recommendations__user=user).order_by('recommendations__rank')
@@ -0,0 +1,166 @@
+"""
+"Recommended for you": jobs similar to the ones a seeker has applied to.
+
+Every job is turned into a TF-IDF vector over the words of its title,
+category and description (title words count three times, category words
+twice). A seeker's profile is the normalized sum of the vectors of the jobs
+they applied to, and every other job is scored by cosine similarity with
+it. The maths is done on the whole table at once with SciPy sparse matrices
+and NumPy, one batch of users at a time:
+``scores = jobs @ profiles.T`` gives a (jobs x users) dense block, and the
+top N of each column is picked with argpartition.
+
+The results go to the Recommendation table, so serving them is a single
+indexed lookup (see queries.recommended_jobs). build_recommendations()
+runs from the management command of the same name, e.g. nightly; users
+whose applications change in between keep their previous list until then.
+
+NumPy and SciPy are only needed here, not by the web process.
+"""
+import math
+import time
+from collections import Counter
+
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+from scipy import sparse
+
+from .models import Application, Job, Recommendation
+from .search import words
+
+DEFAULT_TOP_N = 20
+
+# How often a word counts per occurrence in each field
+FIELD_WEIGHTS = {'title': 3, 'category': 2, 'description': 1}
+
+# Words in more than this share of jobs ("experience", "team", ...) say
+# nothing about a job and are left out of the vectors.
+MAX_DOCUMENT_FREQUENCY = 0.5
+
+
+def job_terms(title, category, description):
+    counts = Counter()
+    for field, text in (('title', title), ('category', category), ('description', description)):
+        weight = FIELD_WEIGHTS[field]
+        for token in words(text):
+            if len(token) > 1 and not token.isdigit():
+                counts[token] += weight
+    return counts
+
+
+def job_matrix(jobs):
+    """``jobs`` is an iterable of (id, title, category, description).
+
+    Returns ``(job ids, matrix)``: row i of the CSR matrix is the
+    L2-normalized TF-IDF vector of job ``ids[i]``.
+    """
+    vocabulary = {}
+    ids, rows, cols, values = [], [], [], []
+    for row, (job_id, title, category, description) in enumerate(jobs):
+        ids.append(job_id)
+        for term, count in job_terms(title, category, description).items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(term, len(vocabulary)))
+            # Sublinear term frequency: the tenth mention adds less than the first
+            values.append(1.0 + math.log(count))
+
+    matrix = sparse.csr_matrix(
+        (np.array(values, dtype=np.float32), (np.array(rows, dtype=np.int32), np.array(cols, dtype=np.int32))),
+        shape=(len(ids), len(vocabulary)),
+    )
+    documents = max(len(ids), 1)
+    frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+    idf = np.log((1 + documents) / (1 + frequency)).astype(np.float32) + 1
+    idf[frequency > MAX_DOCUMENT_FREQUENCY * documents] = 0
+    matrix = matrix @ sparse.diags(idf)
+    matrix.eliminate_zeros()
+    return ids, normalize_rows(matrix)
+
+
+def normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix, dtype=np.float32)
+
+
+def applications_matrix(pairs, job_index):
+    """``pairs`` of (user id, job id) -> ``(user ids, users x jobs CSR of 1s)``."""
+    users = {}
+    rows, cols = [], []
+    for user_id, job_id in pairs:
+        column = job_index.get(job_id)
+        if column is not None:
+            rows.append(users.setdefault(user_id, len(users)))
+            cols.append(column)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(users), len(job_index)),
+    )
+    # A user who applied twice to one job still counts it once.
+    matrix.data[:] = 1
+    return list(users), matrix
+
+
+def top_jobs(jobs, profiles, applied, top_n):
+    """For each profile row, ``(job columns, scores)`` of the ``top_n`` best jobs it has not applied to."""
+    # (jobs x users): sparse times dense is far cheaper than a sparse product
+    # whose result would be nearly dense anyway.
+    scores = np.asarray(jobs @ profiles.T.toarray()).T
+    rows, cols = applied.nonzero()
+    scores[rows, cols] = -np.inf
+    n = min(top_n, scores.shape[1])
+    best = np.argpartition(-scores, n - 1, axis=1)[:, :n]
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    for columns, values in zip(best, best_scores):
+        keep = values > 0
+        yield columns[keep], values[keep]
+
+
+def build_recommendations(top_n=DEFAULT_TOP_N, batch_size=200, log=None):
+    """Recompute every seeker's recommendations; returns the number of users covered."""
+    log = log or (lambda message: None)
+    started_at = timezone.now()
+
+    clock = time.perf_counter()
+    job_ids, jobs = job_matrix(
+        Job.objects.order_by('id').values_list('id', 'title', 'category', 'description').iterator(chunk_size=2000)
+    )
+    log(f"{len(job_ids)} jobs, {jobs.shape[1]} terms vectorized in {time.perf_counter() - clock:.1f}s")
+    if not job_ids:
+        Recommendation.objects.all().delete()
+        return 0
+
+    clock = time.perf_counter()
+    job_index = {job_id: i for i, job_id in enumerate(job_ids)}
+    pairs = Application.objects.filter(applicant__isnull=False).values_list('applicant_id', 'job_id')
+    user_ids, applied = applications_matrix(pairs.iterator(chunk_size=5000), job_index)
+    profiles = normalize_rows(applied @ jobs) if user_ids else applied
+    log(f"{len(user_ids)} seeker profiles built in {time.perf_counter() - clock:.1f}s")
+
+    scoring = writing = 0.0
+    for start in range(0, len(user_ids), batch_size):
+        clock = time.perf_counter()
+        batch = slice(start, start + batch_size)
+        rows = []
+        best = top_jobs(jobs, profiles[batch], applied[batch], top_n)
+        for user_id, (columns, values) in zip(user_ids[batch], best):
+            rows += [
+                Recommendation(user_id=user_id, job_id=job_ids[column], rank=rank, score=float(score),
+                               computed_at=started_at)
+                for rank, (column, score) in enumerate(zip(columns, values), 1)
+            ]
+        scoring += time.perf_counter() - clock
+
+        clock = time.perf_counter()
+        with transaction.atomic():
+            Recommendation.objects.filter(user_id__in=user_ids[batch]).delete()
+            Recommendation.objects.bulk_create(rows, batch_size=1000)
+        writing += time.perf_counter() - clock
+
+    # Users who no longer have any applications
+    Recommendation.objects.filter(computed_at__lt=started_at).delete()
+    log(f"Scored in {scoring:.1f}s, written in {writing:.1f}s")
+    return len(user_ids)
@@ -0,0 +1,226 @@
+"""
+Resume uploads.
+
+ResumeUploadHandler replaces Django's default upload handlers for the apply
+form. It streams the file to a temporary file on disk chunk by chunk,
+rejects it as soon as it is known to be over RESUME_MAX_UPLOAD_SIZE (from
+Content-Length before anything is written, otherwise when the running total
+passes the limit), sniffs the type from the first bytes instead of trusting
+the browser's Content-Type or file extension (the stored file gets the
+extension of the sniffed type), and computes the SHA-256 on the way through.
+
+Anything slower than that runs after the response, on the worker pool (see
+workers.py): process_resume() runs the RESUME_PIPELINE steps for an
+application (dedup, then text extraction) and marks it processed.
+Applications whose processing was lost, e.g. because the server restarted,
+are picked up again by the process_resumes management command, and
+reindex_resumes re-extracts every resume in bulk.
+"""
+import hashlib
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+from django.utils import timezone
+
+from . import workers
+from .extraction import EXTRACTION_ERRORS, extract_text
+from .models import Application
+
+DEFAULT_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+
+# Leading bytes of the accepted formats. DOCX is a ZIP archive.
+SIGNATURES = [
+    (b'%PDF-', 'application/pdf'),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', 'application/msword'),
+    (b'PK\x03\x04', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'),
+]
+SNIFF_BYTES = 8
+
+# The stored file is named after what it is, not what the browser called it,
+# so an HTML page that sniffs as plain text is not served back as .html.
+EXTENSIONS = {
+    'application/pdf': '.pdf',
+    'application/msword': '.doc',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+    'text/plain': '.txt',
+}
+
+TYPE_ERROR = "Upload a PDF, Word document or plain text file."
+
+logger = logging.getLogger(__name__)
+
+
+def max_upload_size():
+    return getattr(settings, 'RESUME_MAX_UPLOAD_SIZE', DEFAULT_MAX_UPLOAD_SIZE)
+
+
+def sniff_content_type(head):
+    """Content type of a file starting with ``head``, or None if it is not accepted."""
+    for signature, content_type in SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    # Plain text resumes: no NUL bytes and valid UTF-8 (allowing for a
+    # multi-byte character cut off at the end of the sniffed chunk).
+    if b'\x00' not in head:
+        try:
+            head.decode('utf-8')
+        except UnicodeDecodeError as exc:
+            if exc.start < len(head) - 3:
+                return None
+        return 'text/plain'
+    return None
+
+
+class ResumeUploadHandler(TemporaryFileUploadHandler):
+    """Streams uploads to disk with a size cap, type sniffing and a checksum.
+
+    A rejected file is skipped rather than failing the request; the reason
+    is left in ``error`` for the view to show on the form.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = max_upload_size()
+        self.error = None
+        self.too_large = False
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # The other form fields only add a few hundred bytes, so a body this
+        # much over the limit cannot carry an acceptable file.
+        self.too_large = content_length > self.max_size + 64 * 1024
+
+    def new_file(self, *args, **kwargs):
+        if self.too_large:
+            self.reject_size()
+        self.head = b''
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.sniffed_type = None
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self.reject_size()
+        if self.sniffed_type is None:
+            self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+            if len(self.head) >= SNIFF_BYTES:
+                self.check_type()
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        # Files shorter than SNIFF_BYTES are only checked here. SkipFile is
+        # not handled at this point, so a rejected file is dropped by
+        # returning None instead.
+        if self.sniffed_type is None:
+            self.sniffed_type = sniff_content_type(self.head) if file_size else None
+            if self.sniffed_type is None:
+                self.error = TYPE_ERROR
+                self.file.close()
+                return None
+        file = super().file_complete(file_size)
+        file.content_type = self.sniffed_type
+        file.name = os.path.splitext(file.name)[0] + EXTENSIONS[self.sniffed_type]
+        file.sha256 = self.sha256.hexdigest()
+        return file
+
+    def check_type(self):
+        self.sniffed_type = sniff_content_type(self.head)
+        if self.sniffed_type is None:
+            self.reject(TYPE_ERROR)
+
+    def reject_size(self):
+        self.reject(f"The file is larger than {filesizeformat(self.max_size)}.")
+
+    def reject(self, message):
+        self.error = message
+        # MultiPartParser closes (and so deletes) the temporary file and
+        # discards the rest of this file's data.
+        raise SkipFile(message)
+
+
+def install_upload_handler(request):
+    """Use ResumeUploadHandler for this request. Must run before request.POST is read."""
+    handler = ResumeUploadHandler(request)
+    request.upload_handlers = [handler]
+    return handler
+
+
+# -----------------------------
+# Post-processing
+# -----------------------------
+
+def dedupe_resume(application):
+    """Point the application at an identical resume stored earlier and drop its own copy."""
+    if not application.resume_checksum:
+        return
+    original = (
+        Application.objects.filter(resume_checksum=application.resume_checksum)
+        .exclude(resume='')
+        .order_by('id')
+        .only('id', 'resume')
+        .first()
+    )
+    if original is None or original.pk == application.pk or original.resume.name == application.resume.name:
+        return
+
+    duplicate = application.resume.name
+    application.resume.name = original.resume.name
+    Application.objects.filter(pk=application.pk).update(resume=original.resume.name)
+    if not Application.objects.filter(resume=duplicate).exists():
+        application.resume.storage.delete(duplicate)
+
+
+def extract_resume_text(application):
+    """Store the resume's plain text for candidate search.
+
+    Parsing runs on the process pool so it neither holds the GIL of the web
+    process nor blocks its other worker threads. Identical resumes are only
+    parsed once. A file that passed the type check but can't be parsed
+    gets empty text, so it is still marked processed and not retried.
+    """
+    text = None
+    if application.resume_checksum:
+        text = (
+            Application.objects.filter(resume_checksum=application.resume_checksum)
+            .exclude(pk=application.pk)
+            .exclude(resume_text='')
+            .values_list('resume_text', flat=True)
+            .first()
+        )
+    if text is None:
+        content_type = application.resume_content_type or sniff_file(application.resume)
+        try:
+            text = workers.run_in_process(extract_text, application.resume.path, content_type)
+        except EXTRACTION_ERRORS:
+            logger.warning('Could not extract the resume text of application %s', application.pk, exc_info=True)
+            text = ''
+    application.resume_text = text
+    Application.objects.filter(pk=application.pk).update(resume_text=text)
+
+
+def sniff_file(field_file):
+    """Content type of an already stored resume (uploaded before types were recorded)."""
+    with field_file.open('rb') as f:
+        return sniff_content_type(f.read(SNIFF_BYTES))
+
+
+# Run in order by process_resume(). Thumbnails are not generated: there is
+# no imaging dependency, and only the employer downloads the original.
+RESUME_PIPELINE = [
+    dedupe_resume,
+    extract_resume_text,
+]
+
+
+def process_resume(application_id):
+    application = Application.objects.filter(pk=application_id).first()
+    if application is None or not application.resume:
+        return
+    for step in RESUME_PIPELINE:
+        step(application)
+    Application.objects.filter(pk=application_id).update(resume_processed_at=timezone.now())
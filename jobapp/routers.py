@@ -0,0 +1,103 @@
+"""
+Primary/replica database routing.
+
+When a ``replica`` database is configured (see settings.py), GET and HEAD
+requests to the read-only pages in REPLICA_VIEWS read from it; everything
+else, and every write, uses ``default``. The decision is made per request
+by ReplicaMiddleware and handed to PrimaryReplicaRouter through a context
+variable, so it also holds inside async views and the threads they run
+their queries on.
+
+Replication lag would otherwise show up as a job or application that
+disappears right after it was posted. Any POST (or other unsafe method),
+such as post_job, apply_job or a login, therefore sets a short-lived cookie
+that keeps the client on the primary for REPLICA_STICKY_SECONDS.
+"""
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import Resolver404, resolve
+
+REPLICA_ALIAS = 'replica'
+
+# URL names of the pages that never write and can show slightly stale data
+REPLICA_VIEWS = {
+    'home', 'job_detail', 'employer_dashboard', 'jobseeker_dashboard', 'my_applications', 'my_jobs',
+    'api_jobs', 'api_job_detail', 'api_my_applications',
+}
+
+STICKY_COOKIE = 'db_primary'
+DEFAULT_STICKY_SECONDS = 10
+
+_replica_reads = ContextVar('jobapp_replica_reads', default=False)
+
+
+class PrimaryReplicaRouter:
+    """Reads go to the replica while ReplicaMiddleware allows it; writes and migrations to the primary."""
+
+    def db_for_read(self, model, **hints):
+        return REPLICA_ALIAS if _replica_reads.get() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets the schema through replication (or sync_replica).
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    """Decide per request whether reads may use the replica, and pin clients after writes.
+
+    Should come before SessionMiddleware, so the session and user are read
+    under the same decision as the view.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', DEFAULT_STICKY_SECONDS)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _replica_reads.set(self.use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        token = _replica_reads.set(self.use_replica(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.pin(request, response)
+
+    def use_replica(self, request):
+        if request.method not in ('GET', 'HEAD') or STICKY_COOKIE in request.COOKIES:
+            return False
+        # The view is not resolved yet at this point in the stack.
+        try:
+            return resolve(request.path_info).url_name in REPLICA_VIEWS
+        except Resolver404:
+            return False
+
+    def pin(self, request, response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            response.set_cookie(STICKY_COOKIE, '1', max_age=self.sticky_seconds, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,331 @@
+"""
+Ranked full-text search over Job.title, company, description and location,
+and over applicants (name, email and extracted resume text) for employers.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers, so
+inserts, updates and deletes from views, the admin and bulk operations are
+all reflected without any Python-side bookkeeping. PostgreSQL uses a GIN
+expression index over a weighted tsvector, which the database maintains
+itself. Any other backend falls back to the old icontains query.
+"""
+import re
+
+from django.db import connection, connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'jobapp_job_fts'
+PG_INDEX = 'jobapp_job_search_idx'
+
+CANDIDATE_FTS_TABLE = 'jobapp_application_fts'
+CANDIDATE_PG_INDEX = 'jobapp_application_search_idx'
+
+# Only the first few words of a query are used; longer queries do not
+# improve relevance and make every lookup more expensive.
+MAX_TERMS = 8
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+# -----------------------------
+# SQLite (FTS5)
+# -----------------------------
+
+SQLITE_INDEX_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, company, description, location,
+        content='jobapp_job', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    # bm25 weights for title, company, description, location
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES('rank', 'bm25(10.0, 5.0, 1.0, 2.0)')",
+]
+
+SQLITE_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON jobapp_job BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, company, description, location)
+        VALUES (new.id, new.title, new.company, new.description, new.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON jobapp_job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, description, location)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.location);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF title, company, description, location ON jobapp_job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, description, location)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.location);
+        INSERT INTO {FTS_TABLE}(rowid, title, company, description, location)
+        VALUES (new.id, new.title, new.company, new.description, new.location);
+    END
+    """,
+]
+
+SQLITE_DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# -----------------------------
+# PostgreSQL (tsvector + GIN)
+# -----------------------------
+
+# The index and the queries must use the exact same expression, otherwise
+# the planner will not pick the index up.
+PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(company, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+)
+
+PG_INDEX_SQL = [
+    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON jobapp_job USING GIN (({PG_DOCUMENT}))",
+]
+
+PG_DROP_SQL = [
+    f"DROP INDEX IF EXISTS {PG_INDEX}",
+]
+
+
+def _execute(conn, sqlite_statements, pg_statements):
+    if conn.vendor == 'sqlite':
+        statements = sqlite_statements
+    elif conn.vendor == 'postgresql':
+        statements = pg_statements
+    else:
+        return
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def install_index(conn):
+    """Create the search index (and SQLite sync triggers) on ``conn``.
+
+    Safe to run repeatedly. SQLite drops triggers whenever Django remakes
+    the jobapp_job table during a migration, so migrations that do that
+    should call this again afterwards.
+    """
+    _execute(conn, SQLITE_INDEX_SQL + SQLITE_TRIGGER_SQL, PG_INDEX_SQL)
+
+
+def drop_index(conn):
+    _execute(conn, SQLITE_DROP_SQL, PG_DROP_SQL)
+
+
+def rebuild_index(conn=connection):
+    """Re-sync the index with the jobapp_job table from scratch."""
+    install_index(conn)
+    _execute(
+        conn,
+        [f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')"],
+        [f"REINDEX INDEX {PG_INDEX}"],
+    )
+
+
+# -----------------------------
+# Candidates (jobapp_application)
+# -----------------------------
+
+CANDIDATE_SQLITE_INDEX_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {CANDIDATE_FTS_TABLE} USING fts5(
+        name, email, resume_text,
+        content='jobapp_application', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"INSERT INTO {CANDIDATE_FTS_TABLE}({CANDIDATE_FTS_TABLE}, rank) VALUES('rank', 'bm25(5.0, 2.0, 1.0)')",
+]
+
+CANDIDATE_SQLITE_TRIGGER_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {CANDIDATE_FTS_TABLE}_ai AFTER INSERT ON jobapp_application BEGIN
+        INSERT INTO {CANDIDATE_FTS_TABLE}(rowid, name, email, resume_text)
+        VALUES (new.id, new.name, new.email, new.resume_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {CANDIDATE_FTS_TABLE}_ad AFTER DELETE ON jobapp_application BEGIN
+        INSERT INTO {CANDIDATE_FTS_TABLE}({CANDIDATE_FTS_TABLE}, rowid, name, email, resume_text)
+        VALUES ('delete', old.id, old.name, old.email, old.resume_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {CANDIDATE_FTS_TABLE}_au
+    AFTER UPDATE OF name, email, resume_text ON jobapp_application BEGIN
+        INSERT INTO {CANDIDATE_FTS_TABLE}({CANDIDATE_FTS_TABLE}, rowid, name, email, resume_text)
+        VALUES ('delete', old.id, old.name, old.email, old.resume_text);
+        INSERT INTO {CANDIDATE_FTS_TABLE}(rowid, name, email, resume_text)
+        VALUES (new.id, new.name, new.email, new.resume_text);
+    END
+    """,
+]
+
+CANDIDATE_SQLITE_DROP_SQL = [
+    f"DROP TRIGGER IF EXISTS {CANDIDATE_FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {CANDIDATE_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {CANDIDATE_FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {CANDIDATE_FTS_TABLE}",
+]
+
+CANDIDATE_PG_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '') || ' ' || coalesce(email, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(resume_text, '')), 'D')"
+)
+
+CANDIDATE_PG_INDEX_SQL = [
+    f"CREATE INDEX IF NOT EXISTS {CANDIDATE_PG_INDEX} ON jobapp_application USING GIN (({CANDIDATE_PG_DOCUMENT}))",
+]
+
+CANDIDATE_PG_DROP_SQL = [
+    f"DROP INDEX IF EXISTS {CANDIDATE_PG_INDEX}",
+]
+
+
+def install_candidate_index(conn):
+    """Like install_index(), for jobapp_application."""
+    _execute(conn, CANDIDATE_SQLITE_INDEX_SQL + CANDIDATE_SQLITE_TRIGGER_SQL, CANDIDATE_PG_INDEX_SQL)
+
+
+def drop_candidate_index(conn):
+    _execute(conn, CANDIDATE_SQLITE_DROP_SQL, CANDIDATE_PG_DROP_SQL)
+
+
+def rebuild_candidate_index(conn=connection):
+    install_candidate_index(conn)
+    _execute(
+        conn,
+        [f"INSERT INTO {CANDIDATE_FTS_TABLE}({CANDIDATE_FTS_TABLE}) VALUES('rebuild')"],
+        [f"REINDEX INDEX {CANDIDATE_PG_INDEX}"],
+    )
+
+
+# -----------------------------
+# Query building
+# -----------------------------
+
+def words(text):
+    """All lowercased words of ``text``."""
+    return _TOKEN_RE.findall((text or '').lower())
+
+
+def tokenize(text):
+    """The search terms of a query: its first MAX_TERMS words."""
+    return words(text)[:MAX_TERMS]
+
+
+def _sqlite_match(terms, location_terms):
+    # Every term is quoted (so user input can never be parsed as FTS5
+    # syntax) and made a prefix query. Terms are ANDed together.
+    parts = ['"%s"*' % term for term in terms]
+    parts += ['location : "%s"*' % term for term in location_terms]
+    return ' '.join(parts)
+
+
+def _pg_tsquery(terms, location_terms):
+    # Weight C is the location column in PG_DOCUMENT.
+    parts = ['%s:*' % term for term in terms]
+    parts += ['%s:*C' % term for term in location_terms]
+    return ' & '.join(parts)
+
+
+def legacy_search(queryset, search='', location=''):
+    """The original icontains query, kept as a fallback and for benchmarks."""
+    if search:
+        queryset = queryset.filter(Q(title__icontains=search) | Q(company__icontains=search))
+    if location:
+        queryset = queryset.filter(location__icontains=location)
+    return queryset
+
+
+def search_jobs(queryset, search='', location=''):
+    """Filter a Job queryset by free text and location, best matches first.
+
+    Matching jobs are annotated with ``search_rank``, where lower is a better
+    match on every backend. Without any search terms the queryset is
+    returned unchanged.
+    """
+    terms = tokenize(search)
+    location_terms = tokenize(location)
+    if not terms and not location_terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = _sqlite_match(terms, location_terms)
+        # Join the FTS table so SQLite drives the query from the index and
+        # computes bm25 once per hit. The ORM has no other way to add a table
+        # to FROM; the rank is then exposed as a regular annotation so callers
+        # can filter and order on it.
+        queryset = queryset.extra(
+            tables=[FTS_TABLE],
+            where=[f"{FTS_TABLE}.rowid = jobapp_job.id", f"{FTS_TABLE} MATCH %s"],
+            params=[match],
+        ).annotate(
+            search_rank=RawSQL(f"{FTS_TABLE}.rank", (), output_field=FloatField()),
+        )
+    elif vendor == 'postgresql':
+        tsquery = _pg_tsquery(terms, location_terms)
+        queryset = queryset.filter(
+            RawSQL(f"({PG_DOCUMENT}) @@ to_tsquery('english', %s)", (tsquery,), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f"-ts_rank_cd({PG_DOCUMENT}, to_tsquery('english', %s))",
+                (tsquery,),
+                output_field=FloatField(),
+            )
+        )
+    else:
+        return legacy_search(queryset, search, location)
+
+    return queryset.order_by('search_rank', '-posted_on', '-id')
+
+
+def search_candidates(queryset, search=''):
+    """Filter an Application queryset by free text over name, email and resume.
+
+    Like search_jobs(), matches are annotated with ``search_rank`` (lower is
+    better) and the queryset is returned unchanged without search terms.
+    """
+    terms = tokenize(search)
+    if not terms:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        queryset = queryset.extra(
+            tables=[CANDIDATE_FTS_TABLE],
+            where=[f"{CANDIDATE_FTS_TABLE}.rowid = jobapp_application.id", f"{CANDIDATE_FTS_TABLE} MATCH %s"],
+            params=[_sqlite_match(terms, [])],
+        ).annotate(
+            search_rank=RawSQL(f"{CANDIDATE_FTS_TABLE}.rank", (), output_field=FloatField()),
+        )
+    elif vendor == 'postgresql':
+        tsquery = _pg_tsquery(terms, [])
+        queryset = queryset.filter(
+            RawSQL(f"({CANDIDATE_PG_DOCUMENT}) @@ to_tsquery('english', %s)", (tsquery,), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f"-ts_rank_cd({CANDIDATE_PG_DOCUMENT}, to_tsquery('english', %s))",
+                (tsquery,),
+                output_field=FloatField(),
+            )
+        )
+    else:
+        query = Q()
+        for term in terms:
+            query &= Q(name__icontains=term) | Q(email__icontains=term) | Q(resume_text__icontains=term)
+        return queryset.filter(query)
+
+    return queryset.order_by('search_rank', '-applied_at', '-id')
@@ -1,9 +1,55 @@
-from django.db.models.signals import post_save
 from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from .models import UserProfile
+from .alerts import jobs_posted
+from .backends import forget_user
+from .facets import invalidate_facets
+from .fragments import invalidate_job
+from .models import Application, Job, UserProfile
+from .notifications import application_submitted
+from .stats import application_added, application_removed
 
-@receiver(post_save, sender=User)
-def create_profile(sender, instance, created, **kwargs):
+# UserProfile creation for new users lives in models.py
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_job_cards(sender, instance, **kwargs):
+    invalidate_job(instance.pk)
+    invalidate_facets()
+
+
+@receiver(post_save, sender=Job)
+def match_new_job(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance)
+        jobs_posted([instance.pk])
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, **kwargs):
+    if created:
+        application_added(instance)
+        application_submitted(instance)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    application_removed(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def forget_cached_profile(sender, instance, **kwargs):
+    forget_user(instance.user_id)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        forget_user(user.pk)
@@ -0,0 +1,34 @@
+"""
+Static files over ASGI.
+
+WhiteNoiseMiddleware is sync-only, so with ASYNC_VIEWS it is taken out of
+MIDDLEWARE (see settings.py), where it would put every request below it on a
+thread. asgi.py wraps the application in WhiteNoiseASGIHandler instead: static
+URLs are answered in front of Django, on a thread, and everything else goes
+straight to the async views.
+
+Django's own ASGIStaticFilesHandler can't be used as it is: it looks files up
+through the finders, but with STATIC_MANIFEST the templates link the hashed
+names that only collectstatic writes, to STATIC_ROOT. This one serves what
+WhiteNoiseMiddleware would: STATIC_ROOT (and the finders with DEBUG), the
+gzip/Brotli copies and the far-future Cache-Control of hashed files.
+"""
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+from django.http import Http404
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+
+class WhiteNoiseASGIHandler(ASGIStaticFilesHandler):
+    def __init__(self, application):
+        super().__init__(application)
+        self.whitenoise = WhiteNoiseMiddleware()
+
+    def serve(self, request):
+        whitenoise = self.whitenoise
+        if whitenoise.autorefresh:
+            static_file = whitenoise.find_file(request.path_info)
+        else:
+            static_file = whitenoise.files.get(request.path_info)
+        if static_file is None:
+            raise Http404(f"No static file at {request.path_info}")
+        return whitenoise.serve(static_file, request)
@@ -0,0 +1,105 @@
+"""
+Denormalized applicant counters.
+
+JobStats holds the total number of applications per job and JobDailyStats
+the number per job and day. Both are adjusted in place with
+``UPDATE ... SET applications = applications + 1`` when an Application is
+created or deleted (see signals.py), so reading them never aggregates over
+jobapp_application. Writes that bypass signals (bulk_create, raw SQL,
+queryset.update of applicant/job) are not counted; the reconcile_job_stats
+management command rebuilds both tables from scratch.
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Application, JobDailyStats, JobStats
+
+# Days shown in the dashboard chart, today included.
+CHART_DAYS = 30
+
+
+def _adjust(model, delta, **key):
+    if delta < 0:
+        # Never go below zero, even if the counters have drifted.
+        model.objects.filter(applications__gt=0, **key).update(applications=F('applications') + delta)
+        return
+    if model.objects.filter(**key).update(applications=F('applications') + delta):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(applications=delta, **key)
+    except IntegrityError:
+        # Another request created the row first.
+        model.objects.filter(**key).update(applications=F('applications') + delta)
+
+
+def application_added(application):
+    day = timezone.localdate(application.applied_at)
+    _adjust(JobStats, 1, job_id=application.job_id)
+    _adjust(JobDailyStats, 1, job_id=application.job_id, day=day)
+
+
+def application_removed(application):
+    day = timezone.localdate(application.applied_at)
+    _adjust(JobStats, -1, job_id=application.job_id)
+    _adjust(JobDailyStats, -1, job_id=application.job_id, day=day)
+
+
+def daily_applications(user, days=CHART_DAYS):
+    """``[(day, applications)]`` across the employer's jobs for the last ``days`` days, oldest first."""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    totals = dict(
+        JobDailyStats.objects.filter(job__posted_by=user, day__gte=start)
+        .values_list('day')
+        .annotate(total=Sum('applications'))
+        .order_by()
+    )
+    return [(start + timedelta(days=i), totals.get(start + timedelta(days=i), 0)) for i in range(days)]
+
+
+def dashboard_chart(user, days=CHART_DAYS):
+    series = daily_applications(user, days)
+    return {
+        'days': series,
+        'total': sum(n for _, n in series),
+        'max': max(n for _, n in series) or 1,
+    }
+
+
+def rebuild_stats(batch_size=1000):
+    """Recount both tables from jobapp_application.
+
+    Returns the number of jobs whose total had drifted. Runs in one
+    transaction; applications submitted meanwhile wait for it on SQLite but
+    may be missed on other databases, so run it when traffic is low.
+    """
+    with transaction.atomic():
+        before = dict(JobStats.objects.values_list('job_id', 'applications'))
+        totals = (
+            Application.objects.values_list('job_id')
+            .annotate(applications=Count('id'))
+            .order_by()
+        )
+        daily = (
+            Application.objects.annotate(day=TruncDate('applied_at'))
+            .values_list('job_id', 'day')
+            .annotate(applications=Count('id'))
+            .order_by()
+        )
+        after = dict(totals)
+        JobStats.objects.all().delete()
+        JobDailyStats.objects.all().delete()
+        JobStats.objects.bulk_create(
+            [JobStats(job_id=job_id, applications=n) for job_id, n in after.items()],
+            batch_size=batch_size,
+        )
+        JobDailyStats.objects.bulk_create(
+            [JobDailyStats(job_id=job_id, day=day, applications=n) for job_id, day, n in daily],
+            batch_size=batch_size,
+        )
+    return sum(1 for job_id in before.keys() | after.keys() if before.get(job_id, 0) != after.get(job_id, 0))
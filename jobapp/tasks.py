@@ -0,0 +1,139 @@
+"""
+Database-backed task queue.
+
+Side effects that may be slow or fail, like sending email, are not done in
+the request. enqueue() inserts a Task row instead, in the same transaction
+as the change that caused it, so a task exists exactly when that change was
+committed. Worker processes started by the run_tasks management command
+claim due tasks and run the function registered for their name with @task.
+
+Claiming is a single ``UPDATE ... WHERE id IN (due tasks) AND <still
+free>`` that stamps the rows with a lease, so workers never run the same
+task at the same time, on SQLite as well as PostgreSQL. A worker that dies
+mid-task loses its lease after LEASE_SECONDS and the task runs again; task
+functions must therefore be safe to run twice. A task that raises is
+retried after RETRY_DELAY seconds, doubling with each attempt, and given up
+on (failed_at set, kept for inspection) after MAX_ATTEMPTS.
+
+Functions registered with ``batch=True`` get the payloads of all claimed
+tasks of the same name and group in one call, e.g. all new applications
+for one employer.
+"""
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 30
+MAX_RETRY_DELAY = 60 * 60
+LEASE_SECONDS = 5 * 60
+CLAIM_SIZE = 100
+
+# name -> function, filled by @task
+TASKS = {}
+
+
+def task(name, batch=False):
+    """Register the decorated function as the handler for tasks called ``name``."""
+    def register(func):
+        func.batch = batch
+        TASKS[name] = func
+        return func
+    return register
+
+
+def enqueue(name, payload=None, group='', delay=0):
+    """Queue a task. Costs one INSERT; the task runs once the transaction commits and it is due."""
+    return Task.objects.create(
+        name=name, payload=payload or {}, group=group, run_at=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim(worker, limit=CLAIM_SIZE):
+    """Lease up to ``limit`` due tasks to ``worker`` and return them."""
+    now = timezone.now()
+    free = Q(failed_at__isnull=True, run_at__lte=now) & (Q(locked_until__isnull=True) | Q(locked_until__lt=now))
+    due = Task.objects.filter(free).order_by('run_at', 'id').values('id')[:limit]
+    # Unique per claim, so a task whose lease expired and was taken over is
+    # not mistaken for one of ours.
+    token = f'{worker}:{uuid.uuid4().hex[:12]}'[-64:]
+    # "free" is repeated on the outer UPDATE: PostgreSQL re-checks it on
+    # rows another worker claimed in the meantime.
+    lease = now + timedelta(seconds=LEASE_SECONDS)
+    if not Task.objects.filter(free, id__in=due).update(locked_by=token, locked_until=lease):
+        return []
+    return list(Task.objects.filter(locked_by=token).order_by('run_at', 'id'))
+
+
+def run_due(worker=None, limit=CLAIM_SIZE):
+    """Claim and run one round of due tasks; returns how many were claimed."""
+    tasks = claim(worker or worker_name(), limit)
+    units = defaultdict(list)
+    for item in tasks:
+        handler = TASKS.get(item.name)
+        key = (item.name, item.group) if handler is not None and handler.batch else (item.name, item.pk)
+        units[key].append(item)
+
+    for (name, _), items in units.items():
+        handler = TASKS.get(name)
+        try:
+            if handler is None:
+                raise LookupError(f'No task registered as {name!r}')
+            if handler.batch:
+                handler([item.payload for item in items])
+            else:
+                handler(items[0].payload)
+        except Exception:
+            logger.exception('Task %s %s failed', name, [item.pk for item in items])
+            retry(items, traceback.format_exc())
+        else:
+            Task.objects.filter(pk__in=[item.pk for item in items]).delete()
+    return len(tasks)
+
+
+def retry(items, error):
+    now = timezone.now()
+    for item in items:
+        item.attempts += 1
+        item.last_error = error
+        item.locked_by = ''
+        item.locked_until = None
+        if item.attempts >= MAX_ATTEMPTS:
+            item.failed_at = now
+        else:
+            delay = min(RETRY_DELAY * 2 ** (item.attempts - 1), MAX_RETRY_DELAY)
+            # Jitter, so tasks that failed together don't all retry together
+            item.run_at = now + timedelta(seconds=delay * random.uniform(0.8, 1.2))
+    Task.objects.bulk_update(items, ['attempts', 'last_error', 'locked_by', 'locked_until', 'failed_at', 'run_at'])
+
+
+def work(poll_interval=1.0, stop=lambda: False, exit_when_idle=False):
+    """Run tasks until ``stop()`` returns true, sleeping ``poll_interval`` seconds while there are none."""
+    worker = worker_name()
+    while not stop():
+        # A long-running process outside the request cycle: drop broken or
+        # expired connections the way Django does between requests.
+        close_old_connections()
+        if run_due(worker):
+            continue
+        if exit_when_idle:
+            break
+        time.sleep(poll_interval)
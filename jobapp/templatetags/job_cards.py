@@ -0,0 +1,11 @@
+from django import template
+
+from jobapp.fragments import render_job_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def job_cards(jobs, template_name):
+    """Render ``template_name`` once per job, served from the fragment cache where possible."""
+    return render_job_cards(jobs, template_name)
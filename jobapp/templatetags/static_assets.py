@@ -0,0 +1,19 @@
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+
+@lru_cache(maxsize=None)
+def read_static(path):
+    with open(finders.find(path), encoding='utf-8') as f:
+        return f.read()
+
+
+@register.simple_tag
+def inline_css(path):
+    """A <style> element with the contents of the static file ``path``, read once per process."""
+    return mark_safe(f'<style>{read_static(path)}</style>')
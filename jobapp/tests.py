@@ -1,3 +1,1462 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core import mail
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.http import Http404
+from django.template.backends.django import Template as DjangoTemplate
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.signals import template_rendered
+from django.test.utils import CaptureQueriesContext
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from . import async_views, urls
+from .alerts import match_jobs, save_search, send_digests
+from .assets import CRITICAL, STATIC_DIR, TEMPLATE_DIR, stale
+from .applications import submit_application
+from .backends import USER_CACHE
+from .bench import percentile, seed_scenario, view_requests
+from .facets import CACHE_KEY as FACET_CACHE_KEY, invalidate_facets
+from .fragments import CACHE_ALIAS, card_key
+from .instrumentation import VIEW_BUDGETS, _original_render
+from .management.commands.explain_views import full_scans
+from .models import Application, Job, JobAlert, JobDailyStats, JobStats, Profile, SavedSearch, Task
+from .pagination import NEXT, PAGE_SIZE, encode_cursor, paginate
+from .queries import latest_applications
+from .recommendations import build_recommendations
+from .resumes import TYPE_ERROR
+from .routers import REPLICA_ALIAS, STICKY_COOKIE
+from .search import search_jobs
+from .stats import CHART_DAYS, application_removed, dashboard_chart, rebuild_stats
+from .static_files import WhiteNoiseASGIHandler
+from .tasks import MAX_ATTEMPTS, TASKS, enqueue, run_due, task
+
+
+def make_user(username, role):
+    user = User.objects.create_user(username=username, password='pass12345')
+    user.userprofile.role = role
+    user.userprofile.save()
+    return user
+
+
+class RoleResolutionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        cls.employer = make_user('employer', 'Employer')
+        Job.objects.create(
+            title='Python Developer', description='Build things', company='Acme',
+            location='Pune', salary=100000, posted_by=cls.employer,
+        )
+
+    def test_home_queries(self):
+        self.client.force_login(self.seeker)
+        invalidate_facets()
+        # session, user joined with profile, one page of jobs, the facet
+        # counts
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('home'))
+        self.assertContains(response, 'My Applications')
+        # the facet counts of the unfiltered listing are cached
+        with self.assertNumQueries(3):
+            self.client.get(reverse('home'))
+
+    def test_decorated_view_queries(self):
+        self.client.force_login(self.employer)
+        # session, user joined with profile
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('post_job'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_dashboard_queries(self):
+        self.client.force_login(self.employer)
+        # session, user joined with profile, one page of jobs with their
+        # applicant counts, the daily chart; the view and the navbar share
+        # the role
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('employer_dashboard'))
+        self.assertContains(response, 'My Jobs')
+
+    def test_decorator_redirects_other_roles(self):
+        self.client.force_login(self.seeker)
+        response = self.client.get(reverse('post_job'))
+        self.assertRedirects(response, reverse('home'))
+
+    @override_settings(PIN_ROLE_IN_SESSION=True)
+    def test_role_pinned_at_login(self):
+        response = self.client.post(reverse('login'), {'username': 'employer', 'password': 'pass12345'})
+        self.assertRedirects(response, reverse('employer_dashboard'))
+        self.assertEqual(self.client.session['_jobapp_role'], 'Employer')
+
+
+class FacetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        employer = make_user('employer', 'Employer')
+        cls.jobs = {
+            title: Job.objects.create(
+                title=title, description='Build things', company='Acme', category=category,
+                location=location, salary=salary, posted_by=employer,
+            )
+            for title, category, location, salary in [
+                ('Python Developer', 'Software', 'Pune', 400000),
+                ('Data Analyst', 'Data', ' pune', 1500000),
+                ('Data Engineer', 'Data', 'Mumbai', 500000),
+                ('Staff Engineer', 'Software', 'MUMBAI', 3000000),
+                ('Designer', 'Design', 'Delhi', 999999),
+                ('Tech Lead', 'Software', 'Pune', 2000000),
+            ]
+        }
+
+    def setUp(self):
+        invalidate_facets()
+        self.client.force_login(self.seeker)
+
+    def listing(self, **params):
+        response = self.client.get(reverse('home'), params)
+        facets = response.context['facets']
+        counts = {
+            name: {option['value']: option['count'] for option in facets[name] if option['count']}
+            for name in ('category', 'city', 'salary')
+        }
+        return sorted(job.title for job in response.context['jobs']), counts, facets['total']
+
+    def test_each_facet_counted_with_the_other_selections(self):
+        titles, counts, total = self.listing(city='Pune', salary='10-20')
+        self.assertEqual((titles, total), (['Data Analyst'], 1))
+        # Salary: every job in Pune; city: every job in the band; category: both
+        self.assertEqual(counts['salary'], {'0-5': 1, '10-20': 1, '20-30': 1})
+        self.assertEqual(counts['city'], {'pune': 1})
+        self.assertEqual(counts['category'], {'Data': 1})
+
+        titles, counts, total = self.listing(category='Software', city='mumbai')
+        self.assertEqual((titles, total), (['Staff Engineer'], 1))
+        self.assertEqual(counts['category'], {'Software': 1, 'Data': 1})
+        self.assertEqual(counts['city'], {'pune': 2, 'mumbai': 1})
+        self.assertEqual(counts['salary'], {'30+': 1})
+
+    def test_salary_bands(self):
+        # Lower bounds are inclusive, upper bounds exclusive
+        titles, counts, total = self.listing()
+        self.assertEqual(counts['salary'], {'0-5': 1, '5-10': 2, '10-20': 1, '20-30': 1, '30+': 1})
+        self.assertEqual(total, 6)
+        self.assertEqual(self.listing(salary='5-10')[0], ['Data Engineer', 'Designer'])
+        self.assertEqual(self.listing(salary='20-30')[0], ['Tech Lead'])
+        self.assertEqual(self.listing(salary='30+')[0], ['Staff Engineer'])
+        # Unknown values are ignored
+        self.assertEqual(self.listing(salary='1-2')[2], 6)
+
+    def test_job_edit_invalidates_the_cached_counts(self):
+        self.assertEqual(self.listing()[1]['category'], {'Software': 3, 'Data': 2, 'Design': 1})
+        self.assertIsNotNone(cache.get(FACET_CACHE_KEY))
+        job = self.jobs['Python Developer']
+        job.category = 'Data'
+        job.save()
+        self.assertIsNone(cache.get(FACET_CACHE_KEY))
+        self.assertEqual(self.listing()[1]['category'], {'Software': 2, 'Data': 3, 'Design': 1})
+        self.jobs['Designer'].delete()
+        self.assertEqual(self.listing()[1]['category'], {'Software': 2, 'Data': 3})
+
+
+class AsyncURLs:
+    """jobapp/urls.py as it is with ASYNC_VIEWS on."""
+    urlpatterns = [
+        path('', async_views.home_view, name='home'),
+        path('employer/dashboard/', async_views.employer_dashboard, name='employer_dashboard'),
+        path('my-applications/', async_views.my_applications, name='my_applications'),
+        path('job/<int:job_id>/', async_views.job_detail, name='job_detail'),
+    ] + [
+        pattern for pattern in urls.urlpatterns
+        if pattern.name not in {'home', 'employer_dashboard', 'my_applications', 'job_detail'}
+    ]
+
+
+@override_settings(ROOT_URLCONF=AsyncURLs)
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        cls.employer = make_user('employer', 'Employer')
+        cls.job = Job.objects.create(
+            title='Python Developer', description='Build things', company='Acme',
+            location='Pune', salary=100000, posted_by=cls.employer,
+        )
+
+    async def test_seeker_pages(self):
+        await self.async_client.aforce_login(self.seeker)
+        response = await self.async_client.get(reverse('home'))
+        self.assertIs(response.resolver_match.func, async_views.home_view)
+        self.assertContains(response, 'Python Developer')
+
+        detail = reverse('job_detail', args=[self.job.pk])
+        response = await self.async_client.get(detail)
+        self.assertContains(response, 'Acme')
+        # The first form sets the CSRF cookie, part of the ETag from then on
+        response = await self.async_client.get(detail)
+        response = await self.async_client.get(detail, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.async_client.post(detail)
+        self.assertRedirects(response, reverse('my_applications'), fetch_redirect_response=False)
+        self.assertTrue(await Application.objects.filter(job=self.job, applicant=self.seeker).aexists())
+        response = await self.async_client.get(reverse('my_applications'))
+        self.assertContains(response, 'Python Developer')
+
+    async def test_employer_dashboard(self):
+        await self.async_client.aforce_login(self.employer)
+        response = await self.async_client.get(reverse('employer_dashboard'))
+        self.assertContains(response, 'Python Developer')
+        await self.async_client.aforce_login(self.seeker)
+        response = await self.async_client.get(reverse('employer_dashboard'))
+        self.assertEqual(response.status_code, 403)
+
+
+class PaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = make_user('employer', 'Employer')
+        now = timezone.now()
+        # Runs of jobs posted at the same moment, so pages split ties
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Job {i}', description='Build things', company='Acme', location='Pune',
+                salary=100000, posted_by=employer, posted_on=now - timedelta(hours=i // 4),
+            )
+            for i in range(10)
+        ]
+        cls.expected = [job.pk for job in sorted(cls.jobs, key=lambda job: (job.posted_on, job.pk), reverse=True)]
+
+    def queryset(self):
+        return Job.objects.order_by('-posted_on', '-id')
+
+    def test_walk_forward_and_back(self):
+        pages, cursor = [], None
+        while True:
+            page = paginate(self.queryset(), cursor, page_size=3)
+            pages.append([job.pk for job in page])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([len(ids) for ids in pages], [3, 3, 3, 1])
+        self.assertEqual(sum(pages, []), self.expected)
+
+        back = []
+        while page.has_previous:
+            page = paginate(self.queryset(), page.previous_cursor, page_size=3)
+            back.insert(0, [job.pk for job in page])
+        self.assertEqual(back, pages[:-1])
+        self.assertFalse(page.has_previous)
+
+    def test_bad_cursor_gives_first_page(self):
+        first = [job.pk for job in paginate(self.queryset(), page_size=3)]
+        for cursor in (
+            'not a cursor',
+            encode_cursor('x', [self.jobs[0].posted_on, self.jobs[0].pk]),
+            encode_cursor(NEXT, [self.jobs[0].pk]),
+            encode_cursor(NEXT, ['yesterday', self.jobs[0].pk]),
+        ):
+            with self.subTest(cursor=cursor):
+                page = paginate(self.queryset(), cursor, page_size=3)
+                self.assertEqual([job.pk for job in page], first)
+                self.assertFalse(page.has_previous)
+                self.assertTrue(page.ignored_cursor)
+
+        self.client.force_login(make_user('seeker', 'Job Seeker'))
+        response = self.client.get(reverse('home'), {'cursor': 'not a cursor'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['page'].has_previous)
+
+
+class MyApplicationsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        employer = make_user('employer', 'Employer')
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Job {i}', description='Build things', company='Acme', location='Pune',
+                salary=100000, posted_by=employer,
+            )
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.seeker)
+
+    def apply(self, job, at):
+        self.client.post(reverse('job_detail', args=[job.pk]))
+        Application.objects.filter(job=job, applicant=self.seeker).update(applied_at=at)
+
+    def test_latest_application_per_job(self):
+        now = timezone.now()
+        first, second = self.jobs[:2]
+        self.apply(first, now - timedelta(days=2))
+        self.apply(second, now - timedelta(days=1))
+        # Applying again is a no-op; the job is listed once, as first applied
+        self.client.post(reverse('job_detail', args=[first.pk]))
+        self.assertEqual(Application.objects.filter(applicant=self.seeker).count(), 2)
+        Application.objects.create(job=first, applicant=make_user('other', 'Job Seeker'), name='Other', email='o@example.test')
+
+        self.assertEqual([app.job.title for app in latest_applications(self.seeker)], ['Job 1', 'Job 0'])
+        response = self.client.get(reverse('my_applications'))
+        self.assertEqual([app.job.title for app in response.context['applications']], ['Job 1', 'Job 0'])
+
+    def test_paginates_newest_first(self):
+        now = timezone.now()
+        # Two pairs applied at the same moment, so pages split ties on the id
+        for i, job in enumerate(self.jobs):
+            self.apply(job, now - timedelta(hours=i // 2))
+        expected = [
+            app.pk for app in sorted(
+                Application.objects.filter(applicant=self.seeker), key=lambda app: (app.applied_at, app.pk), reverse=True,
+            )
+        ]
+        pages, cursor = [], None
+        while True:
+            page = paginate(latest_applications(self.seeker), cursor, page_size=2)
+            pages.append([app.pk for app in page])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual([len(ids) for ids in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+        # The view pages by PAGE_SIZE, past all five
+        response = self.client.get(reverse('my_applications'))
+        self.assertEqual([app.pk for app in response.context['applications']], expected)
+        self.assertFalse(response.context['page'].has_next)
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employer = make_user('employer', 'Employer')
+        now = timezone.now()
+        cls.jobs = {
+            title: Job.objects.create(
+                title=title, description=description, company=company, location=location,
+                salary=100000, posted_by=employer, posted_on=now - timedelta(days=age),
+            )
+            for title, description, company, location, age in [
+                ('Django Developer', 'Build web services', 'Acme', 'Pune', 3),
+                ('Data Engineer', 'Pipelines, some Django admin work', 'Globex', 'Mumbai', 2),
+                ('Sales Executive', 'Grow accounts', 'Initech', 'Pune', 1),
+            ]
+        }
+
+    def titles(self, search='', location=''):
+        return [job.title for job in search_jobs(Job.objects.all(), search, location)]
+
+    def test_best_match_first(self):
+        # The title match is older but ranks above a mention in the description
+        self.assertEqual(self.titles('django'), ['Django Developer', 'Data Engineer'])
+
+    def test_prefixes_and_location(self):
+        self.assertEqual(self.titles('dev'), ['Django Developer'])
+        self.assertEqual(self.titles('djan', 'pun'), ['Django Developer'])
+        # Location terms only match the location
+        self.assertEqual(self.titles(location='acme'), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        job = self.jobs['Sales Executive']
+        job.title = 'Account Manager'
+        job.save()
+        self.assertEqual(self.titles('sales'), [])
+        self.assertEqual(self.titles('account'), ['Account Manager'])
+
+        # Queryset updates go through the triggers too
+        Job.objects.filter(pk=job.pk).update(location='Nagpur')
+        self.assertEqual(self.titles(location='nagpur'), ['Account Manager'])
+        self.assertEqual(self.titles('grow', 'pune'), [])
+
+        job.delete()
+        self.assertEqual(self.titles('account'), [])
+        self.assertEqual(self.titles(location='nagpur'), [])
+
+
+class JobCardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        employer = make_user('employer', 'Employer')
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Developer {i}', description='Build things', company='Acme',
+                location='Pune', salary=100000, posted_by=employer,
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        caches[CACHE_ALIAS].clear()
+        self.client.force_login(self.seeker)
+
+    def rendered_cards(self):
+        """GET home; the ids of the jobs whose card template was rendered, and the response."""
+        rendered = []
+
+        def record(sender, template, context, **kwargs):
+            if template.name == 'jobapp/cards/home_job.html':
+                rendered.append(context['job'].pk)
+
+        template_rendered.connect(record)
+        try:
+            response = self.client.get(reverse('home'))
+        finally:
+            template_rendered.disconnect(record)
+        return sorted(rendered), response
+
+    def test_cards_reused_until_the_job_changes(self):
+        ids = sorted(job.pk for job in self.jobs)
+        self.assertEqual(self.rendered_cards()[0], ids)
+        rendered, response = self.rendered_cards()
+        self.assertEqual(rendered, [])
+        self.assertContains(response, 'Developer 1')
+
+        job = self.jobs[1]
+        job.title = 'Senior Developer'
+        job.save()
+        rendered, response = self.rendered_cards()
+        self.assertEqual(rendered, [job.pk])
+        self.assertContains(response, 'Senior Developer')
+        self.assertNotContains(response, 'Developer 1')
+
+    def test_delete_drops_the_cards(self):
+        self.rendered_cards()
+        job = self.jobs[0]
+        key = card_key('jobapp/cards/home_job.html', job.pk)
+        self.assertIsNotNone(caches[CACHE_ALIAS].get(key))
+        job.delete()
+        self.assertIsNone(caches[CACHE_ALIAS].get(key))
+
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db', SESSION_CACHE_ALIAS='default', USER_CACHE_TIMEOUT=60,
+)
+class SessionCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user('employer', 'Employer')
+
+    def setUp(self):
+        caches[USER_CACHE].clear()
+        self.client.force_login(self.employer)
+
+    def test_no_queries_before_the_view(self):
+        self.client.get(reverse('post_job'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('post_job'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_password_change_ends_cached_sessions(self):
+        self.client.get(reverse('post_job'))
+        self.employer.set_password('changed12345')
+        self.employer.save()
+        response = self.client.get(reverse('post_job'))
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+
+class ViewBudgetTests(TestCase):
+    """Every view in jobapp/urls.py must stay within its VIEW_BUDGETS entry."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.scenario = seed_scenario()
+        cls.seeker = cls.scenario.seeker
+
+    def test_every_view_has_a_budget(self):
+        names = {pattern.name for pattern in urls.urlpatterns}
+        self.assertEqual(names - set(VIEW_BUDGETS), set())
+
+    def test_views_within_budget(self):
+        for name, user, path in view_requests(self.scenario):
+            with self.subTest(view=name):
+                self.client.logout()
+                if user:
+                    self.client.force_login(user)
+                response = self.client.get(path)
+                self.assertIn(response.status_code, (200, 302))
+                metrics = response.wsgi_request.metrics
+                self.assertEqual(metrics.view_name, name)
+                max_queries, max_ms = VIEW_BUDGETS[name]
+                self.assertLessEqual(metrics.queries, max_queries, metrics)
+                self.assertLessEqual(metrics.total_time * 1000, max_ms, metrics)
+
+    @override_settings(REQUEST_METRICS=True)
+    def test_server_timing_header(self):
+        self.client.force_login(self.seeker)
+        with self.assertLogs('jobapp.metrics', 'INFO') as logs:
+            # warm the facet cache
+            self.client.get(reverse('home'))
+            response = self.client.get(reverse('home'))
+        self.assertIn('sql;desc="3 queries"', response['Server-Timing'])
+        self.assertIn('view=home queries=3', logs.output[-1])
+        self.assertGreater(response.wsgi_request.metrics.template_time, 0)
+
+    def test_over_budget_warned_only_with_metrics(self):
+        self.client.force_login(self.seeker)
+        with mock.patch.dict(VIEW_BUDGETS, {'home': (0, 250)}):
+            with self.assertNoLogs('jobapp.metrics'):
+                self.client.get(reverse('home'))
+            with override_settings(REQUEST_METRICS=True), self.assertLogs('jobapp.metrics', 'WARNING') as logs:
+                self.client.get(reverse('home'))
+        self.assertIn('Over budget (0, 250): GET / view=home', logs.output[0])
+
+    def test_template_timer_only_with_metrics(self):
+        self.assertIs(DjangoTemplate.render, _original_render)
+        with override_settings(REQUEST_METRICS=True):
+            self.assertIsNot(DjangoTemplate.render, _original_render)
+        self.assertIs(DjangoTemplate.render, _original_render)
+        response = self.client.get(reverse('login'))
+        self.assertEqual(response.wsgi_request.metrics.template_time, 0)
+
+
+class BenchReplayTests(SimpleTestCase):
+    def test_percentile(self):
+        self.assertEqual(percentile([], 95), 0.0)
+        self.assertEqual([percentile([7], pct) for pct in (0, 50, 95, 99, 100)], [7] * 5)
+        hundred = list(range(100, 0, -1))
+        self.assertEqual([percentile(hundred, pct) for pct in (50, 95, 99, 100)], [50, 95, 99, 100])
+        # The nearest rank: p95 of ten values is the largest
+        self.assertEqual([percentile(range(1, 11), pct) for pct in (50, 94, 95, 99)], [5, 9, 10, 10])
+
+    def test_replay_in_process(self):
+        # The command seeds its own database and sets up the test
+        # environment, which the test runner already did: run it apart.
+        with tempfile.TemporaryDirectory() as directory:
+            log, output = os.path.join(directory, 'log.jsonl'), os.path.join(directory, 'out.json')
+            seeker = {'method': 'GET', 'query': '', 'role': 'Job Seeker'}
+            entries = (
+                [{**seeker, 'path': '/'}] * 3 + [{**seeker, 'path': '/', 'query': 'search=python'}]
+                + [{**seeker, 'path': '/job/{job}/'}] * 2 + [{**seeker, 'path': '/my-applications/'}]
+                + [{'method': 'GET', 'path': '/nowhere/', 'query': '', 'role': None}]
+            )
+            with open(log, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(entry) + '\n' for entry in entries)
+            result = subprocess.run(
+                [sys.executable, 'manage.py', 'bench_replay', log, '--passes', '2', '--jobs', '50',
+                 '--concurrency', '2', '--duration', '60', '--output', output],
+                cwd=settings.BASE_DIR, env={**os.environ, 'LOG_LEVEL': 'ERROR'},
+                capture_output=True, text=True, timeout=300,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            with open(output, encoding='utf-8') as f:
+                summary = json.load(f)['inprocess/2']
+        self.assertEqual(
+            {name: row['requests'] for name, row in summary.items()},
+            {'*': 16, 'home': 8, 'job_detail': 4, 'my_applications': 2, '(404)': 2},
+        )
+        self.assertEqual(summary['*']['errors'], 0)
+        self.assertEqual(summary['(404)']['rejected'], 2)
+
+
+class ExplainViewsTests(SimpleTestCase):
+    def test_sqlite_plans(self):
+        listing = 'SELECT * FROM "jobapp_job" ORDER BY "posted_on" DESC LIMIT 21'
+        facets = 'SELECT "category", COUNT("id") FROM "jobapp_job" GROUP BY "category"'
+        self.assertEqual(full_scans('sqlite', listing, ['SCAN jobapp_job USING INDEX job_posted_on_id_idx']), [])
+        self.assertEqual(full_scans('sqlite', listing, ['SCAN jobapp_job']), ['SCAN jobapp_job'])
+        # The facet counts walk the whole index and group in a temporary B-tree
+        plan = ['SCAN jobapp_job USING INDEX job_category_posted_idx', 'USE TEMP B-TREE FOR GROUP BY']
+        self.assertEqual(full_scans('sqlite', facets, plan), plan)
+        self.assertEqual(full_scans('sqlite', facets, ['SCAN jobapp_job USING COVERING INDEX job_category_idx']), [
+            'SCAN jobapp_job USING COVERING INDEX job_category_idx',
+        ])
+        ranged = ['SEARCH jobapp_job USING INDEX job_category_posted_idx (category=?)', 'SCAN job_fts VIRTUAL TABLE INDEX 0:M1']
+        self.assertEqual(full_scans('sqlite', facets, ranged), [])
+
+    def test_postgresql_plans(self):
+        facets = 'SELECT "category", COUNT("id") FROM "jobapp_job" GROUP BY "category"'
+        plan = [
+            'HashAggregate  (cost=1.00..2.00 rows=10 width=8)',
+            '  ->  Index Only Scan using job_category_idx on jobapp_job  (cost=0.28..1.00 rows=500 width=8)',
+        ]
+        self.assertEqual(full_scans('postgresql', facets, plan), [plan[1]])
+        plan[1:] = [
+            '  ->  Index Scan using job_category_idx on jobapp_job  (cost=0.28..1.00 rows=5 width=8)',
+            "        Index Cond: ((category)::text = 'Data'::text)",
+        ]
+        self.assertEqual(full_scans('postgresql', facets, plan), [])
+        plan = ['Sort  (cost=1.00..2.00 rows=500 width=8)', '  ->  Seq Scan on jobapp_job  (cost=0.00..1.00 rows=500 width=8)']
+        self.assertEqual(full_scans('postgresql', facets, plan), plan)
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        employer = make_user('employer', 'Employer')
+        jobs = {
+            title: Job.objects.create(
+                title=title, description=description, category=category, company='Acme',
+                location='Pune', salary=100000, posted_by=employer,
+            )
+            for title, description, category in [
+                ('Python Developer', 'Django and PostgreSQL services', 'Software'),
+                ('Senior Python Engineer', 'Django APIs and PostgreSQL tuning', 'Software'),
+                ('Sales Executive', 'Grow accounts and hit targets', 'Sales'),
+                ('Brand Designer', 'Logos and brand guidelines', 'Design'),
+            ]
+        }
+        cls.jobs = jobs
+        Application.objects.create(job=jobs['Python Developer'], applicant=cls.seeker, name='s', email='s@example.com')
+
+    def test_similar_jobs_first(self):
+        self.assertEqual(build_recommendations(top_n=5), 1)
+        self.client.force_login(self.seeker)
+        # session, user joined with profile, the recommendations
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('recommendations'))
+        titles = [job.title for job in response.context['jobs']]
+        # the job applied to is left out, jobs sharing no words are not listed
+        self.assertEqual(titles, ['Senior Python Engineer'])
+
+    def test_matches_words_late_in_the_description(self):
+        employer = User.objects.get(username='employer')
+        seeker = make_user('operator', 'Job Seeker')
+        applied = Job.objects.create(
+            title='Cluster Operator', description='Kubernetes', category='Operations',
+            company='Acme', location='Pune', salary=100000, posted_by=employer,
+        )
+        Job.objects.create(
+            title='Backend Developer', category='Engineering', company='Acme', location='Pune',
+            salary=100000, posted_by=employer,
+            # "kubernetes" is the tenth word, past what a search query keeps
+            description='We build reliable things in our small team with Kubernetes',
+        )
+        Application.objects.create(job=applied, applicant=seeker, name='o', email='o@example.com')
+        build_recommendations(top_n=5)
+        self.client.force_login(seeker)
+        response = self.client.get(reverse('recommendations'))
+        self.assertEqual([job.title for job in response.context['jobs']], ['Backend Developer'])
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        employer = make_user('employer', 'Employer')
+        now = timezone.now()
+        cls.jobs = [
+            Job.objects.create(
+                title=f'Developer {i}', description='Build things', company='Acme', location='Pune',
+                salary=100000, posted_by=employer, posted_on=now - timedelta(minutes=i),
+            )
+            for i in range(PAGE_SIZE + 5)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.seeker)
+
+    def get(self, url, **params):
+        return self.client.get(url, params)
+
+    def test_sparse_fields(self):
+        response = self.get(reverse('api_jobs', args=['v1']), fields='title,company')
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'title', 'company'})
+        response = self.get(reverse('api_job_detail', args=['v1', self.jobs[0].pk]), fields='salary')
+        self.assertEqual(response.json(), {'id': self.jobs[0].pk, 'salary': 100000})
+        # listings leave the description out unless asked for it
+        response = self.get(reverse('api_jobs', args=['v1']))
+        self.assertNotIn('description', response.json()['results'][0])
+
+    def test_cursor_links(self):
+        first = self.get(reverse('api_jobs', args=['v1']), fields='title').json()
+        self.assertEqual([row['id'] for row in first['results']], [job.pk for job in self.jobs[:PAGE_SIZE]])
+        self.assertIsNone(first['previous'])
+        # the links keep the other parameters
+        second = self.client.get(first['next']).json()
+        self.assertEqual([set(row) for row in second['results']], [{'id', 'title'}] * 5)
+        self.assertEqual([row['id'] for row in second['results']], [job.pk for job in self.jobs[PAGE_SIZE:]])
+        self.assertIsNone(second['next'])
+        back = self.client.get(second['previous']).json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_not_modified(self):
+        url = reverse('api_job_detail', args=['v1', self.jobs[0].pk])
+        response = self.get(url)
+        etag = response['ETag']
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        # as a proxy that weakened it would send it
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': f'W/{etag}'}).status_code, 304)
+        # other fields are another representation
+        self.assertEqual(self.client.get(url, {'fields': 'title'}, headers={'If-None-Match': etag}).status_code, 200)
+
+        job = self.jobs[0]
+        job.title = 'Senior Developer'
+        job.save()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        listing = reverse('api_jobs', args=['v1'])
+        etag = self.get(listing)['ETag']
+        self.assertEqual(self.client.get(listing, headers={'If-None-Match': etag}).status_code, 304)
+
+    def test_bad_requests(self):
+        listing = reverse('api_jobs', args=['v1'])
+        response = self.get(listing, fields='title,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'fields': 'Unknown field(s): password.'})
+        for cursor in ('not a cursor', encode_cursor('n', ['2024-01-01']), encode_cursor('n', ['soon', 1])):
+            with self.subTest(cursor=cursor):
+                response = self.get(listing, cursor=cursor)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'cursor': 'Invalid cursor.'})
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        cls.employer = make_user('employer', 'Employer')
+        cls.job = Job.objects.create(
+            title='Python Developer', description='Build things', company='Acme',
+            location='Pune', salary=100000, posted_by=cls.employer,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.seeker)
+        self.pages = [reverse('home'), reverse('job_detail', args=[self.job.pk])]
+
+    def etag(self, client, url):
+        # The first page sets the CSRF cookie its forms use, which is part of the ETag from then on
+        client.get(url)
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def assertPrivate(self, response):
+        self.assertIn('Cookie', response['Vary'])
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_repeated_get_not_modified(self):
+        for url in self.pages:
+            with self.subTest(url=url):
+                etag = self.etag(self.client, url)
+                self.assertPrivate(self.client.get(url))
+                response = self.client.get(url, headers={'If-None-Match': etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+                self.assertPrivate(response)
+
+    def test_edit_changes_etag(self):
+        etags = {url: self.etag(self.client, url) for url in self.pages}
+        employer = Client()
+        employer.force_login(self.employer)
+        response = employer.post(reverse('edit_job', args=[self.job.pk]), {
+            'title': 'Senior Python Developer', 'description': 'Build things', 'company': 'Acme',
+            'location': 'Pune', 'salary': 100000,
+        })
+        self.assertRedirects(response, reverse('my_jobs'))
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, headers={'If-None-Match': etag})
+                self.assertContains(response, 'Senior Python Developer')
+                self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_per_user(self):
+        url = self.pages[1]
+        etag = self.etag(self.client, url)
+        for user in (make_user('other', 'Job Seeker'), self.employer):
+            with self.subTest(user=user.username):
+                client = Client()
+                client.force_login(user)
+                # Same CSRF cookie, so only the user and role tell them apart
+                client.cookies[settings.CSRF_COOKIE_NAME] = self.client.cookies[settings.CSRF_COOKIE_NAME].value
+                self.assertNotEqual(self.etag(client, url), etag)
+                self.assertEqual(client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+    def test_listing_not_modified_only_by_etag(self):
+        other = Job.objects.create(
+            title='Data Analyst', description='Dashboards', company='Globex',
+            location='Pune', salary=100000, posted_by=self.employer,
+        )
+        url = self.pages[0]
+        etag = self.etag(self.client, url)
+        self.assertNotIn('Last-Modified', self.client.get(url))
+        # Deleting a job leaves the newest row on the page as it was
+        other.delete()
+        since = http_date(timezone.now().timestamp() + 60)
+        response = self.client.get(url, headers={'If-Modified-Since': since})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Data Analyst')
+        response = self.client.get(url, headers={'If-None-Match': etag, 'If-Modified-Since': since})
+        self.assertEqual(response.status_code, 200)
+
+        detail = self.client.get(self.pages[1])
+        self.assertIn('Last-Modified', detail)
+        response = self.client.get(self.pages[1], headers={'If-Modified-Since': detail['Last-Modified']})
+        self.assertEqual(response.status_code, 304)
+
+
+class JobStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user('employer', 'Employer')
+        cls.seekers = [make_user(f'seeker{i}', 'Job Seeker') for i in range(3)]
+        cls.jobs = [
+            Job.objects.create(
+                title=title, description='Build things', company='Acme',
+                location='Pune', salary=100000, posted_by=cls.employer,
+            )
+            for title in ('Python Developer', 'Data Analyst')
+        ]
+        cls.other_job = Job.objects.create(
+            title='Sales Executive', description='Sell things', company='Globex',
+            location='Pune', salary=100000, posted_by=make_user('other', 'Employer'),
+        )
+
+    def apply(self, job, seeker, days_ago=0):
+        application = Application.objects.create(job=job, applicant=seeker, name=seeker.username, email='a@example.test')
+        if days_ago:
+            # Skips the signals, like an import would; rebuild_stats catches up
+            Application.objects.filter(pk=application.pk).update(applied_at=timezone.now() - timedelta(days=days_ago))
+        return application
+
+    def counts(self, job):
+        return (
+            JobStats.objects.get(job=job).applications,
+            dict(JobDailyStats.objects.filter(job=job).values_list('day', 'applications')),
+        )
+
+    def test_counters_follow_applications(self):
+        job, today = self.jobs[0], timezone.localdate()
+        first = self.apply(job, self.seekers[0])
+        second = self.apply(job, self.seekers[1])
+        self.assertEqual(self.counts(job), (2, {today: 2}))
+        first.delete()
+        self.assertEqual(self.counts(job), (1, {today: 1}))
+        second.delete()
+        self.assertEqual(self.counts(job), (0, {today: 0}))
+        # Never below zero, even when the counters have drifted
+        application_removed(second)
+        self.assertEqual(self.counts(job), (0, {today: 0}))
+
+    def test_daily_rollup_and_dashboard_chart(self):
+        today = timezone.localdate()
+        python, data = self.jobs
+        self.apply(python, self.seekers[0])
+        self.apply(python, self.seekers[1], days_ago=2)
+        self.apply(data, self.seekers[0], days_ago=2)
+        self.apply(data, self.seekers[2], days_ago=CHART_DAYS)
+        self.apply(self.other_job, self.seekers[0])
+        # The totals were right, only the days of the moved ones were not
+        self.assertEqual(rebuild_stats(), 0)
+
+        two_days_ago, old = today - timedelta(days=2), today - timedelta(days=CHART_DAYS)
+        self.assertEqual(self.counts(python), (2, {today: 1, two_days_ago: 1}))
+        self.assertEqual(self.counts(data), (2, {two_days_ago: 1, old: 1}))
+
+        chart = dashboard_chart(self.employer)
+        self.assertEqual(len(chart['days']), CHART_DAYS)
+        self.assertEqual(chart['days'][0][0], today - timedelta(days=CHART_DAYS - 1))
+        # The other employer's job and the application from before the chart
+        # are left out
+        self.assertEqual({day: n for day, n in chart['days'] if n}, {today: 1, two_days_ago: 2})
+        self.assertEqual((chart['total'], chart['max']), (3, 2))
+        self.assertEqual(dashboard_chart(self.seekers[0])['max'], 1)
+
+    def test_reconcile_repairs_drift(self):
+        job = self.jobs[0]
+        self.apply(job, self.seekers[0])
+        self.apply(job, self.seekers[1])
+        JobStats.objects.filter(job=job).update(applications=99)
+        JobDailyStats.objects.filter(job=job).delete()
+        out = StringIO()
+        call_command('reconcile_job_stats', stdout=out)
+        self.assertIn('1 job(s) had drifted', out.getvalue())
+        self.assertEqual(self.counts(job), (2, {timezone.localdate(): 2}))
+        self.assertFalse(JobStats.objects.filter(job=self.jobs[1]).exists())
+
+
+class SubmitApplicationTests(TransactionTestCase):
+    def setUp(self):
+        self.seeker = make_user('seeker', 'Job Seeker')
+        self.job = Job.objects.create(
+            title='Python Developer', description='Build things', company='Acme',
+            location='Pune', salary=100000, posted_by=make_user('employer', 'Employer'),
+        )
+
+    def test_one_query_and_duplicates_ignored(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(submit_application(Application(job=self.job, applicant=self.seeker)))
+        # the insert; the rest maintain the applicant counters
+        self.assertEqual(len([q for q in queries if 'jobapp_application' in q['sql']]), 1)
+        with self.assertNumQueries(1):
+            self.assertFalse(submit_application(Application(job=self.job, applicant=self.seeker)))
+
+    def test_concurrent_submits(self):
+        threads = 8
+        barrier = threading.Barrier(threads)
+
+        def submit():
+            try:
+                barrier.wait()
+                return submit_application(Application(job=self.job, applicant=self.seeker))
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(threads) as pool:
+            results = list(pool.map(lambda _: submit(), range(threads * 4)))
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(Application.objects.filter(job=self.job, applicant=self.seeker).count(), 1)
+        self.assertEqual(JobStats.objects.get(job=self.job).applications, 1)
+
+
+@override_settings(DATABASE_ROUTERS=['jobapp.routers.PrimaryReplicaRouter'])
+class ReplicaRoutingTests(TransactionTestCase):
+    """A second SQLite file as the replica, kept up to date with sync_replica, as in the README."""
+
+    @classmethod
+    def setUpClass(cls):
+        # Added after the test framework's own setup, which only knows the
+        # configured databases
+        super().setUpClass()
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        # connections.settings is settings.DATABASES, which ReplicaMiddleware checks
+        connections.settings[REPLICA_ALIAS] = {
+            **connections.settings['default'], 'NAME': os.path.join(directory.name, 'replica.sqlite3'),
+        }
+        cls.addClassCleanup(connections.settings.pop, REPLICA_ALIAS)
+        cls.addClassCleanup(connections.__delitem__, REPLICA_ALIAS)
+        cls.addClassCleanup(connections[REPLICA_ALIAS].close)
+        cls.databases = {'default', REPLICA_ALIAS}
+
+    def setUp(self):
+        self.seeker = make_user('seeker', 'Job Seeker')
+        self.job = Job.objects.create(
+            title='Python Developer', description='Build things', company='Acme',
+            location='Pune', salary=100000, posted_by=make_user('employer', 'Employer'),
+        )
+        self.client.force_login(self.seeker)
+        call_command('sync_replica', stdout=open(os.devnull, 'w'))
+        # Not replicated yet
+        Job.objects.filter(pk=self.job.pk).update(title='Senior Python Developer')
+
+    def test_reads_replica_writes_primary_then_sticks(self):
+        detail = reverse('job_detail', args=[self.job.pk])
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica_queries:
+            response = self.client.get(detail)
+        self.assertContains(response, 'Python Developer')
+        self.assertNotContains(response, 'Senior')
+        self.assertTrue(replica_queries)
+
+        # Not a replica view
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica_queries:
+            self.client.get(reverse('recommendations'))
+        self.assertEqual(len(replica_queries), 0)
+
+        response = self.client.post(detail)
+        self.assertRedirects(response, reverse('my_applications'), fetch_redirect_response=False)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        self.assertTrue(Application.objects.using('default').filter(job=self.job, applicant=self.seeker).exists())
+        self.assertFalse(Application.objects.using(REPLICA_ALIAS).exists())
+
+        # The next page sees its own write
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica_queries:
+            response = self.client.get(reverse('my_applications'))
+        self.assertContains(response, 'Senior Python Developer')
+        self.assertEqual(len(replica_queries), 0)
+
+
+class SQLiteProfileTests(TestCase):
+    """The PRAGMAs of each SQLITE_PROFILE, on a new connection to a new file."""
+
+    def pragmas(self, profile):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = SQLiteDatabaseWrapper({
+                **connection.settings_dict,
+                'NAME': os.path.join(directory, 'db.sqlite3'),
+                'OPTIONS': settings.SQLITE_PROFILES[profile],
+            })
+            try:
+                with wrapper.cursor() as cursor:
+                    return {
+                        name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                        for name in ('journal_mode', 'busy_timeout', 'foreign_keys', 'synchronous')
+                    }
+            finally:
+                wrapper.close()
+
+    def test_tuned(self):
+        # synchronous=NORMAL is 1
+        self.assertEqual(
+            self.pragmas('tuned'),
+            {'journal_mode': 'wal', 'busy_timeout': 20000, 'foreign_keys': 1, 'synchronous': 1},
+        )
+
+    def test_default_leaves_the_journal_alone(self):
+        # The journal mode is stored in the file, see settings.py
+        pragmas = self.pragmas('default')
+        self.assertEqual(pragmas['journal_mode'], 'delete')
+        self.assertEqual(pragmas['foreign_keys'], 1)
+
+
+@override_settings(BACKGROUND_TASKS_EAGER=True, RESUME_MAX_UPLOAD_SIZE=1024)
+class ApplyJobTests(TestCase):
+    RESUME = b'Jane Doe\nPython developer, Pune\n'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        employer = make_user('employer', 'Employer')
+        cls.jobs = [
+            Job.objects.create(
+                title=title, description='Build things', company='Acme', location='Pune', salary=100000,
+                posted_by=employer,
+            )
+            for title in ('Python Developer', 'Django Developer')
+        ]
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+        self.client.force_login(self.seeker)
+
+    def apply(self, job, content, name='resume.txt', client=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return (client or self.client).post(reverse('apply_job', args=[job.pk]), {
+                'name': 'Jane Doe', 'email': 'jane@example.com', 'resume': SimpleUploadedFile(name, content),
+            })
+
+    def test_oversized_file_rejected(self):
+        response = self.apply(self.jobs[0], b'x' * 2048)
+        self.assertFormError(response.context['form'], 'resume', 'The file is larger than 1.0\xa0KB.')
+        self.assertFalse(Application.objects.exists())
+
+    def test_disallowed_type_rejected(self):
+        # A PNG, whatever its name says
+        response = self.apply(self.jobs[0], b'\x89PNG\r\n\x1a\n' + bytes(64), name='resume.pdf')
+        self.assertFormError(response.context['form'], 'resume', TYPE_ERROR)
+        self.assertFalse(Application.objects.exists())
+
+    def test_stored_extension_follows_sniffed_type(self):
+        self.apply(self.jobs[0], b'<p>Jane Doe</p>\n', name='resume.html')
+        application = Application.objects.get()
+        self.assertEqual(application.resume_content_type, 'text/plain')
+        self.assertTrue(application.resume.name.startswith('resumes/resume'))
+        self.assertTrue(application.resume.name.endswith('.txt'))
+
+    def test_same_resume_stored_once(self):
+        for job in self.jobs:
+            self.assertRedirects(self.apply(job, self.RESUME), reverse('job_detail', args=[job.pk]))
+        first, second = Application.objects.order_by('id')
+        self.assertEqual(first.resume_checksum, second.resume_checksum)
+        self.assertEqual(second.resume.name, first.resume.name)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'resumes')), [os.path.basename(first.resume.name)])
+        self.assertEqual(second.resume_text, 'Jane Doe\nPython developer, Pune')
+        self.assertIsNotNone(second.resume_processed_at)
+
+    def test_unreadable_resume_still_processed(self):
+        # Starts like a DOCX (a ZIP archive) but isn't one
+        with self.assertLogs('jobapp.resumes', 'WARNING'):
+            self.apply(self.jobs[0], b'PK\x03\x04' + bytes(64), name='resume.docx')
+        application = Application.objects.get()
+        self.assertEqual(application.resume_text, '')
+        self.assertIsNotNone(application.resume_processed_at)
+
+    def test_csrf_checked(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.seeker)
+        response = self.apply(self.jobs[0], self.RESUME, client=client)
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Application.objects.exists())
+
+
+class CandidateSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user('employer', 'Employer')
+        cls.other_employer = make_user('other', 'Employer')
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        job = Job.objects.create(
+            title='Platform Engineer', description='Run things', company='Acme',
+            location='Pune', salary=100000, posted_by=cls.employer,
+        )
+        other_job = Job.objects.create(
+            title='SRE', description='Run things', company='Globex',
+            location='Pune', salary=100000, posted_by=cls.other_employer,
+        )
+        for applied_to, name, email, text in [
+            (job, 'Priya Shah', 'priya@example.test', 'Kubernetes and Terraform in production'),
+            (job, 'Ravi Kumar', 'ravi@example.test', 'Django developer'),
+            (other_job, 'Anil Rao', 'anil@example.test', 'Kubernetes operator'),
+        ]:
+            Application.objects.create(
+                job=applied_to, applicant=make_user(name.split()[0].lower(), 'Job Seeker'),
+                name=name, email=email, resume_text=text,
+            )
+
+    def names(self, search, user=None):
+        self.client.force_login(user or self.employer)
+        response = self.client.get(reverse('candidate_search'), {'q': search})
+        return [application.name for application in response.context['applications']]
+
+    def test_only_applicants_to_own_jobs(self):
+        self.assertEqual(self.names('kubernetes'), ['Priya Shah'])
+        self.assertEqual(self.names('ravi'), ['Ravi Kumar'])
+        self.assertEqual(self.names('priya@example.test'), ['Priya Shah'])
+        self.assertEqual(self.names('anil'), [])
+        self.assertEqual(sorted(self.names('')), ['Priya Shah', 'Ravi Kumar'])
+        self.assertEqual(self.names('kubernetes', self.other_employer), ['Anil Rao'])
+
+    def test_job_seekers_redirected(self):
+        self.client.force_login(self.seeker)
+        response = self.client.get(reverse('candidate_search'), {'q': 'kubernetes'})
+        self.assertRedirects(response, reverse('home'))
+
+    def test_reindex_fills_in_missing_text(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        with override_settings(MEDIA_ROOT=media.name):
+            application = Application.objects.get(name='Ravi Kumar')
+            # Stored before extraction existed: no text, no recorded type
+            application.resume.save('ravi.txt', ContentFile(b'Ravi Kumar\nElixir and Phoenix'), save=False)
+            Application.objects.filter(pk=application.pk).update(
+                resume=application.resume.name, resume_text='', resume_content_type='',
+            )
+            self.assertEqual(self.names('elixir'), [])
+            out = StringIO()
+            call_command('reindex_resumes', '--pending', '--workers', '1', stdout=out)
+        self.assertIn('Re-indexed 1 resume(s)', out.getvalue())
+        application.refresh_from_db()
+        self.assertEqual(application.resume_text, 'Ravi Kumar\nElixir and Phoenix')
+        self.assertEqual(application.resume_content_type, 'text/plain')
+        self.assertEqual(self.names('elixir'), ['Ravi Kumar'])
+
+
+class ImportExportTests(TestCase):
+    FIELDS = ('title', 'description', 'category', 'company', 'location', 'salary', 'posted_by__username', 'posted_on')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user('employer', 'Employer')
+        for title, description in [
+            ('Python Developer', 'Django, PostgreSQL and "quoted" words\nover two lines'),
+            ('Café Manager', 'Runs the café'),
+        ]:
+            Job.objects.create(
+                title=title, description=description, category='Design', company='Acme',
+                location='Pune', salary=100000, posted_by=cls.employer,
+            )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def run_command(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command(*args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_round_trip(self):
+        exported = list(Job.objects.order_by('id').values_list(*self.FIELDS))
+        for name in ('jobs.csv', 'jobs.jsonl'):
+            with self.subTest(format=name):
+                path = os.path.join(self.directory, name)
+                out, _ = self.run_command('export_jobs', path)
+                self.assertIn('Exported 2 job(s)', out)
+                Job.objects.all().delete()
+                out, err = self.run_command('import_jobs', path)
+                self.assertEqual(err, '')
+                self.assertIn('Imported 2 job(s)', out)
+                self.assertEqual(list(Job.objects.order_by('id').values_list(*self.FIELDS)), exported)
+
+    def test_bad_rows_reported_by_line(self):
+        path = os.path.join(self.directory, 'jobs.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write(
+                'title,description,company,location,salary,posted_by\n'
+                'Tester,Find bugs,Acme,Pune,90000,employer\n'
+                'Designer,Draw things,Acme,Pune,plenty,employer\n'
+                'Writer,Write docs,Acme,Pune,80000,nobody\n'
+            )
+        out, err = self.run_command('import_jobs', path)
+        self.assertIn('Imported 1 job(s)', out)
+        self.assertIn('2 row(s) rejected', out)
+        self.assertEqual(err.splitlines(), [
+            'line 3: salary: Enter a whole number.',
+            "line 4: unknown employer 'nobody'",
+        ])
+        self.assertTrue(Job.objects.filter(title='Tester').exists())
+
+        path = os.path.join(self.directory, 'jobs.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"title": "Tester", "description": "x", "company": "Acme", "location": "Pune", "salary": 1}\n{oops\n')
+        _, err = self.run_command('import_jobs', path, '--employer', 'employer', '--dry-run')
+        self.assertTrue(err.startswith('line 2: invalid JSON'))
+
+
+@override_settings(NOTIFICATION_BATCH_SECONDS=0)
+class TaskQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user('employer', 'Employer')
+        cls.employer.email = 'hr@acme.test'
+        cls.employer.save()
+        cls.jobs = [
+            Job.objects.create(
+                title=title, description='Build things', company='Acme', location='Pune', salary=100000,
+                posted_by=cls.employer,
+            )
+            for title in ('Python Developer', 'Data Analyst')
+        ]
+        # Not the tasks under test: matching the new jobs against saved searches
+        Task.objects.all().delete()
+        cls.seekers = [make_user(f'seeker{i}', 'Job Seeker') for i in range(3)]
+        for seeker in cls.seekers:
+            seeker.email = f'{seeker.username}@example.test'
+            seeker.save()
+
+    def test_apply_enqueues_one_task(self):
+        self.client.force_login(self.seekers[0])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('job_detail', args=[self.jobs[0].id]))
+        task_queries = [q['sql'] for q in queries.captured_queries if 'jobapp_task' in q['sql']]
+        self.assertRedirects(response, reverse('my_applications'))
+        self.assertEqual(len(task_queries), 1)
+        self.assertTrue(task_queries[0].startswith('INSERT'))
+        self.assertEqual(Task.objects.get().group, f'employer:{self.employer.pk}')
+        self.assertEqual(mail.outbox, [])
+
+    def test_notifications_batched_per_employer(self):
+        for seeker, job in zip(self.seekers, self.jobs * 2):
+            submit_application(Application(job=job, applicant=seeker))
+        self.assertEqual(run_due(), 3)
+        self.assertFalse(Task.objects.exists())
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(recipients, ['hr@acme.test'] + [f'seeker{i}@example.test' for i in range(3)])
+        employer_mail = next(message for message in mail.outbox if message.to == ['hr@acme.test'])
+        self.assertEqual(employer_mail.subject, '3 new applications')
+
+    def test_failing_task_retried_with_backoff(self):
+        @task('test_failing')
+        def failing(payload):
+            raise RuntimeError('mail server down')
+        self.addCleanup(TASKS.pop, 'test_failing')
+
+        enqueue('test_failing')
+        self.assertEqual(run_due(), 1)
+        queued = Task.objects.get()
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn('mail server down', queued.last_error)
+        self.assertEqual(queued.locked_by, '')
+        # not due again until the backoff has passed
+        self.assertEqual(run_due(), 0)
+
+        Task.objects.update(attempts=MAX_ATTEMPTS - 1, run_at=queued.created_at)
+        run_due()
+        self.assertIsNotNone(Task.objects.get().failed_at)
+        self.assertEqual(run_due(), 0)
+
+
+class JobAlertTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = make_user('employer', 'Employer')
+        cls.seeker = make_user('seeker', 'Job Seeker')
+        cls.seeker.email = 'seeker@example.test'
+        cls.seeker.save()
+        cls.other = make_user('other', 'Job Seeker')
+        save_search(cls.other, 'java', '')
+        save_search(cls.other, 'python', 'delhi')
+
+    def post_job(self, title, location):
+        return Job.objects.create(
+            title=title, description='Build APIs', company='Acme', location=location, salary=100000,
+            posted_by=self.employer,
+        )
+
+    def test_save_search_from_listing(self):
+        self.client.force_login(self.seeker)
+        response = self.client.post(reverse('saved_searches'), {'search': ' Python Dev ', 'location': 'Pune'})
+        self.assertRedirects(response, reverse('saved_searches'))
+        saved = SavedSearch.objects.get(user=self.seeker)
+        self.assertEqual((saved.terms, saved.location_terms, saved.anchor), ('python dev', 'pune', 'python'))
+        self.assertContains(self.client.get(reverse('saved_searches')), 'Python Dev')
+
+    def test_long_searches_rejected(self):
+        # SQLite stores them anyway, PostgreSQL would raise DataError
+        self.client.force_login(self.seeker)
+        response = self.client.post(reverse('saved_searches'), {'search': 'python ' * 1000, 'location': ''})
+        self.assertContains(response, 'keywords up to 200 characters')
+        for search, location in [('python', 'x' * 101), ('x' * 150, ''), ('a ' * 100 + 'b', '')]:
+            with self.subTest(search=search[:10], location=location[:10]):
+                self.assertIsNone(save_search(self.seeker, search, location))
+        self.assertFalse(SavedSearch.objects.filter(user=self.seeker).exists())
+        # Up to the limits is fine
+        saved = save_search(self.seeker, ' '.join(['python'] * 28) + ' dev', 'p' * 100)
+        self.assertEqual((len(saved.search), saved.terms), (199, ' '.join(['python'] * 8)))
+
+    def test_new_jobs_matched_through_the_index(self):
+        saved = save_search(self.seeker, 'python dev', 'pune')
+        job = self.post_job('Python Developer', 'Pune')
+        self.post_job('Python Developer', 'Mumbai')
+        run_due()
+        self.assertEqual(list(JobAlert.objects.values_list('saved_search', 'job')), [(saved.pk, job.pk)])
+        # One lookup of the candidate searches and one insert, however many searches are saved
+        another = self.post_job('Senior Python Developer', 'Pune')
+        with self.assertNumQueries(2):
+            match_jobs([another])
+
+    def test_digest_sent_once(self):
+        save_search(self.seeker, 'python', '')
+        for title in ('Python Developer', 'Python Lead'):
+            self.post_job(title, 'Pune')
+        run_due()
+        self.assertEqual(send_digests(), 1)
+        self.assertEqual(mail.outbox[0].to, ['seeker@example.test'])
+        self.assertIn('Python Lead', mail.outbox[0].body)
+        self.assertEqual(send_digests(), 0)
+
+
+class StaticAssetTests(TestCase):
+    def test_built_assets_are_up_to_date(self):
+        self.assertEqual(stale(), [], "run manage.py build_assets")
+
+    def test_home_inlines_critical_css(self):
+        self.client.force_login(make_user('seeker', 'Job Seeker'))
+        response = self.client.get(reverse('home'))
+        self.assertContains(response, '<style>:root{--bs-blue')
+        self.assertContains(response, 'rel="preload" href="/static/jobapp/site.min.css"')
+        self.assertNotContains(response, 'cdn.jsdelivr.net')
+
+    def test_pages_render_with_debug_off(self):
+        # settings.py reads DEBUG (and STATIC_MANIFEST) when it is imported,
+        # and the test runner only turns DEBUG off afterwards: a fresh process
+        # sees them as a deploy would.
+        script = "import django; django.setup(); from django.test import Client; print(Client().get('/login/').status_code)"
+        env = {**os.environ, 'DEBUG': 'False', 'ALLOWED_HOSTS': 'testserver'}
+        env.pop('STATIC_MANIFEST', None)
+        result = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, timeout=60,
+        )
+        self.assertEqual(result.stdout.strip(), '200', result.stderr)
+
+    def test_pages_extending_home_are_in_its_critical_css(self):
+        extending = sorted(
+            f'jobapp/{path.name}' for path in (TEMPLATE_DIR / 'jobapp').glob('*.html')
+            if "{% extends 'jobapp/home.html' %}" in path.read_text(encoding='utf-8')
+        )
+        self.assertEqual(
+            extending, ['jobapp/job_detail.html', 'jobapp/jobseeker_dashboard.html', 'jobapp/my_applications.html'],
+        )
+        templates = CRITICAL['jobapp/critical/home.css'][1]
+        self.assertEqual([name for name in extending if name not in templates], [])
+
+        seeker = make_user('seeker', 'Job Seeker')
+        job = Job.objects.create(
+            title='Python Developer', description='Build things', company='Acme',
+            location='Pune', salary=100000, posted_by=make_user('employer', 'Employer'),
+        )
+        self.client.force_login(seeker)
+        critical = (STATIC_DIR / 'jobapp/critical/home.css').read_text(encoding='utf-8')
+        for url in (reverse('job_detail', args=[job.pk]), reverse('jobseeker_dashboard'), reverse('my_applications')):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertContains(response, f'<style>{critical}</style>')
+                self.assertContains(response, 'rel="preload" href="/static/jobapp/site.min.css"')
+        # Only job_detail.html uses these
+        self.assertIn('.shadow-lg{', critical)
+        self.assertIn('.btn-success{', critical)
+
+    def test_collectstatic_hashes_and_precompresses(self):
+        storages = {
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+            'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+        }
+        with tempfile.TemporaryDirectory() as root, override_settings(STATIC_ROOT=root, STORAGES=storages):
+            # jobapp's own files only, compressing the admin's takes a while
+            call_command('collectstatic', interactive=False, verbosity=0, ignore_patterns=['admin', 'rest_framework'])
+            name = staticfiles_storage.stored_name('jobapp/site.min.css')
+            self.assertRegex(name, r'^jobapp/site\.min\.[0-9a-f]{12}\.css$')
+            self.assertTrue(os.path.exists(os.path.join(root, name + '.gz')))
+
+            # What asgi.py serves static files with when ASYNC_VIEWS is on:
+            # the hashed names only exist in STATIC_ROOT, not for the finders.
+            handler = WhiteNoiseASGIHandler(None)
+            response = handler.serve(RequestFactory().get('/static/' + name, HTTP_ACCEPT_ENCODING='gzip'))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertIn('immutable', response['Cache-Control'])
+            response.file_to_stream.close()
+            with self.assertRaises(Http404):
+                handler.serve(RequestFactory().get('/static/jobapp/missing.css'))
+
+
+class AdminTests(TestCase):
+    """Admin changelists cost a fixed number of queries, however many rows they show."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.scenario = seed_scenario(jobs=150, applications=60)
+        Profile.objects.bulk_create([
+            Profile(user=user, role='employer' if user.userprofile.role == 'Employer' else 'jobseeker')
+            for user in User.objects.select_related('userprofile')
+        ])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.test', 'pass12345')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def assertChangelistQueries(self, model, count, query=''):
+        url = reverse(f'admin:jobapp_{model}_changelist') + query
+        self.client.get(url)
+        with self.assertNumQueries(count):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_job_changelist(self):
+        self.assertChangelistQueries('job', 7)
+        self.assertChangelistQueries('job', 6, '?q=python')
+
+    def test_application_changelist(self):
+        self.assertChangelistQueries('application', 7)
+        response = self.assertChangelistQueries('application', 6, f'?q={self.scenario.seeker.username}')
+        self.assertEqual(response.context['cl'].result_count, 60)
+
+    def test_profile_changelist(self):
+        self.assertChangelistQueries('profile', 5)
+
+    def test_delete_in_batches(self):
+        selected = list(Job.objects.filter(posted_by=self.scenario.employer).values_list('pk', flat=True))
+        url = reverse('admin:jobapp_job_changelist')
+        data = {'action': 'delete_in_batches', ACTION_CHECKBOX_NAME: selected}
+        response = self.client.post(url, {**data, 'index': 0})
+        self.assertContains(response, f'delete {len(selected)} jobs')
+        self.client.post(url, {**data, 'post': 'yes'})
+        self.assertFalse(Job.objects.filter(pk__in=selected).exists())
+        self.assertTrue(Job.objects.exists())
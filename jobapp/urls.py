@@ -1,20 +1,35 @@
-from django.urls import path
-from jobapp import views
+from django.conf import settings
+from django.urls import path, re_path
+from jobapp import api, views
+
+# Over ASGI the read-heavy pages can be served by async views instead
+if settings.ASYNC_VIEWS:
+    from jobapp import async_views as read_views
+else:
+    read_views = views
 
 urlpatterns = [
-    path('', views.home_view, name='home'),
+    path('', read_views.home_view, name='home'),
     path('register/', views.register_view, name='register'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('signup/', views.signup, name='signup'),
     path('post-job/', views.post_job, name='post_job'),
     path('apply/<int:job_id>/', views.apply_job, name='apply_job'),
-    path('employer/dashboard/', views.employer_dashboard, name='employer_dashboard'),
+    path('employer/dashboard/', read_views.employer_dashboard, name='employer_dashboard'),
     path('jobseeker/dashboard/', views.jobseeker_dashboard, name='jobseeker_dashboard'),
-    path('my-applications/', views.my_applications, name='my_applications'),
+    path('my-applications/', read_views.my_applications, name='my_applications'),
+    path('recommended/', views.recommendations, name='recommendations'),
+    path('saved-searches/', views.saved_searches, name='saved_searches'),
     path('my-jobs/', views.my_jobs, name='my_jobs'),
+    path('employer/candidates/', views.candidate_search, name='candidate_search'),
     path('employer/post-job/', views.post_job, name='post_job'),
-    path('job/<int:job_id>/', views.job_detail, name='job_detail'),
+    path('job/<int:job_id>/', read_views.job_detail, name='job_detail'),
     path('job/<int:job_id>/edit/', views.edit_job, name='edit_job'),
     path('job/<int:job_id>/delete/', views.delete_job, name='delete_job'),
+
+    # JSON API
+    re_path(r'^api/(?P<version>v1)/jobs/$', api.JobListView.as_view(), name='api_jobs'),
+    re_path(r'^api/(?P<version>v1)/jobs/(?P<job_id>[0-9]+)/$', api.JobDetailView.as_view(), name='api_job_detail'),
+    re_path(r'^api/(?P<version>v1)/applications/$', api.MyApplicationsView.as_view(), name='api_my_applications'),
 ]
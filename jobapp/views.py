@@ -4,12 +4,21 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.forms import AuthenticationForm, UserCreationForm
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.http import HttpResponseForbidden
+from django.http import Http404, HttpResponseForbidden
 from django.contrib import messages
-from .models import Job, Application, UserProfile
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from .models import Job, Application, SavedSearch, UserProfile
 from .forms import JobForm, ApplicationForm, SignUpForm
+from .alerts import MAX_SAVED_SEARCHES, save_search
+from .applications import submit_application
 from .decorators import employer_required, jobseeker_required
-from collections import OrderedDict
+from .facets import facet_counts, facet_rows, selected_facets
+from .middleware import get_role, pin_role, user_role
+from .pagination import paginate_request
+from .queries import employer_candidates, employer_jobs, latest_applications, listing_jobs, recommended_jobs
+from .resumes import install_upload_handler, process_resume
+from .stats import dashboard_chart
+from . import conditional, workers
 
 # -----------------------------
 # Authentication Views Registration
@@ -38,16 +47,19 @@ def login_view(request):
 
         if user:
             login(request, user)
+            pin_role(request, user)
 
             # ✅ Redirect superuser to Django admin
             if user.is_superuser:
                 return redirect('/admin/')
 
             # ✅ Redirect based on custom user role
-            profile = get_object_or_404(UserProfile, user=user)
-            if profile.role == "Employer":
+            role = user_role(user)
+            if role is None:
+                raise Http404("No UserProfile matches the given query.")
+            if role == "Employer":
                 return redirect('employer_dashboard')
-            elif profile.role == "Job Seeker":
+            elif role == "Job Seeker":
                 return redirect('home')  # or 'jobseeker_dashboard' if you have one
 
         else:
@@ -69,21 +81,27 @@ def logout_view(request):
 
 @login_required
 def home_view(request):
-    profile = get_object_or_404(UserProfile, user=request.user)
+    role = get_role(request)
+    if role is None:
+        raise Http404("No UserProfile matches the given query.")
 
-    if profile.role.strip().lower() != "job seeker":
+    if role.strip().lower() != "job seeker":
         return HttpResponseForbidden("You are not authorized to view this page.")
 
-    search = request.GET.get('search')
-    location = request.GET.get('location')
-    jobs = Job.objects.all()
+    search = request.GET.get('search', '')
+    location = request.GET.get('location', '')
+    selected = selected_facets(request.GET)
+    page = paginate_request(request, listing_jobs(search, location, selected))
+    facets = facet_counts(facet_rows(search, location), selected)
 
-    if search:
-        jobs = jobs.filter(title__icontains=search) | jobs.filter(company__icontains=search)
-    if location:
-        jobs = jobs.filter(location__icontains=location)
-
-    return render(request, 'jobapp/home.html', {'jobs': jobs})
+    etag = conditional.page_etag(request, request.GET.urlencode(), facets, *conditional.job_versions(page.items))
+    # No Last-Modified: the page's rows can't tell when a job left the
+    # listing or a facet count changed, only the ETag covers those.
+    not_modified = conditional.not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    response = render(request, 'jobapp/home.html', {'jobs': page.items, 'page': page, 'facets': facets})
+    return conditional.add_headers(response, etag)
 
 
 # -----------------------------
@@ -107,23 +125,41 @@ def post_job(request):
 # Allows Job Seekers to apply for a job
 # -----------------------------
 
+@csrf_exempt
+def apply_job(request, job_id):
+    # The upload handler has to be swapped in before anything reads
+    # request.POST, which the CSRF check does; it runs in _apply_job instead.
+    install_upload_handler(request)
+    return _apply_job(request, job_id)
+
+
+@csrf_protect
 @login_required
 @jobseeker_required
-def apply_job(request, job_id):
+def _apply_job(request, job_id):
     job = get_object_or_404(Job, pk=job_id)
 
-    # prevent duplicate applications
-    if Application.objects.filter(job=job, applicant=request.user).exists():
-        return redirect('job_detail', job_id=job.id)
-
     if request.method == 'POST':
         form = ApplicationForm(request.POST, request.FILES)
+        upload_error = request.upload_handlers[0].error
+        if upload_error:
+            form.add_error('resume', upload_error)
         if form.is_valid():
             application = form.save(commit=False)
             application.job = job
             application.applicant = request.user
-            application.save()
+            resume = request.FILES.get('resume')
+            if resume:
+                application.resume_checksum = resume.sha256
+                application.resume_content_type = resume.content_type
+                application.resume_size = resume.size
+            # A repeated submit is ignored and lands on the job like the first
+            if submit_application(application) and resume:
+                workers.submit(process_resume, application.id)
             return redirect('job_detail', job_id=job.id)
+    elif Application.objects.filter(job=job, applicant=request.user).exists():
+        # prevent duplicate applications
+        return redirect('job_detail', job_id=job.id)
     else:
         form = ApplicationForm()
 
@@ -155,11 +191,15 @@ def signup(request):
 
 @login_required
 def employer_dashboard(request):
-    if request.user.userprofile.role != "Employer":
+    if get_role(request) != "Employer":
         return HttpResponseForbidden("You are not authorized to view this page.")
 
-    jobs = Job.objects.filter(posted_by=request.user)
-    return render(request, 'jobapp/employer_dashboard.html', {'jobs': jobs})
+    page = paginate_request(request, employer_jobs(request.user))
+    return render(request, 'jobapp/employer_dashboard.html', {
+        'jobs': page.items,
+        'page': page,
+        'chart': dashboard_chart(request.user),
+    })
 
 # -----------------------------
 # Displays applications made by the job seeker
@@ -167,11 +207,16 @@ def employer_dashboard(request):
 
 @login_required
 def jobseeker_dashboard(request):
-    if request.user.userprofile.role != 'Job Seeker':
+    if get_role(request) != 'Job Seeker':
         return redirect('home')  # Optional: Prevent access if not job seeker
 
-    applications = Application.objects.filter(applicant=request.user)
-    return render(request, 'jobapp/jobseeker_dashboard.html', {'applications': applications})
+    applications = (
+        Application.objects.filter(applicant=request.user)
+        .select_related('job')
+        .order_by('-applied_at', '-id')
+    )
+    page = paginate_request(request, applications)
+    return render(request, 'jobapp/jobseeker_dashboard.html', {'applications': page.items, 'page': page})
 
 # -----------------------------
 # Lists unique job applications (one per job) by the current job seeker
@@ -179,20 +224,45 @@ def jobseeker_dashboard(request):
 
 @login_required
 def my_applications(request):
-    applications = Application.objects.filter(applicant=request.user).order_by('-applied_at')
+    # Latest application per job, picked in the database
+    page = paginate_request(request, latest_applications(request.user))
 
-    # Filter: Only keep latest application per job
-    unique_apps = OrderedDict()  # Preserves order
+    return render(request, 'jobapp/my_applications.html', {
+        'applications': page.items,
+        'page': page,
+    })
 
-    for app in applications:
-        if app.job.id not in unique_apps:
-            unique_apps[app.job.id] = app
+# -----------------------------
+# Jobs recommended to the current job seeker
+# -----------------------------
 
-    deduplicated_applications = list(unique_apps.values())
+@login_required
+@jobseeker_required
+def recommendations(request):
+    return render(request, 'jobapp/recommended_jobs.html', {'jobs': recommended_jobs(request.user)})
 
-    return render(request, 'jobapp/my_applications.html', {
-        'applications': deduplicated_applications
-    })
+# -----------------------------
+# Saved searches: save the current search (POST), list or delete them
+# -----------------------------
+
+@login_required
+@jobseeker_required
+def saved_searches(request):
+    if request.method == 'POST':
+        if 'delete' in request.POST:
+            SavedSearch.objects.filter(pk=request.POST['delete'], user=request.user).delete()
+            return redirect('saved_searches')
+        if save_search(request.user, request.POST.get('search', ''), request.POST.get('location', '')):
+            return redirect('saved_searches')
+        lengths = [SavedSearch._meta.get_field(name).max_length for name in ('search', 'location')]
+        error = (
+            f"Only searches with a keyword or location can be saved (keywords up to {lengths[0]} characters, "
+            f"locations up to {lengths[1]}), at most {MAX_SAVED_SEARCHES}."
+        )
+    else:
+        error = None
+    searches = SavedSearch.objects.filter(user=request.user).order_by('-created_at')
+    return render(request, 'jobapp/saved_searches.html', {'searches': searches, 'error': error})
 
 # -----------------------------
 # Lists jobs posted by the logged-in employer
@@ -200,11 +270,26 @@ def my_applications(request):
 
 @login_required
 def my_jobs(request):
-    if request.user.userprofile.role != "Employer":
+    if get_role(request) != "Employer":
         return redirect('home')  # or show a 403 page
 
-    jobs = Job.objects.filter(posted_by=request.user)
-    return render(request, 'jobapp/my_jobs.html', {'jobs': jobs})
+    page = paginate_request(request, employer_jobs(request.user))
+    return render(request, 'jobapp/my_jobs.html', {'jobs': page.items, 'page': page})
+
+# -----------------------------
+# Searches applicants to the employer's jobs by name, email and resume text
+# -----------------------------
+
+@login_required
+@employer_required
+def candidate_search(request):
+    search = request.GET.get('q', '')
+    page = paginate_request(request, employer_candidates(request.user, search))
+    return render(request, 'jobapp/candidate_search.html', {
+        'applications': page.items,
+        'page': page,
+        'search': search,
+    })
 
 # -----------------------------
 # Shows job details
@@ -215,15 +300,18 @@ def job_detail(request, job_id):
     job = get_object_or_404(Job, pk=job_id)
 
     # Apply logic only for Job Seekers
-    if request.user.userprofile.role == "Job Seeker":
+    if get_role(request) == "Job Seeker":
         if request.method == "POST":
-            # Prevent duplicate applications
-            existing = Application.objects.filter(job=job, applicant=request.user).first()
-            if not existing:
-                Application.objects.create(job=job, applicant=request.user)
+            # Applying twice is a no-op
+            submit_application(Application(job=job, applicant=request.user))
             return redirect('my_applications')
 
-    return render(request, 'jobapp/job_detail.html', {'job': job})
+    etag = conditional.page_etag(request, *conditional.job_versions([job]))
+    not_modified = conditional.not_modified(request, etag, conditional.last_modified([job]))
+    if not_modified:
+        return not_modified
+    response = render(request, 'jobapp/job_detail.html', {'job': job})
+    return conditional.add_headers(response, etag, conditional.last_modified([job]))
 
 # -----------------------------
 # Allows Employers to edit a posted job
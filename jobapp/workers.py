@@ -0,0 +1,80 @@
+"""
+In-process background worker pool.
+
+Work that should not hold up a response (e.g. resume post-processing) is
+submitted here and runs on a small thread pool inside the web process. Jobs
+are lost if the process dies before they run, so anything submitted must be
+safe to redo later (see the process_resumes management command).
+
+CPU-bound work (resume text extraction) goes one step further, to a pool of
+worker processes shared by all threads of the web process. Functions run
+there must not touch Django; keep them in modules like extraction.py that
+only use the standard library.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_process_pool = None
+_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2),
+                thread_name_prefix='jobapp-worker',
+            )
+    return _executor
+
+
+def process_pool_size():
+    return getattr(settings, 'PROCESS_WORKERS', None) or os.cpu_count() or 1
+
+
+def get_process_pool():
+    global _process_pool
+    with _lock:
+        if _process_pool is None:
+            # Forking a process that runs threads can deadlock the child, so
+            # workers are spawned fresh instead.
+            _process_pool = ProcessPoolExecutor(
+                max_workers=process_pool_size(),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+    return _process_pool
+
+
+def run_in_process(func, *args):
+    """Run ``func(*args)`` on the process pool and wait for the result."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        return func(*args)
+    return get_process_pool().submit(func, *args).result()
+
+
+def _run(func, args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Background task %s%r failed', func.__name__, args)
+    finally:
+        # Worker threads open their own connections; don't leave them dangling.
+        connections.close_all()
+
+
+def submit(func, *args):
+    """Run ``func(*args)`` on the worker pool once the current transaction commits."""
+    if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+        transaction.on_commit(lambda: func(*args))
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_run, func, args))
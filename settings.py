@@ -39,16 +39,20 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'rest_framework',
     'jobapp',
 ]
 
 MIDDLEWARE = [
+    'jobapp.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware', 
+    'jobapp.routers.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'jobapp.middleware.RoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -77,13 +81,160 @@ WSGI_APPLICATION = 'wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# SQLite by default. DB_ENGINE=postgresql uses PostgreSQL (DB_NAME, DB_USER,
+# DB_PASSWORD, DB_HOST, DB_PORT) with persistent connections that are
+# health-checked before reuse, or with a psycopg 3 connection pool when
+# DB_POOL is on (the pool replaces persistent connections).
+#
+# A read replica is configured with DB_REPLICA_HOST (PostgreSQL) or
+# SQLITE_REPLICA_PATH (SQLite, e.g. a copy made by the sync_replica
+# command). Read-only pages then read from it, see jobapp/routers.py.
+
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='jobportal'),
+            'USER': config('DB_USER', default=''),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default=''),
+            'PORT': config('DB_PORT', default=''),
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int)},
+        }
+    }
+    if config('DB_POOL', default=False, cast=bool):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        }
+    if config('DB_REPLICA_HOST', default=''):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'HOST': config('DB_REPLICA_HOST'),
+            'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+            'OPTIONS': {**DATABASES['default']['OPTIONS']},
+        }
+else:
+    # SQLITE_PROFILE picks the connection settings. 'tuned' suits a single
+    # node with several worker processes: write-ahead logging so readers and
+    # the writer don't block each other, fsync only at checkpoints (a power
+    # cut can lose the last commits, never corrupt the file), memory-mapped
+    # reads and a larger page cache. Write transactions take the write lock
+    # up front (BEGIN IMMEDIATE) and wait up to SQLITE_BUSY_TIMEOUT seconds
+    # for it, instead of failing with "database is locked" when a read turns
+    # into a write. 'default' (the default) is SQLite's own settings. 'tuned'
+    # is opt-in because the journal mode is stored in the database file: any
+    # manage.py command would switch the committed db.sqlite3 to WAL for
+    # good. See `python manage.py bench_sqlite`.
+    SQLITE_PROFILE = config('SQLITE_PROFILE', default='default')
+    SQLITE_PROFILES = {
+        'default': {},
+        'tuned': {
+            'init_command': ';'.join([
+                'PRAGMA journal_mode=WAL',
+                'PRAGMA synchronous=NORMAL',
+                f"PRAGMA mmap_size={config('SQLITE_MMAP_SIZE', default=256 * 1024 * 1024, cast=int)}",
+                # Negative: in KiB, per connection
+                f"PRAGMA cache_size=-{config('SQLITE_CACHE_KB', default=32 * 1024, cast=int)}",
+                'PRAGMA temp_store=MEMORY',
+            ]),
+            'transaction_mode': 'IMMEDIATE',
+            # Sets SQLite's busy timeout on the connection
+            'timeout': config('SQLITE_BUSY_TIMEOUT', default=20, cast=int),
+        },
+    }
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('SQLITE_PATH', default=str(BASE_DIR / 'db.sqlite3')),
+            'OPTIONS': {**SQLITE_PROFILES[SQLITE_PROFILE]},
+            # Tests use a file as well: the in-memory test database runs in
+            # shared-cache mode, whose table locks ignore the busy timeout and
+            # can deadlock threads that BEGIN IMMEDIATE.
+            'TEST': {'NAME': str(BASE_DIR / 'test_db.sqlite3')},
+        }
     }
+    if config('SQLITE_REPLICA_PATH', default=''):
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('SQLITE_REPLICA_PATH'),
+            'OPTIONS': {**SQLITE_PROFILES[SQLITE_PROFILE]},
+        }
+
+if 'replica' in DATABASES:
+    # Tests run against the primary only.
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['jobapp.routers.PrimaryReplicaRouter']
+
+# Seconds a client keeps reading from the primary after a POST, so it sees
+# its own writes despite replication lag.
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+
+# Caches
+# The fragment cache holds rendered job cards (jobapp/fragments.py). Both
+# backends are local to one node: 'locmem' is per process, 'file' is shared
+# by all workers on the machine.
+
+FRAGMENT_CACHE = config('FRAGMENT_CACHE', default='locmem')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'job-cards',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    } if FRAGMENT_CACHE == 'locmem' else {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'fragments'),
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+    # Logged-in users, per process (jobapp/backends.py)
+    'users': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'users',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    # cached_db sessions, shared by the workers on this machine. A per-process
+    # cache would keep a session alive in the other workers after logout.
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'sessions'),
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
 }
 
+# Sessions and the logged-in user
+# SESSION_STORE picks where sessions live: 'db' reads django_session on every
+# request; 'cached_db' reads through the 'sessions' cache and writes through
+# to the database; 'signed_cookies' keeps the session in the (signed, not
+# encrypted) cookie itself, so there is nothing to read, but logging out
+# cannot revoke a copy of the cookie taken earlier.
+# USER_CACHE_TIMEOUT keeps the logged-in user and profile in memory for that
+# many seconds (0 = off), see jobapp/backends.py.
+SESSION_STORE = config('SESSION_STORE', default='db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_STORE]
+SESSION_CACHE_ALIAS = 'sessions'
+USER_CACHE_TIMEOUT = config('USER_CACHE_TIMEOUT', default=0, cast=int)
+
+# Seconds the facet counts of the unfiltered job listing are cached in the
+# default cache (jobapp/facets.py). Saving or deleting a job drops them
+# sooner, in the process that made the change.
+FACET_CACHE_TIMEOUT = config('FACET_CACHE_TIMEOUT', default=300, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -122,6 +273,25 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# collectstatic names every file after a hash of its contents and stores
+# gzip and Brotli copies next to it (Brotli needs the brotli package).
+# WhiteNoise serves the hashed names with a one-year immutable
+# Cache-Control and picks the smallest encoding the browser accepts.
+# Templates then need a collectstatic run to resolve {% static %}, so this
+# is opt-in: turn it on where collectstatic runs as part of the deploy, not
+# just because DEBUG is off (tests and the bench servers run without it).
+STATIC_MANIFEST = config('STATIC_MANIFEST', default=False, cast=bool)
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage' if STATIC_MANIFEST
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
+
 
 
 # Default primary key field type
@@ -131,5 +301,75 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = 'login'
 
+# Loads the UserProfile together with the user, see jobapp/backends.py
+AUTHENTICATION_BACKENDS = ['jobapp.backends.ProfileBackend']
+
+# Serve home, job detail, my applications and the employer dashboard with
+# the async views in jobapp/async_views.py. Only useful when running under
+# ASGI (see asgi.py).
+ASYNC_VIEWS = config('ASYNC_VIEWS', default=False, cast=bool)
+
+if ASYNC_VIEWS:
+    # WhiteNoise is sync-only middleware and would push every request below
+    # it onto a thread. asgi.py puts it in front of the app instead, see
+    # jobapp/static_files.py.
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
+
+# Read-only JSON API, see jobapp/api.py. JSON only: the browsable API
+# renderer costs more per request than the endpoints themselves.
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.SessionAuthentication'],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.IsAuthenticated'],
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': [],
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
+    'ALLOWED_VERSIONS': ['v1'],
+}
+
+# Send per-request SQL/template/total timings in a Server-Timing header and
+# log them to the jobapp.metrics logger, with a warning for GETs over their
+# view's budget, see jobapp/instrumentation.py
+REQUEST_METRICS = config('REQUEST_METRICS', default=False, cast=bool)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'jobapp': {'handlers': ['console'], 'level': config('LOG_LEVEL', default='INFO')},
+    },
+}
+
+# Store the role in the session at login and read it from there afterwards.
+# A role changed in the admin then only applies after the user logs in again.
+PIN_ROLE_IN_SESSION = config('PIN_ROLE_IN_SESSION', default=False, cast=bool)
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Largest resume accepted by the apply form, in bytes, see jobapp/resumes.py
+RESUME_MAX_UPLOAD_SIZE = config('RESUME_MAX_UPLOAD_SIZE', default=5 * 1024 * 1024, cast=int)
+
+# Threads per web process for work done after the response (resume
+# post-processing), see jobapp/workers.py. With BACKGROUND_TASKS_EAGER the
+# work runs inline when the transaction commits instead.
+BACKGROUND_WORKERS = config('BACKGROUND_WORKERS', default=2, cast=int)
+# Processes for CPU-bound work (resume text extraction); 0 means one per core.
+PROCESS_WORKERS = config('PROCESS_WORKERS', default=0, cast=int)
+BACKGROUND_TASKS_EAGER = config('BACKGROUND_TASKS_EAGER', default=False, cast=bool)
+
+# Email. Notifications are sent by the run_tasks workers, not in the request
+# (jobapp/tasks.py, jobapp/notifications.py). The console backend prints
+# them; set EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend and
+# EMAIL_HOST etc. to send them. Tests use Django's in-memory backend.
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='Job Portal <noreply@localhost>')
+# Applications to one employer within this many seconds share one email
+NOTIFICATION_BATCH_SECONDS = config('NOTIFICATION_BATCH_SECONDS', default=60, cast=int)